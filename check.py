@@ -0,0 +1,383 @@
+"""
+solver의 결과를 확인하기 위한 코드
+작은 랜덤 문제를 SCIP(또는 CP-SAT)로 푼 결과와 다른 solver, 세션의 결과를 비교합니다.
+결과가 다르면 AssertionError로 멈춥니다. 솔버 출력은 숨기고 확인 결과만 출력합니다.
+
+python check.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import openpyxl
+
+import src.solver.core as core
+import src.solver.cpsat as cpsat
+import src.solver.dp as dp
+import src.solver.fptas as fptas
+import src.solver.lagrangian as lagrangian
+import src.solver.scip as scip
+from src.problem.cache import read_problem_cached
+from src.problem.io import read_problem_from_excel, _read_ranges
+from src.problem.problem import Problem, as_problem
+from src.problem.strategy import get_value, make_random_problem
+from src.solver.session import OptimizerSession
+
+SEEDS = range(5)  # 랜덤 문제의 시드
+NUM_ITEMS = 30  # 랜덤 문제의 아이템 수
+CORE_NUM_ITEMS = 200  # 코어 기법을 확인할 랜덤 문제의 아이템 수. 코어가 전체 문제보다 작아야 함
+TOLERANCE = 1e-6  # 목적 함수 값 비교의 상대 허용 오차
+EXACT_GAP = 1e-9  # 정확한 최적해를 구할 때 SCIP, CP-SAT의 relative_gap
+HEURISTIC_TOLERANCE = 0.03  # 근사 solver의 비용이 최적 비용보다 클 수 있는 비율
+DATA_FILE = "data/data.xlsx"  # 캐시와 엑셀 읽기를 확인할 엑셀 파일과 범위
+DATA_RANGES = dict(cost_sheet="Sheet1", cost_range="N2:Q42", value_sheet="Sheet1", value_range="A1:J42")
+
+
+def quiet(function, *args, **kwargs):
+    """
+    solver의 출력을 숨기고 실행합니다.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def weighted_value(problem, selected):
+    """
+    균등 가중치(합 1)의 가중 가치. solver마다 반환하는 가치의 형태가 달라 선택된 전략으로 다시 계산합니다.
+    """
+    return float(np.mean(get_value(problem.value, selected)))
+
+
+def assert_close(name, actual, expected, tolerance=TOLERANCE):
+    assert abs(actual - expected) <= tolerance * max(abs(expected), 1.0), f"{name}: {actual} != {expected}"
+
+
+def random_problem(seed, allow_zero_strategy):
+    return as_problem(make_random_problem(num_items=NUM_ITEMS, random_seed=seed, strategy_count=3,
+                                          allow_zero_strategy=allow_zero_strategy))
+
+
+def optimum(problem, cost_constraint, allow_zero_strategy):
+    """
+    SCIP으로 구한 비용 제약 문제의 최적 가중 가치
+    """
+    selected, _, _, _ = quiet(scip.solve_cost_constraint, problem, cost_constraint,
+                              allow_zero_strategy=allow_zero_strategy, relative_gap=EXACT_GAP)
+    return weighted_value(problem, selected)
+
+
+def integer_cost_problem(seed, allow_zero_strategy):
+    """
+    비용을 정수로 반올림한 랜덤 문제. DP는 비용이 정수이면 정확한 최적해를 구합니다.
+    """
+    problem = random_problem(seed, allow_zero_strategy)
+    return Problem(np.round(problem.cost), problem.value, problem.item_label, problem.strategy_label,
+                   problem.value_label)
+
+
+def uncorrelated_problem(seed):
+    """
+    비용과 가치가 서로 관계없는 랜덤 문제. 비용이 크고 가치가 작은(지배되는) 전략이 많습니다.
+    """
+    rng = np.random.default_rng(seed)
+    return Problem(rng.uniform(0, 1000, (NUM_ITEMS, 4)), rng.uniform(0, 10, (NUM_ITEMS, 3, 4)))
+
+
+def check_dp():
+    """
+    비용이 정수인 문제에서 DP의 비용 제약 문제와 (가치 차원이 1개인) 신뢰도 제약 문제의 해가 SCIP의 최적해와 같은지 확인합니다.
+    """
+    for seed in SEEDS:
+        for allow_zero_strategy in [False, True]:
+            problem = integer_cost_problem(seed, allow_zero_strategy)
+            cost_constraint = 0.4 * problem.cost.max(axis=1).sum()
+            selected, cost, _, _ = quiet(dp.solve_cost_constraint, problem, cost_constraint,
+                                         allow_zero_strategy=allow_zero_strategy)
+            assert cost <= cost_constraint, f"dp cost {cost} > {cost_constraint}"
+            assert_close(f"dp (seed {seed})", weighted_value(problem, selected),
+                         optimum(problem, cost_constraint, allow_zero_strategy))
+
+            single = Problem(problem.cost, problem.value[:, :1, :], problem.item_label, problem.strategy_label,
+                             problem.value_label[:1])
+            reliability_constraint = [0.5 * single.value.max(axis=2).sum()]
+            _, cost, value, _ = quiet(dp.solve_reliability_constraint, single, reliability_constraint,
+                                      allow_zero_strategy=allow_zero_strategy)
+            _, optimal_cost, _, _ = quiet(scip.solve_reliability_constraint, single, reliability_constraint,
+                                          allow_zero_strategy=allow_zero_strategy, relative_gap=EXACT_GAP)
+            assert value[0] >= reliability_constraint[0] - TOLERANCE, f"dp reliability {value} < {reliability_constraint}"
+            assert_close(f"dp reliability (seed {seed})", cost, optimal_cost)
+    print("dp: ok")
+
+
+def check_fptas():
+    """
+    FPTAS의 해가 예산 안에 있고, 가중 가치가 최적값의 (1 - epsilon) 이상인지 확인합니다.
+    "선택하지 않음"(가치 0)을 허용하는 문제이므로 보장은 총 가치에 대한 것입니다.
+    """
+    for seed in SEEDS:
+        problem = random_problem(seed, allow_zero_strategy=True)
+        cost_constraint = 0.4 * problem.cost.max(axis=1).sum()
+        best = optimum(problem, cost_constraint, True)
+        for epsilon in [0.2, fptas.FPTAS_EPSILON]:
+            selected, cost, _, _ = quiet(fptas.solve_cost_constraint, problem, cost_constraint,
+                                         allow_zero_strategy=True, epsilon=epsilon)
+            assert cost <= cost_constraint, f"fptas cost {cost} > {cost_constraint}"
+            value = weighted_value(problem, selected)
+            assert value >= (1 - epsilon) * best - TOLERANCE, f"fptas (seed {seed}, epsilon {epsilon}): {value} < {best}"
+    print("fptas: ok")
+
+
+def check_core():
+    """
+    코어 기법의 해가 전체 문제를 SCIP으로 푼 최적해와 같은지 확인합니다.
+    코어 문제는 SCIP의 기본 상대 gap으로 풀리므로 그 gap 안에서 비교합니다. 작은 코어에서 시작하여 코어를 넓히는 경우도 확인합니다.
+    """
+    for seed in SEEDS:
+        for allow_zero_strategy in [False, True]:
+            problem = as_problem(make_random_problem(num_items=CORE_NUM_ITEMS, random_seed=seed, strategy_count=3,
+                                                     allow_zero_strategy=allow_zero_strategy))
+            cost_constraint = 0.4 * problem.cost.max(axis=1).sum()
+            best = optimum(problem, cost_constraint, allow_zero_strategy)
+            for core_solver, core_size in [("SCIP", core.CORE_INITIAL_SIZE), ("SCIP", 4), ("CP-SAT", 4)]:
+                selected, cost, _, _ = quiet(core.solve_cost_constraint, problem, cost_constraint,
+                                             allow_zero_strategy=allow_zero_strategy, core_solver=core_solver,
+                                             core_size=core_size)
+                assert cost <= cost_constraint * (1 + TOLERANCE), f"core cost {cost} > {cost_constraint}"
+                assert_close(f"core {core_solver} (seed {seed}, core_size {core_size})",
+                             weighted_value(problem, selected), best, tolerance=scip.SCIP_RELATIVE_GAP)
+    print("core: ok")
+
+
+def check_presolve():
+    """
+    지배되는 전략을 지운(presolve) 모델의 해가 지우지 않은 모델의 최적해와 같은지 확인합니다.
+    LP 지배(lp_dominance)는 정수해의 최적값을 나쁘게 할 수 있으므로 예산 안의 해이며 최적값을 넘지 않는지만 확인합니다.
+    비용 제약 문제와 신뢰도 제약 문제를 SCIP, CP-SAT으로 확인합니다.
+    """
+    for seed in SEEDS:
+        for problem, allow_zero_strategy in [(uncorrelated_problem(seed), False), (uncorrelated_problem(seed), True),
+                                             (random_problem(seed, allow_zero_strategy=True), True)]:
+            cost_constraint = 0.4 * problem.cost.max(axis=1).sum()
+            reliability_constraint = (0.5 * problem.value.max(axis=2).sum(axis=0)).tolist()
+            for solver in [scip, cpsat]:
+                name = solver.__name__.split(".")[-1]
+                options = dict(allow_zero_strategy=allow_zero_strategy, aggregate=False, relative_gap=EXACT_GAP)
+                values = []
+                for presolve, lp_dominance in [(False, False), (True, False), (True, True)]:
+                    selected, cost, _, _ = quiet(solver.solve_cost_constraint, problem, cost_constraint,
+                                                 presolve=presolve, lp_dominance=lp_dominance, **options)
+                    assert cost <= cost_constraint * (1 + TOLERANCE), f"{name} cost {cost} > {cost_constraint}"
+                    values.append(weighted_value(problem, selected))
+                assert_close(f"{name} presolve (seed {seed})", values[1], values[0])
+                assert values[2] <= values[0] * (1 + TOLERANCE), f"{name} lp_dominance (seed {seed}): {values[2]} > {values[0]}"
+
+                costs = [quiet(solver.solve_reliability_constraint, problem, reliability_constraint, presolve=presolve,
+                               **options)[1]
+                         for presolve in [False, True]]
+                assert_close(f"{name} presolve reliability (seed {seed})", costs[1], costs[0])
+    print("presolve: ok")
+
+
+def check_aggregate():
+    """
+    같은 아이템을 묶은(aggregate) 모델의 해가 묶지 않은 모델의 최적해와 같은지 확인합니다.
+    아이템마다 1~4개의 같은 아이템이 있는 문제를 비용 제약 문제와 신뢰도 제약 문제에서 SCIP, CP-SAT으로 확인합니다.
+    """
+    for seed in SEEDS:
+        rng = np.random.default_rng(seed)
+        for base, allow_zero_strategy in [(uncorrelated_problem(seed), False),
+                                          (random_problem(seed, allow_zero_strategy=True), True)]:
+            copies = rng.integers(1, 5, base.num_item)
+            problem = Problem(np.repeat(base.cost, copies, axis=0), np.repeat(base.value, copies, axis=0),
+                              strategy_label=base.strategy_label, value_label=base.value_label)
+            cost_constraint = 0.4 * problem.cost.max(axis=1).sum()
+            reliability_constraint = (0.5 * problem.value.max(axis=2).sum(axis=0)).tolist()
+            for solver in [scip, cpsat]:
+                name = solver.__name__.split(".")[-1]
+                options = dict(allow_zero_strategy=allow_zero_strategy, relative_gap=EXACT_GAP)
+                values, costs = [], []
+                for aggregate in [False, True]:
+                    selected, cost, _, _ = quiet(solver.solve_cost_constraint, problem, cost_constraint,
+                                                 aggregate=aggregate, **options)
+                    assert cost <= cost_constraint * (1 + TOLERANCE), f"{name} cost {cost} > {cost_constraint}"
+                    values.append(weighted_value(problem, selected))
+                    selected, cost, value, _ = quiet(solver.solve_reliability_constraint, problem,
+                                                     reliability_constraint, aggregate=aggregate, **options)
+                    assert (np.array(value) >= np.array(reliability_constraint) - TOLERANCE).all(), \
+                        f"{name} aggregate reliability (seed {seed}): {value} < {reliability_constraint}"
+                    costs.append(cost)
+                assert_close(f"{name} aggregate (seed {seed})", values[1], values[0])
+                assert_close(f"{name} aggregate reliability (seed {seed})", costs[1], costs[0])
+    print("aggregate: ok")
+
+
+def assert_same_problem(name, actual, expected):
+    assert np.array_equal(actual.cost, expected.cost) and np.array_equal(actual.value, expected.value), \
+        f"{name}: 비용 또는 가치가 다릅니다."
+    for axis in ["item_label", "strategy_label", "value_label"]:
+        assert getattr(actual, axis).tolist() == getattr(expected, axis).tolist(), f"{name}: {axis}가 다릅니다."
+
+
+def check_cache():
+    """
+    캐시에서 읽은 문제가 엑셀을 직접 읽은 문제와 같은지, 엑셀 파일 내용이 바뀌면 이전 캐시를 쓰지 않는지,
+    캐시 디렉터리가 최대 크기를 넘으면 방금 저장한 캐시만 남기는지 확인합니다.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "data.xlsx")
+        cache_dir = os.path.join(directory, "cache")
+        # openpyxl로 다시 저장하면 수식 셀의 계산된 값이 사라지므로 계산된 값으로 복사
+        workbook = openpyxl.load_workbook(DATA_FILE, data_only=True)
+        sheet = workbook[DATA_RANGES["cost_sheet"]]
+        workbook.save(file_path)
+
+        expected = read_problem_from_excel(file_path, **DATA_RANGES)
+        for hit in [False, True]:
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                problem = read_problem_cached(file_path, cache_dir=cache_dir, **DATA_RANGES)
+            assert ("캐시" in output.getvalue()) == hit, f"cache hit: {not hit} != {hit}"
+            assert_same_problem("cache", problem, expected)
+        assert len(os.listdir(cache_dir)) == 1
+
+        # 비용 셀 하나를 바꾸면 새 캐시를 만듦
+        sheet["O3"] = sheet["O3"].value + 1.0
+        workbook.save(file_path)
+        problem = quiet(read_problem_cached, file_path, cache_dir=cache_dir, **DATA_RANGES)
+        assert_same_problem("cache after edit", problem, read_problem_from_excel(file_path, **DATA_RANGES))
+        assert len(os.listdir(cache_dir)) == 2
+
+        sheet["O3"] = sheet["O3"].value + 1.0
+        workbook.save(file_path)
+        quiet(read_problem_cached, file_path, cache_dir=cache_dir, max_bytes=1, **DATA_RANGES)
+        assert len(os.listdir(cache_dir)) == 1, f"cache eviction: {os.listdir(cache_dir)}"
+    print("cache: ok")
+
+
+def check_reader():
+    """
+    읽기 전용 모드로 읽은 범위가 일반 모드의 셀 범위(ws["A1:J42"])와 같은지 확인합니다.
+    시트에 저장된 마지막 행과 열을 넘는 범위도 같은 크기의 빈 셀(NaN)로 읽어야 합니다.
+    """
+    workbook = openpyxl.load_workbook(DATA_FILE, data_only=True)
+    read_only = openpyxl.load_workbook(DATA_FILE, read_only=True, data_only=True)
+    try:
+        ws = workbook[DATA_RANGES["cost_sheet"]]
+        last_row = ws.max_row
+        for cost_range, value_range in [(DATA_RANGES["cost_range"], DATA_RANGES["value_range"]),
+                                        (f"N2:Q{last_row + 6}", f"A1:J{last_row + 6}"),
+                                        ("N2:S42", "A1:L42")]:
+            rows = _read_ranges(read_only[DATA_RANGES["cost_sheet"]], [cost_range, value_range])
+            for cell_range, actual in zip([cost_range, value_range], rows):
+                expected = [tuple(cell.value for cell in row) for row in ws[cell_range]]
+                assert actual == expected, f"reader {cell_range}: 일반 모드로 읽은 값과 다릅니다."
+
+        problem = read_problem_from_excel(DATA_FILE, **dict(DATA_RANGES, cost_range=f"N2:Q{last_row + 6}",
+                                                            value_range=f"A1:J{last_row + 6}"))
+        assert problem.cost.shape[0] == last_row + 4 and np.isnan(problem.cost[-6:]).all(), \
+            f"reader: 시트 밖의 행을 빈 행으로 읽지 않았습니다. {problem.cost.shape}"
+    finally:
+        read_only.close()
+    print("reader: ok")
+
+
+def check_session_rescaling():
+    """
+    CP-SAT 세션에서 정수화 배율을 바꾸는 비용 변경 후의 결과가 새로 푼 결과와 같은지 확인합니다.
+    비용이 모두 100의 배수이면 배율 0.01로 정수화되므로, 150으로 바꾸면 배율을 다시 정해야 합니다.
+    """
+    problem = Problem(np.array([[100.0, 0.0], [200.0, 0.0], [300.0, 0.0]]), np.array([[[10.0, 0.0]]] * 3))
+    session = quiet(OptimizerSession, problem, 250, solver="CP-SAT")
+    quiet(session.solve)
+    quiet(session.update, 0, 0, cost=150)
+    quiet(session.update, 1, 0, cost=100)
+    selected, cost, _, _ = quiet(session.solve)
+    cold, _, _, _ = quiet(cpsat.solve_cost_constraint, session.problem, 250)
+    assert cost <= 250, f"session cost {cost} > 250"
+    assert_close("CP-SAT session after rescaling", weighted_value(session.problem, selected),
+                 weighted_value(session.problem, cold))
+    print("session rescaling: ok")
+
+
+def check_session():
+    """
+    SCIP, CP-SAT 세션에서 비용과 가치를 바꾸고 다시 푼 결과가 바뀐 문제를 새로 푼 결과와 같은지 확인합니다.
+    바꾸는 비용은 소수 셋째 자리까지 있어 CP-SAT의 정수화 배율도 바뀝니다.
+    """
+    for solver in ["SCIP", "CP-SAT"]:
+        for seed in SEEDS:
+            problem = integer_cost_problem(seed, allow_zero_strategy=True)
+            cost_constraint = 0.4 * problem.cost.max(axis=1).sum()
+            session = quiet(OptimizerSession, problem, cost_constraint, solver=solver, allow_zero_strategy=True,
+                            relative_gap=EXACT_GAP)
+            quiet(session.solve)
+
+            rng = np.random.default_rng(seed)
+            for _ in range(3):
+                for _ in range(3):
+                    item = int(rng.integers(problem.num_item))
+                    strategy = int(rng.integers(problem.num_strategy))
+                    quiet(session.update, item, strategy,
+                          cost=round(session.problem.cost[item, strategy] * rng.uniform(0.5, 1.5), 3),
+                          value=session.problem.value[item, :, strategy] * rng.uniform(0.5, 1.5))
+                selected, cost, _, _ = quiet(session.solve)
+                assert cost <= cost_constraint * (1 + TOLERANCE), f"{solver} session cost {cost} > {cost_constraint}"
+                assert_close(f"{solver} session (seed {seed})", weighted_value(session.problem, selected),
+                             optimum(session.problem, cost_constraint, True))
+        print(f"{solver} session: ok")
+
+
+def check_lagrangian_reliability():
+    """
+    라그랑주 완화로 구한 신뢰도 제약 문제의 해가 제약을 만족하고, 비용이 SCIP 최적 비용에 가까운지 확인합니다.
+    비용과 가치가 서로 관계없는 문제도 확인합니다. 이런 문제에서는 한 차원의 부족분을 채우는 변경이 다른 차원의 가치를 깎습니다.
+    """
+    rng = np.random.default_rng(0)
+    for seed in SEEDS:
+        for problem, allow_zero_strategy in [
+            (random_problem(seed, allow_zero_strategy=True), True),
+            (uncorrelated_problem(seed), False),
+        ]:
+            reliability_constraint = (problem.value.max(axis=2).sum(axis=0) * rng.uniform(0.3, 0.8, 3)).tolist()
+            _, cost, value, _ = quiet(lagrangian.solve_reliability_constraint, problem, reliability_constraint,
+                                      allow_zero_strategy=allow_zero_strategy)
+            _, optimal_cost, _, _ = quiet(scip.solve_reliability_constraint, problem, reliability_constraint,
+                                          allow_zero_strategy=allow_zero_strategy, relative_gap=EXACT_GAP)
+            assert (np.array(value) >= np.array(reliability_constraint) - TOLERANCE).all(), \
+                f"lagrangian reliability (seed {seed}): {value} < {reliability_constraint}"
+            assert cost <= optimal_cost * (1 + HEURISTIC_TOLERANCE), \
+                f"lagrangian reliability (seed {seed}): {cost} > {optimal_cost}"
+
+    # 짝수 아이템은 첫 차원, 홀수 아이템은 둘째 차원만 키우고 다른 차원을 깎는 문제. 모든 아이템을 바꾸어야 요구 신뢰도를 정확히 채움
+    cost = np.tile([0.0, 1.0], (20, 1))
+    value = np.ones((20, 2, 2))
+    value[0::2, :, 1] = [3.0, 0.0]
+    value[1::2, :, 1] = [0.0, 3.0]
+    _, cost, value, _ = quiet(lagrangian.solve_reliability_constraint, Problem(cost, value), [30.0, 30.0])
+    assert cost == 20.0 and value == [30.0, 30.0], f"lagrangian reliability (complementary): {cost}, {value}"
+
+    # 차원별 최대 가치의 합은 충분하지만 두 차원을 함께 채울 수 없는 문제는 해가 없다고 보고
+    problem = Problem(np.array([[0.0, 1.0]]), np.array([[[1.0, 0.0], [0.0, 1.0]]]))
+    try:
+        quiet(lagrangian.solve_reliability_constraint, problem, [1.0, 1.0])
+    except ValueError as error:
+        assert str(error) == "No feasible solution exists.", f"lagrangian reliability (infeasible): {error}"
+    else:
+        raise AssertionError("lagrangian reliability (infeasible): 해가 없는 문제에서 해를 반환했습니다.")
+    print("lagrangian reliability: ok")
+
+
+if __name__ == "__main__":
+    check_dp()
+    check_fptas()
+    check_core()
+    check_presolve()
+    check_aggregate()
+    check_cache()
+    check_reader()
+    check_session_rescaling()
+    check_session()
+    check_lagrangian_reliability()
+    print("모든 확인을 통과했습니다.")
@@ -14,7 +14,7 @@ DEFAULT_CONFIG = {
     },
 
     "solver": {
-        # 사용할 솔버의 종류 (SCIP 또는 CP-SAT)
+        # 사용할 솔버의 종류 (SCIP, CP-SAT, DP, SA, GA, LP_GREEDY, LAGRANGIAN, FPTAS 또는 CORE)
         "type": "SCIP",
         # 문제의 종류 (비용 제약 -> "cost_constraint" 또는 신뢰도 제약 -> "reliability_constraint")
         "problem_type": "cost_constraint",
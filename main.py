@@ -1,13 +1,68 @@
 import argparse
+import inspect
+import os
 import time
 
+import src.solver.core as core
 import src.solver.cpsat as cpsat
+import src.solver.dp as dp
+import src.solver.fptas as fptas
+import src.solver.ga as ga
+import src.solver.lagrangian as lagrangian
+import src.solver.lp_greedy as lp_greedy
+import src.solver.sa as sa
 import src.solver.scip as scip
-from src.problem.io import read_problem_from_excel, write_solution_to_excel, add_nothing_strategy
+from src.problem.cache import PROBLEM_CACHE_DIR, read_problem_cached
+from src.problem.io import write_solution_to_excel, write_frontier_to_excel, add_nothing_strategy
+from src.solver.cluster import solve_clustered
+from src.solver.incumbent import jsonl_sink
+from src.solver.sweep import budget_range, sweep_cost_constraint
+from src.solver.warm_start import load_solution_cache, read_previous_solution, save_solution_cache, warm_start_solution
 import json
 
+# solver.type 설정값과 solver 모듈의 대응
+SOLVERS = {
+    'SCIP': scip,
+    'CP-SAT': cpsat,
+    'DP': dp,
+    'SA': sa,
+    'GA': ga,
+    'LP_GREEDY': lp_greedy,
+    'LAGRANGIAN': lagrangian,
+    'FPTAS': fptas,
+    'CORE': core,
+}
 
-def run_optimization(config_path='configs/config.json'):
+
+def get_solver_options(solve_function, solver_config: dict, exclude: list[str]) -> dict:
+    """
+    solver 설정 중 solve 함수가 인자로 받는 항목만 골라 반환합니다.
+    예를 들어 DP solver의 cost_unit과 같이 solver마다 다른 설정을 config에서 그대로 전달할 수 있습니다.
+
+    Args:
+        solve_function: solve_cost_constraint 또는 solve_reliability_constraint 함수
+        solver_config: config의 solver 설정
+        exclude: 이미 전달하는 인자의 이름 목록
+
+    Returns:
+        dict: solve 함수에 전달할 추가 인자
+    """
+    parameters = inspect.signature(solve_function).parameters
+    return {key: value for key, value in solver_config.items() if key in parameters and key not in exclude}
+
+
+def run_optimization(config_path='configs/config.json', stats=None):
+    """
+    설정 파일대로 문제를 읽고 풀어, 결과를 출력하고 엑셀 파일에 저장합니다.
+
+    Args:
+        config_path: 설정 파일 경로
+        stats: 주어진 경우 solver의 풀이 정보(목적 함수의 한계 "objective_bound", gap "gap", 풀이 시간 등)를 기록할 딕셔너리
+
+    Returns:
+        (solution, total_cost, total_value, solve_time): 선택된 전략, 총 비용, 총 가치, 풀이 시간.
+        여러 예산의 sweep인 경우 (frontier, solutions)
+    """
     # JSON 파일에서 config 불러오기
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -28,6 +83,7 @@ def run_optimization(config_path='configs/config.json'):
     value_range = input_config.get('value_range', "A24:J71")
     value_sheet = input_config.get('value_sheet', "05. results")
     add_nothing = input_config.get('add_nothing_strategy', True)
+    cache_dir = input_config.get('cache_dir', PROBLEM_CACHE_DIR)
 
     # 솔버 설정 가져오기
     solver_config = config.get('solver', {})
@@ -37,6 +93,10 @@ def run_optimization(config_path='configs/config.json'):
     value_weights = solver_config.get('value_weights', [1.0, 1.0, 1.0])
     reliability_constraint = solver_config.get('reliability_constraint', [150, 0.5, 0.5])
     normalize = solver_config.get('value_normalization', False)
+    num_clusters = solver_config.get('num_clusters')
+    incumbent_file = solver_config.get('incumbent_file')
+    warm_start = solver_config.get('warm_start', False)
+    warm_start_file = solver_config.get('warm_start_file')
 
     # 출력 설정 가져오기
     output_config = config.get('output', {})
@@ -46,12 +106,13 @@ def run_optimization(config_path='configs/config.json'):
 
     # 문제 읽기
     print(f"Excel 파일 {file_path}에서 문제를 읽는 중...")
-    problem = read_problem_from_excel(
+    problem = read_problem_cached(
         file_path,
         cost_range=cost_range,
         cost_sheet=cost_sheet,
         value_range=value_range,
-        value_sheet=value_sheet
+        value_sheet=value_sheet,
+        cache_dir=cache_dir
     )
 
     # 현상유지 전략 추가
@@ -67,10 +128,8 @@ def run_optimization(config_path='configs/config.json'):
     if problem_type == 'cost_constraint':
         if normalize:
             print("민감도 정규화를 진행합니다.")
-            # 각 아이템에 대한 최댓값을 구함 value_maxes의 각 아이템은 [고장률 최댓값, ENS 최댓값, CIC 최댓값]을 포함
-            value_maxes = [item_table.max(axis=1).tolist() for item_table in problem["value"]]
-            # 고장률, ENS, CIC의 최댓값을 구함
-            max_values = [max(item) for item in zip(*value_maxes)]
+            # 고장률, ENS, CIC의 최댓값을 구함 (모든 아이템과 전략에 대해)
+            max_values = problem.value.max(axis=(0, 2)).tolist()
 
             # weight를 최댓값으로 나누어 정규화
             for i in range(len(value_weights)):
@@ -83,37 +142,137 @@ def run_optimization(config_path='configs/config.json'):
     print(f"{solver_type} 솔버로 {problem_type} 문제를 해결합니다...")
     start_time = time.time()
 
-    if solver_type.upper() == 'SCIP':
-        solver = scip
-    elif solver_type.upper() == 'CP-SAT':
-        solver = cpsat
-    else:
-        raise ValueError(f"지원하지 않는 솔버 유형입니다: {solver_type}. 지원되는 솔버는 'SCIP'와 'CP-SAT'입니다.")
+    solver = SOLVERS.get(solver_type.upper())
+    if solver is None:
+        raise ValueError(f"지원하지 않는 솔버 유형입니다: {solver_type}. 지원되는 솔버는 {', '.join(SOLVERS)}입니다.")
 
     if problem_type not in ['cost_constraint', 'reliability_constraint']:
         raise ValueError(
             f"지원하지 않는 문제 유형입니다: {problem_type}. 지원되는 문제 유형은 'cost_constraint'와 'reliability_constraint'입니다.")
 
-    if problem_type == 'cost_constraint':
+    if not hasattr(solver, f"solve_{problem_type}"):
+        raise ValueError(f"{solver_type} 솔버는 {problem_type} 문제를 지원하지 않습니다.")
+
+    # 단일 예산 풀이에만 전달하는 인자
+    solve_options = {}
+    # solver가 기록하는 목적 함수의 한계와 gap은 결과와 함께 출력
+    stats = {} if stats is None else stats
+
+    # 풀이 도중 찾은 해를 JSONL 파일에 기록
+    if incumbent_file is not None:
+        if 'on_solution' not in inspect.signature(getattr(solver, f"solve_{problem_type}")).parameters:
+            raise ValueError(f"{solver_type} 솔버는 풀이 중 해 기록(incumbent_file)을 지원하지 않습니다.")
+        if num_clusters is not None or (problem_type == 'cost_constraint' and isinstance(cost_constraint, (list, dict))):
+            raise ValueError("풀이 중 해 기록(incumbent_file)은 군집화나 여러 예산의 sweep과 함께 사용할 수 없습니다.")
+        print(f"풀이 중 찾은 해를 {incumbent_file} 파일에 기록합니다.")
+        solve_options['on_solution'] = jsonl_sink(incumbent_file)
+
+    if num_clusters is not None and (problem_type != 'cost_constraint' or isinstance(cost_constraint, (list, dict))):
+        raise ValueError("군집화(num_clusters)는 예산이 하나인 cost_constraint 문제만 지원합니다.")
+    # 군집 문제는 아이템 수가 그대로이므로 같은 아이템을 정수 변수 하나로 묶는(aggregate) solver에서만 작아짐
+    if num_clusters is not None and ('aggregate' not in inspect.signature(solver.solve_cost_constraint).parameters
+                                     or not solver_config.get('aggregate', True)):
+        raise ValueError(f"군집화(num_clusters)는 같은 아이템을 묶어 푸는(aggregate) SCIP, CP-SAT 솔버만 지원합니다. "
+                         f"현재 솔버: {solver_type}, aggregate: {solver_config.get('aggregate', True)}")
+
+    # 지난 풀이의 해(캐시 또는 지난 출력 시트)로 시작
+    if warm_start:
+        if 'initial_solution' not in inspect.signature(getattr(solver, f"solve_{problem_type}")).parameters:
+            raise ValueError(f"{solver_type} 솔버는 지난 해로 시작(warm_start)을 지원하지 않습니다.")
+        if num_clusters is not None or (problem_type == 'cost_constraint' and isinstance(cost_constraint, (list, dict))):
+            raise ValueError("지난 해로 시작(warm_start)은 군집화나 여러 예산의 sweep과 함께 사용할 수 없습니다.")
+        if warm_start_file is not None and os.path.exists(warm_start_file):
+            print(f"{warm_start_file} 파일에서 지난 해를 읽습니다.")
+            previous = load_solution_cache(warm_start_file)
+        else:
+            previous = read_previous_solution(output_file, output_sheet, output_cell)
+        if previous is None:
+            print("지난 해가 없어 처음부터 풉니다.")
+        else:
+            solve_options['initial_solution'] = warm_start_solution(
+                problem, previous, value_weights if problem_type == 'cost_constraint' else None,
+                allow_zero_strategy=not add_nothing,
+                cost_constraint=cost_constraint if problem_type == 'cost_constraint' else None)
+
+    if problem_type == 'cost_constraint' and isinstance(cost_constraint, (list, dict)):
+        # 여러 예산에 대한 sweep: 예산 목록 또는 {"start", "stop", "num"}
+        if isinstance(cost_constraint, dict):
+            cost_constraint = budget_range(cost_constraint['start'], cost_constraint['stop'], cost_constraint['num'])
+
+        frontier, solutions = sweep_cost_constraint(
+            problem,
+            cost_constraints=cost_constraint,
+            solver=solver,
+            value_weights=value_weights,
+            allow_zero_strategy=not add_nothing,
+            use_hint=solver_config.get('use_hint', True),
+            num_workers=solver_config.get('sweep_workers', 1),
+            stats=stats,
+            **get_solver_options(solver.solve_cost_constraint, solver_config,
+                                 ['cost_constraint', 'value_weights', 'allow_zero_strategy', 'initial_solution',
+                                  'stats'])
+        )
+
+        print("\n== 예산 sweep 결과 ==")
+        print(f"솔버 유형: {solver_type}")
+        print(frontier.to_string(index=False))
+        print(f"총 실행 시간: {time.time() - start_time:.4f}초")
+
+        print(f"\n결과를 {output_file} 파일의 {output_sheet} 시트에 저장합니다.")
+        write_frontier_to_excel(output_file,
+                                sheet_name=output_sheet,
+                                frontier=frontier,
+                                start_cell=output_cell,
+                                )
+        return frontier, solutions
+
+    if num_clusters is not None:
+        # 비슷한 아이템을 군집으로 묶어 근사
+        solution, total_cost, total_value, solve_time = solve_clustered(
+            problem,
+            cost_constraint=cost_constraint,
+            solver=solver,
+            value_weights=value_weights,
+            allow_zero_strategy=not add_nothing,
+            num_clusters=num_clusters,
+            stats=stats,
+            **get_solver_options(solver.solve_cost_constraint, solver_config,
+                                 ['cost_constraint', 'value_weights', 'allow_zero_strategy', 'stats'])
+        )
+    elif problem_type == 'cost_constraint':
         solution, total_cost, total_value, solve_time = solver.solve_cost_constraint(
             problem,
             cost_constraint=cost_constraint,
             value_weights=value_weights,
-            allow_zero_strategy=not add_nothing
+            allow_zero_strategy=not add_nothing,
+            stats=stats,
+            **solve_options,
+            **get_solver_options(solver.solve_cost_constraint, solver_config,
+                                 ['cost_constraint', 'value_weights', 'allow_zero_strategy', 'on_solution',
+                                  'initial_solution', 'stats'])
         )
     else:  # reliability_constraint
         solution, total_cost, total_value, solve_time = solver.solve_reliability_constraint(
             problem,
             reliability_constraint=reliability_constraint,
-            allow_zero_strategy=not add_nothing
+            allow_zero_strategy=not add_nothing,
+            stats=stats,
+            **solve_options,
+            **get_solver_options(solver.solve_reliability_constraint, solver_config,
+                                 ['reliability_constraint', 'allow_zero_strategy', 'on_solution', 'initial_solution',
+                                  'stats'])
         )
 
+    if warm_start_file is not None:
+        print(f"다음 풀이를 위해 해를 {warm_start_file} 파일에 저장합니다.")
+        save_solution_cache(warm_start_file, problem, solution)
+
     # 결과 출력
     print("\n== 최적화 결과 ==")
     print(f"문제 유형: {problem_type}")
     print(f"솔버 유형: {solver_type}")
 
-    strategies = problem['cost'].columns.tolist()
+    strategies = problem.strategy_label.tolist()
     if add_nothing:
         # 선택된 전략: 0 -> 교체  1 -> 정밀점검   2 -> 보통점검   3 -> 현상유지
         print(f"선택된 전략: ", end="")
@@ -129,6 +288,13 @@ def run_optimization(config_path='configs/config.json'):
 
     print(f"총 비용: {total_cost}")
     print(f"총 가치: {total_value}")
+    # 정확한 solver는 증명한 목적 함수의 한계, 근사 solver는 완화 문제의 한계(비용 제약은 상한, 신뢰도 제약은 하한)
+    objective_bound = stats.get('objective_bound',
+                                stats.get('upper_bound' if problem_type == 'cost_constraint' else 'lower_bound'))
+    if objective_bound is not None:
+        print(f"목적 함수 한계: {objective_bound}")
+    if stats.get('gap') is not None:
+        print(f"gap: {stats['gap']:.4%}")
     print(f"해결 시간: {solve_time:.4f}초")
     print(f"총 실행 시간: {time.time() - start_time:.4f}초")
 
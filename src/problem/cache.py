@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from src.problem.io import read_problem_from_excel
+from src.problem.problem import Problem
+
+"""
+이 모듈은 엑셀에서 읽은 문제를 디스크에 캐시하여, 같은 파일과 범위를 다시 읽을 때 엑셀 파싱을 건너뜁니다.
+
+수 MB의 .xlsm 파일은 load_workbook과 셀 순회에 수 초가 걸리지만, 같은 문제의 배열은 .npz 파일에서 수 밀리초에 읽을 수 있습니다.
+
+1. 캐시 키는 엑셀 파일 내용의 해시, 비용/가치 시트 이름과 범위, 캐시 형식의 버전으로 만듭니다.
+   파일을 저장하면 내용이 바뀌므로 수정 시각과 관계없이 이전 캐시를 사용하지 않습니다.
+2. 캐시 파일은 비용/가치 배열과 라벨(JSON 문자열)을 담은 .npz 파일이며, 라벨의 숫자/문자열 형식을 그대로 되살립니다.
+3. 캐시 디렉터리의 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 캐시부터 지웁니다(LRU).
+   캐시를 읽을 때마다 파일의 수정 시각을 갱신하여 사용 시각으로 씁니다.
+"""
+
+# 캐시 파일을 저장할 기본 디렉터리
+PROBLEM_CACHE_DIR = "data/.problem_cache"
+# 캐시 디렉터리의 최대 크기(바이트)
+PROBLEM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# 캐시 형식의 버전. 엑셀을 읽는 방법이나 캐시 형식이 바뀌면 올려서 이전 캐시를 사용하지 않게 함
+PROBLEM_CACHE_VERSION = 1
+# 파일 해시를 계산할 때 한 번에 읽는 크기(바이트)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path):
+    """
+    파일 내용의 해시(blake2b)를 계산합니다.
+
+    Args:
+        file_path: 파일 경로
+
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def problem_cache_key(file_path, cost_sheet, cost_range, value_sheet, value_range):
+    """
+    엑셀 파일 내용과 시트 이름, 범위로 캐시 키를 만듭니다.
+
+    Returns:
+        str: 캐시 파일 이름으로 쓸 수 있는 16진수 문자열
+    """
+    source = json.dumps([PROBLEM_CACHE_VERSION, file_digest(file_path), cost_sheet, cost_range, value_sheet, value_range],
+                        ensure_ascii=False)
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def save_problem(file_path, problem):
+    """
+    문제를 .npz 파일로 저장합니다. 다른 프로세스가 덜 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 이름을 바꿉니다.
+
+    Args:
+        file_path: 저장할 파일 경로
+        problem: Problem
+
+    Raises:
+        TypeError: 라벨을 JSON으로 저장할 수 없는 경우(날짜 등)
+    """
+    labels = json.dumps({"item": problem.item_label.tolist(),
+                         "strategy": problem.strategy_label.tolist(),
+                         "value": problem.value_label.tolist()}, ensure_ascii=False)
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            np.savez(f, cost=problem.cost, value=problem.value, labels=np.array(labels))
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_problem(file_path):
+    """
+    save_problem으로 저장한 문제를 읽습니다.
+
+    Args:
+        file_path: .npz 파일 경로
+
+    Returns:
+        Problem: 저장된 문제. 파일이 없거나 손상된 경우 None
+    """
+    try:
+        with np.load(file_path, allow_pickle=False) as data:
+            labels = json.loads(str(data["labels"]))
+            return Problem(data["cost"], data["value"], item_label=labels["item"],
+                           strategy_label=labels["strategy"], value_label=labels["value"])
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def _evict(cache_dir, max_bytes, keep=None):
+    """
+    캐시 디렉터리의 전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 캐시 파일을 지웁니다.
+    keep은 방금 저장한 파일로, 지우지 않습니다.
+    """
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(".npz"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.samefile(path, keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def read_problem_cached(file_path, cost_sheet="Sheet1", cost_range=None, value_sheet="Sheet1", value_range=None,
+                        cache_dir=PROBLEM_CACHE_DIR, max_bytes=PROBLEM_CACHE_MAX_BYTES):
+    """
+    read_problem_from_excel과 같이 엑셀에서 문제를 읽되, 같은 파일 내용과 범위의 캐시가 있으면 엑셀을 읽지 않습니다.
+
+    Args:
+        file_path: 엑셀파일의 이름
+        cost_sheet: 비용 시트 이름
+        cost_range: 비용 시트에서 읽을 데이터 범위, label을 포함합니다.
+        value_sheet: 가치 시트 이름
+        value_range: 가치 시트에서 읽을 데이터 범위, label을 포함합니다.
+        cache_dir: 캐시 디렉터리. None인 경우 캐시를 사용하지 않습니다.
+        max_bytes: 캐시 디렉터리의 최대 크기(바이트)
+
+    Returns:
+        Problem: 비용 배열과 가치 배열을 담은 문제
+
+    Raises:
+        ValueError: 잘못된 엑셀 파일입니다.
+    """
+    if cache_dir is None:
+        return read_problem_from_excel(file_path, cost_sheet, cost_range, value_sheet, value_range)
+
+    key = problem_cache_key(file_path, cost_sheet, cost_range, value_sheet, value_range)
+    cache_path = os.path.join(cache_dir, f"{key}.npz")
+
+    problem = load_problem(cache_path)
+    if problem is not None:
+        # LRU를 위해 사용 시각을 갱신
+        os.utime(cache_path)
+        print(f"캐시 '{cache_path}'에서 문제를 읽었습니다.")
+        return problem
+
+    problem = read_problem_from_excel(file_path, cost_sheet, cost_range, value_sheet, value_range)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        save_problem(cache_path, problem)
+        _evict(cache_dir, max_bytes, keep=cache_path)
+    except (OSError, TypeError) as error:
+        print(f"문제를 캐시에 저장하지 못했습니다: {error}")
+    return problem
@@ -3,18 +3,24 @@ import os
 import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.utils.cell import range_boundaries
 from openpyxl.workbook import Workbook
 from pandas import DataFrame
 
+from src.problem.problem import Problem, as_problem
+from src.problem.strategy import _as_index_array
+
 
 def read_problem_from_excel(file_path: str,
                             cost_sheet: str = "Sheet1",
                             cost_range: str = None,
                             value_sheet: str = "Sheet1",
                             value_range: str = None,
-                            ) -> dict:
+                            ) -> Problem:
     """
     최적화문제를 엑셀로부터 로드합니다.
+    워크북을 읽기 전용으로 열고 필요한 범위의 값만 행 단위로 읽어 비용/가치 배열을 바로 채웁니다.
+    비용과 가치가 같은 시트에 있으면 두 범위를 감싸는 범위를 한 번만 읽습니다.
 
     Args:
         file_path: 엑셀파일의 이름,
@@ -23,7 +29,7 @@ def read_problem_from_excel(file_path: str,
         value_sheet: 가치 시트 이름
         value_range: 가치 시트에서 읽을 데이터 범위, label을 포함합니다. ./data/data.xlsx을 참고하세요
     Returns:
-        Dict [DataFrame]: {"cost": 비용 데이터, "value": list[가치 데이터]}
+        Problem: 비용 배열과 가치 배열을 담은 문제. problem.to_dict()로 {"cost": 비용 데이터, "value": list[가치 데이터]}를 얻을 수 있습니다.
 
     Raises:
         ValueError: 잘못된 엑셀 파일입니다.
@@ -32,16 +38,96 @@ def read_problem_from_excel(file_path: str,
     if cost_range is None or value_range is None:
         raise ValueError("Please provide the range of cells to read.")
 
-    wb = load_workbook(file_path, data_only=True)
-    ws_cost = wb[cost_sheet]
-    ws_value = wb[value_sheet]
+    wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        if cost_sheet == value_sheet:
+            cost_rows, value_rows = _read_ranges(wb[cost_sheet], [cost_range, value_range])
+        else:
+            cost_rows, = _read_ranges(wb[cost_sheet], [cost_range])
+            value_rows, = _read_ranges(wb[value_sheet], [value_range])
+    finally:
+        wb.close()
 
-    cost = read_cost_data(ws_cost, cost_range)
-    value = read_value_data(ws_value, value_range)
+    item_label, strategy_label, cost = _parse_cost_rows(cost_rows)
+    _, value_label, _, value = _parse_value_rows(value_rows)
 
-    if cost.empty or not value:
+    if cost.size == 0 or value.size == 0:
         raise ValueError("잘못된 엑셀 파일입니다.")
-    return {"cost": cost, "value": value}
+    return Problem(cost=cost, value=value, item_label=item_label, strategy_label=strategy_label,
+                   value_label=value_label)
+
+
+def _read_ranges(ws, cell_ranges: list[str]) -> list[list[tuple]]:
+    """
+    시트에서 여러 범위의 값을 읽습니다. 범위들을 감싸는 범위를 iter_rows(values_only=True)로 한 번만 읽고 범위별로 자릅니다.
+    읽기 전용 시트는 마지막으로 저장된 행 뒤의 행을 돌려주지 않으므로, 요청한 크기까지 빈 셀(None)로 채웁니다.
+
+    Args:
+        ws: 엑셀 시트 (읽기 전용 시트 포함)
+        cell_ranges: 읽을 범위 목록. ex) ["N2:Q42", "A1:J42"]
+
+    Returns:
+        list[list[tuple]]: 범위별 행 값 목록. 각 범위는 요청한 행과 열의 개수를 그대로 가집니다.
+    """
+    bounds = [range_boundaries(cell_range) for cell_range in cell_ranges]
+    min_col = min(bound[0] for bound in bounds)
+    min_row = min(bound[1] for bound in bounds)
+    max_col = max(bound[2] for bound in bounds)
+    max_row = max(bound[3] for bound in bounds)
+    width = max_col - min_col + 1
+
+    rows = [row + (None,) * (width - len(row))
+            for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col,
+                                    values_only=True)]
+    rows += [(None,) * width] * (max_row - min_row + 1 - len(rows))
+    return [[row[c0 - min_col:c1 - min_col + 1] for row in rows[r0 - min_row:r1 - min_row + 1]]
+            for c0, r0, c1, r1 in bounds]
+
+
+def _to_float_array(rows) -> np.ndarray:
+    """
+    셀 값의 2차원 목록을 float64 배열로 변환합니다. 빈 셀(None)은 NaN입니다.
+    """
+    return np.array([[np.nan if value is None else value for value in row] for row in rows], dtype=np.float64)
+
+
+def _parse_cost_rows(rows: list[tuple]) -> tuple[list, list, np.ndarray]:
+    """
+    비용 범위의 값에서 라벨과 비용 배열을 분리합니다. 첫 행은 전략 라벨, 첫 열은 아이템 라벨입니다.
+
+    Returns:
+        (item_label, strategy_label, cost): 아이템 라벨, 전략 라벨, 비용 배열 (n_items, n_strategies)
+    """
+    strategy_label = list(rows[0][1:])
+    item_label = [row[0] for row in rows[1:]]
+    cost = _to_float_array([row[1:] for row in rows[1:]]).reshape(len(item_label), len(strategy_label))
+    return item_label, strategy_label, cost
+
+
+def _parse_value_rows(rows: list[tuple]) -> tuple[list, list, list, np.ndarray]:
+    """
+    가치 범위의 값에서 라벨과 가치 배열을 분리합니다.
+    첫 행은 가치 라벨, 둘째 행은 가치마다 반복되는 전략 라벨, 첫 열은 아이템 라벨입니다.
+
+    Returns:
+        (item_label, value_label, strategy_label, value): 아이템 라벨, 가치 라벨, 전략 라벨,
+        가치 배열 (n_items, value_dim, n_strategies)
+    """
+    # 가치의 label을 분리하는 과정 ["고장률 민감도", "ENS 민감도", "CIC 민감도"] 와 같은 형태로 추출
+    value_label = [label for label in rows[0][1:] if label is not None]
+    value_dim = len(value_label)  # 가치의 차원
+
+    # strategy 라벨을 분리하는 과정 ["교체", "정밀점검", "보통점검"] 와 같은 형태로 추출
+    strategy_label = list(dict.fromkeys(label for label in rows[1] if label is not None))
+    num_strategy = len(strategy_label)  # 전략의 개수
+
+    # item 라벨을 분리
+    item_label = [row[0] for row in rows[2:]]
+
+    # 가치별로 전략 열이 이어지므로 (아이템, 가치, 전략) 순서로 바꿈
+    value = _to_float_array([row[1:1 + value_dim * num_strategy] for row in rows[2:]])
+    value = value.reshape(len(item_label), value_dim, num_strategy)
+    return item_label, value_label, strategy_label, value
 
 
 def read_cost_data(ws: Workbook, value_range: str) -> pd.DataFrame:
@@ -54,15 +140,9 @@ def read_cost_data(ws: Workbook, value_range: str) -> pd.DataFrame:
     Returns:
         DataFrame: 비용 데이터
     """
-    cost_range = ws[value_range.split(":")[0]: value_range.split(":")[1]]
-
-    strategy_label = [cell.value for cell in cost_range[0]][1:]
-    item_label = [record[0].value for record in cost_range][1:]
-
-    costs = [[cell1.value, cell2.value, cell3.value] for _, cell1, cell2, cell3 in cost_range[1:]]
-    costs = pd.DataFrame(costs, columns=strategy_label, index=item_label)
-
-    return costs
+    rows, = _read_ranges(ws, [value_range])
+    item_label, strategy_label, costs = _parse_cost_rows(rows)
+    return pd.DataFrame(costs, columns=strategy_label, index=item_label)
 
 
 def read_value_data(ws: Workbook, data_range: str) -> list[pd.DataFrame]:
@@ -75,43 +155,190 @@ def read_value_data(ws: Workbook, data_range: str) -> list[pd.DataFrame]:
     Returns:
         List[DataFrame]: 가치 데이터 리스트
     """
-    value_range = ws[data_range.split(":")[0]: data_range.split(":")[1]]
+    rows, = _read_ranges(ws, [data_range])
+    _, value_label, strategy_label, values = _parse_value_rows(rows)
+    return [pd.DataFrame(item_value, columns=strategy_label, index=value_label) for item_value in values]
 
-    # 가치의 label을 분리하는 과정 ["고장률 민감도", "ENS 민감도", "CIC 민감도"] 와 같은 형태로 추출
-    value_label = [cell.value for cell in value_range[0][1:]]  # 1행의 값들을 리스트로 저장
-    value_label = [label for label in value_label if label is not None]  # None 값 제거
-    value_dim = len(value_label)  # 가치의 차원
 
-    # strategy 라벨을 분리하는 과정 ["교체", "정밀점검", "보통점검"] 와 같은 형태로 추출
-    strategy_label = [cell.value for cell in value_range[1]]  # 2행의 값들을 리스트로 저장
-    strategy_label = [label for label in strategy_label if label is not None]  # None 값 제거
-    strategy_label = list(dict.fromkeys(strategy_label))  # 중복 제거
-    num_strategy = len(strategy_label)  # 전략의 개수
+class ExcelWriter:
+    """
+    여러 해와 시트를 한 번 열고 한 번 저장하는 엑셀 저장기입니다.
+    with 문으로 사용하면 예외 없이 끝났을 때 저장합니다.
 
-    # item 라벨을 분리
-    item_label = [record[0].value for record in value_range[2:]]
-    num_item = len(item_label)  # 아이템의 개수
+    쓰기 전용(write_only) 모드는 새 파일을 셀 객체를 유지하지 않고 행 단위로 써서 빠르게 저장합니다.
+    쓰기 전용 시트는 한 번만 만들 수 있고, 위에서 아래로만 쓸 수 있습니다.
 
-    values = []
-    value_data = np.array([record[1:] for record in value_range[2:]])
+    Attributes:
+        file_path: 저장할 엑셀파일의 이름
+        write_only: 쓰기 전용 모드 여부
+        workbook: openpyxl 워크북
+    """
 
-    # 각 아이템에 대한 가치를 순회
-    for i in range(num_item):
-        item_info = []
+    def __init__(self, file_path: str, write_only: bool = None):
+        """
+        Args:
+            file_path: 저장할 엑셀파일의 이름
+            write_only: 쓰기 전용 모드 여부. None인 경우 파일이 없으면 쓰기 전용, 있으면 기존 파일을 열어 수정합니다.
+
+        Raises:
+            ValueError: 이미 있는 파일을 쓰기 전용 모드로 열려는 경우
+        """
+        exists = os.path.exists(file_path)
+        if write_only is None:
+            write_only = not exists
+        if write_only and exists:
+            raise ValueError(f"'{file_path}' 파일이 이미 있습니다. 쓰기 전용 모드는 새 파일에만 사용할 수 있습니다.")
+
+        self.file_path = file_path
+        self.write_only = write_only
+        if write_only:
+            self.workbook = Workbook(write_only=True)
+        elif exists:
+            self.workbook = load_workbook(file_path)
+        else:
+            self.workbook = Workbook()
+        # 새 워크북의 기본 시트는 처음 요청한 시트의 이름으로 사용
+        self._blank = not exists and not write_only
+        # 쓰기 전용 시트별로 다음에 쓸 행 번호
+        self._next_row = {}
+        if not exists:
+            print(f"'{file_path}' 파일을 새로 생성합니다.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+
+    def save(self) -> None:
+        """
+        워크북을 파일에 저장합니다. 쓰기 전용 모드는 한 번만 저장할 수 있습니다.
+        """
+        self.workbook.save(self.file_path)
+
+    def _worksheet(self, sheet_name: str):
+        """
+        시트를 반환합니다. 시트가 없으면 새로 생성합니다.
+
+        Raises:
+            ValueError: 쓰기 전용 모드에서 이미 쓴 시트를 다시 요청한 경우
+        """
+        if self.write_only:
+            if sheet_name in self._next_row:
+                raise ValueError(f"쓰기 전용 모드에서는 '{sheet_name}' 시트를 한 번만 쓸 수 있습니다.")
+            self._next_row[sheet_name] = 1
+            return self.workbook.create_sheet(sheet_name)
+
+        if self._blank:
+            self._blank = False
+            ws = self.workbook.active
+            ws.title = sheet_name
+            return ws
+        if sheet_name in self.workbook.sheetnames:
+            return self.workbook[sheet_name]
+        print(f"'{sheet_name}' 시트를 새로 생성했습니다.")
+        return self.workbook.create_sheet(sheet_name)
+
+    def _write_rows(self, ws, start_row: int, start_col: int, rows) -> None:
+        """
+        시작 셀부터 행 목록을 씁니다. 쓰기 전용 시트는 빈 행과 빈 열을 채워 행 단위로 추가합니다.
+
+        Raises:
+            ValueError: 쓰기 전용 시트에서 이미 쓴 행보다 위에 쓰려는 경우
+        """
+        if not self.write_only:
+            for row, record in enumerate(rows, start=start_row):
+                for col, value in enumerate(record, start=start_col):
+                    ws.cell(row=row, column=col, value=value)
+            return
+
+        next_row = self._next_row[ws.title]
+        if start_row < next_row:
+            raise ValueError(f"쓰기 전용 시트 '{ws.title}'는 위에서 아래로만 쓸 수 있습니다. {start_row} < {next_row}")
+        for _ in range(start_row - next_row):
+            ws.append([])
+        padding = [None] * (start_col - 1)
+        for record in rows:
+            ws.append(padding + list(record))
+            start_row += 1
+        self._next_row[ws.title] = start_row
+
+    def write_solution(self,
+                       sheet_name: str,
+                       problem: Problem | dict,
+                       solution: list[int] | list[list[bool]],
+                       start_cell: str = "A2",
+                       add_nothing: bool = True,
+                       ) -> None:
+        """
+        해를 시트에 씁니다. 시작 셀로부터 우하단으로 채워나갑니다. 행은 아이템을, 열은 전략을 나타냅니다.
+
+        Args:
+            sheet_name: 엑셀 시트 이름
+            problem: Problem 또는 dict {"cost": DataFrame, "value": list[DataFrame]}
+            solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
+            start_cell: 시작 셀 위치, 해당 셀부터 우하단으로 채워나갑니다.
+            add_nothing: True인 경우, '현상유지' 전략을 계산하여 추가합니다. 모든 전략을 선택하지 않은 경우, 비용과 가치가 0인 '현상유지' 전략으로 취급합니다.
+        """
+        problem = as_problem(problem)
+        strategy_label = problem.strategy_label.tolist()
+        if not add_nothing:
+            print("솔루션 저장에 '현상유지' 전략을 별도로 추가합니다.")
+            strategy_label.append("현상유지")
+
+        matrix = solution_matrix(problem, solution, add_nothing)
+        label_row = get_start_row(start_cell)
+        label_col = get_start_col(start_cell)
+
+        ws = self._worksheet(sheet_name)
+        # 라벨 행과 아이템별 (라벨, one-hot) 행
+        self._write_rows(ws, label_row, label_col + 1, [strategy_label])
+        self._write_rows(ws, label_row + 1, label_col,
+                         [[item, *row] for item, row in zip(problem.item_label.tolist(), matrix.tolist())])
+
+    def write_frontier(self, sheet_name: str, frontier: DataFrame, start_cell: str = "A1") -> None:
+        """
+        예산 sweep 결과(예산별 비용-가치 표)를 시트에 씁니다. 시작 셀에 열 이름을 쓰고, 그 아래로 예산별 결과를 채워나갑니다.
+
+        Args:
+            sheet_name: 엑셀 시트 이름
+            frontier: sweep_cost_constraint가 반환한 결과 표
+            start_cell: 시작 셀 위치
+        """
+        ws = self._worksheet(sheet_name)
+        # 해가 없는 예산의 NaN은 빈 셀로 저장
+        records = [[None if pd.isna(value) else float(value) for value in record]
+                   for record in frontier.itertuples(index=False)]
+        self._write_rows(ws, get_start_row(start_cell), get_start_col(start_cell),
+                         [[str(label) for label in frontier.columns], *records])
+
+
+def solution_matrix(problem: Problem | dict,
+                    solution: list[int] | list[list[bool]],
+                    add_nothing: bool = True,
+                    ) -> np.ndarray:
+    """
+    해를 아이템별 전략의 one-hot 행렬로 만듭니다.
 
-        # 빈 행에 대해서는 건너뛰기
-        if not value_data[i].any():
-            continue
+    Args:
+        problem: Problem 또는 dict {"cost": DataFrame, "value": list[DataFrame]}
+        solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
+        add_nothing: False인 경우 아무 전략도 선택하지 않은 아이템을 나타내는 '현상유지' 열을 마지막에 추가합니다.
 
-        # 각 가치에 대한 전략을 순회
-        for j in range(value_dim):
-            _value = []
-            for k in range(num_strategy):
-                _value.append(value_data[i][j * num_strategy + k].value)
-            item_info.append(_value)
-        values.append(pd.DataFrame(item_info, columns=strategy_label, index=value_label))
+    Returns:
+        np.ndarray: one-hot 행렬 (n_items, n_strategies) 또는 (n_items, n_strategies + 1)
+    """
+    problem = as_problem(problem)
+    selected = _as_index_array(solution)
+    num_strategy = problem.num_strategy
 
-    return values
+    matrix = np.zeros((problem.num_item, num_strategy + (0 if add_nothing else 1)), dtype=np.int8)
+    chosen = selected >= 0
+    matrix[np.flatnonzero(chosen), selected[chosen]] = 1
+    if not add_nothing:
+        matrix[~chosen, num_strategy] = 1
+    return matrix
 
 
 def write_solution_to_excel(file_path: str = "output_rel.xlsx",
@@ -123,80 +350,59 @@ def write_solution_to_excel(file_path: str = "output_rel.xlsx",
                             ) -> None:
     """
     최적화문제의 결과를 엑셀에 저장합니다. 시작 셀로부터 우하단으로 채워나갑니다. 행은 아이템을, 열은 전략을 나타냅니다.
+    여러 해를 저장할 때는 ExcelWriter로 파일을 한 번만 열고 저장하는 것이 빠릅니다.
 
     Args:
         file_path: 저장할 엑셀파일의 이름
         sheet_name: 엑셀 시트 이름
         start_cell: 시작 셀 위치, 해당 셀부터 우하단으로 채워나갑니다.
-        problem: dict {"cost": DataFrame, "value": list[DataFrame]}
+        problem: Problem 또는 dict {"cost": DataFrame, "value": list[DataFrame]}
         solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
         add_nothing: True인 경우, '현상유지' 전략을 계산하여 추가합니다. 모든 전략을 선택하지 않은 경우, 비용과 가치가 0인 '현상유지' 전략으로 취급합니다.
-    Returns:
-        DataFrame: 비용 데이터
     """
     if problem is None or solution is None:
         raise ValueError("Please provide the problem and solution to write.")
 
-    if solution[0] is list:
-        solution = [solution[i].index(True) for i in range(len(solution))]
-
-    if not os.path.exists(file_path):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = sheet_name  # 첫 시트 이름 지정
-        print(f"'{file_path}' 파일과 '{sheet_name}' 시트를 새로 생성했습니다.")
-    else:
-        wb = load_workbook(file_path)
-        if sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-        else:
-            ws = wb.create_sheet(sheet_name)
-            print(f"'{sheet_name}' 시트를 새로 생성했습니다.")
-
-    ws = wb[sheet_name]
-
-
-    strategy_label = problem["cost"].columns.tolist()
-    item_label = problem["cost"].index.tolist()
+    with ExcelWriter(file_path) as writer:
+        writer.write_solution(sheet_name, problem, solution, start_cell, add_nothing)
 
-    label_row = get_start_row(start_cell)
-    start_row = label_row + 1
-    label_col = get_start_col(start_cell)
-    start_col = label_col + 1
 
-    num_item = len(item_label)
-    num_strategy = len(strategy_label)
-
-    # 라벨 적용하기
-    for row in range(0, num_item):
-        ws.cell(row=row + label_row + 1, column=label_col, value=item_label[row])
-
-    for col in range(0, num_strategy):
-        ws.cell(row=label_row, column=col + label_col + 1, value=strategy_label[col])
-
-    if not add_nothing:
-        print("솔루션 저장에 '현상유지' 전략을 별도로 추가합니다.")
-        ws.cell(row=label_row, column=label_col + num_strategy + 1, value="현상유지")
-        for row in range(0, num_item):
-            ws.cell(row=row + label_row + 1, column=label_col + num_strategy + 1, value=1 if solution[row] == -1 else 0)
-
-    for i_item in range(0, num_item):
-        for i_strategy in range(0, num_strategy):
-            ws.cell(row=i_item + start_row, column=i_strategy + start_col,
-                    value=1 if solution[i_item] == i_strategy else 0)
+def write_frontier_to_excel(file_path: str,
+                            sheet_name: str,
+                            frontier: DataFrame,
+                            start_cell: str = "A1",
+                            ) -> None:
+    """
+    예산 sweep 결과(예산별 비용-가치 표)를 엑셀에 저장합니다. 시작 셀에 열 이름을 쓰고, 그 아래로 예산별 결과를 채워나갑니다.
 
-    wb.save(file_path)
+    Args:
+        file_path: 저장할 엑셀파일의 이름
+        sheet_name: 엑셀 시트 이름
+        frontier: sweep_cost_constraint가 반환한 결과 표
+        start_cell: 시작 셀 위치
+    """
+    with ExcelWriter(file_path) as writer:
+        writer.write_frontier(sheet_name, frontier, start_cell)
 
 
-def add_nothing_strategy(problem) -> dict:
+def add_nothing_strategy(problem: Problem | dict) -> Problem | dict:
     """
     문제 데이터에 아무것도 하지 않는 전략을 마지막에 추가합니다.
     Args:
-        problem: dict {"cost": DataFrame, "value": list[DataFrame]}
+        problem: Problem 또는 dict {"cost": DataFrame, "value": list[DataFrame]}
 
     Returns:
-        Dict: {"cost": 비용 데이터, "value": 가치 데이터 리스트}
+        Problem: 비용과 가치가 0인 '현상유지' 전략이 추가된 문제. 딕셔너리가 주어진 경우 해당 딕셔너리를 수정하여 반환합니다.
     """
+    if isinstance(problem, Problem):
+        num_item, _ = problem.cost.shape
+        return Problem(cost=np.concatenate([problem.cost, np.zeros((num_item, 1))], axis=1),
+                       value=np.concatenate([problem.value, np.zeros((num_item, problem.value_dim, 1))], axis=2),
+                       item_label=problem.item_label,
+                       strategy_label=[*problem.strategy_label, "현상유지"],
+                       value_label=problem.value_label,
+                       )
+
     # 마지막에 추가
     idx = len(problem["cost"].columns)  # 현재 컬럼 개수
     problem["cost"].insert(idx, "현상유지", 0)
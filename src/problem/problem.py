@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+"""
+이 모듈은 유지보수 전략 최적화 문제를 dense NumPy 배열로 표현하는 Problem 클래스를 제공합니다.
+
+기존의 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}는 아이템마다 DataFrame을 하나씩 가지므로,
+아이템 수가 수만 개가 되면 메모리와 .iloc 접근 비용이 솔버 실행 이전에 병목이 됩니다.
+Problem은 같은 정보를 아래의 배열로 보관합니다.
+
+cost  : float64 배열 (n_items, n_strategies)
+value : float64 배열 (n_items, value_dim, n_strategies)
+item_label, strategy_label, value_label : 각 축의 레이블 배열
+
+기존 코드와의 호환을 위해 problem["cost"], problem["value"]로 접근하면 기존 형태의 DataFrame을 만들어 반환합니다.
+"""
+
+
+class Problem:
+    """
+    유지보수 전략 최적화 문제를 담는 클래스입니다.
+
+    Attributes:
+        cost: 각 아이템의 전략별 비용 배열 (n_items, n_strategies)
+        value: 각 아이템의 가치 차원별, 전략별 가치 배열 (n_items, value_dim, n_strategies)
+        item_label: 아이템 레이블 배열 (n_items,)
+        strategy_label: 전략 레이블 배열 (n_strategies,)
+        value_label: 가치 레이블 배열 (value_dim,)
+    """
+
+    def __init__(self,
+                 cost,
+                 value,
+                 item_label=None,
+                 strategy_label=None,
+                 value_label=None,
+                 ):
+        """
+        Args:
+            cost: 비용 배열 (n_items, n_strategies)
+            value: 가치 배열 (n_items, value_dim, n_strategies)
+            item_label: 아이템 레이블 목록. None인 경우 자동 생성
+            strategy_label: 전략 레이블 목록. None인 경우 자동 생성
+            value_label: 가치 레이블 목록. None인 경우 자동 생성
+
+        Raises:
+            ValueError: 배열이나 레이블의 크기가 일치하지 않을 경우
+        """
+        cost = np.ascontiguousarray(cost, dtype=np.float64)
+        value = np.ascontiguousarray(value, dtype=np.float64)
+
+        if cost.ndim != 2:
+            raise ValueError(f"cost must be 2-dimensional (n_items, n_strategies). \n{cost.shape}")
+        if value.ndim != 3:
+            raise ValueError(f"value must be 3-dimensional (n_items, value_dim, n_strategies). \n{value.shape}")
+        if cost.shape[0] != value.shape[0]:
+            raise ValueError(f"비용테이블과 가치테이블에 존재하는 장치의 수가 일치하지 않습니다.\n"
+                             f"비용테이블의 장치: {cost.shape[0]}\n"
+                             f"가치테이블의 장치: {value.shape[0]}\n"
+                             f"위 두 값이 일정하지 않을 경우, 입력 테이블의 범위가 잘못 설정되었을 수 있습니다.\n")
+        if cost.shape[1] != value.shape[2]:
+            raise ValueError(f"비용테이블과 가치테이블의 전략 수가 일치하지 않습니다. \n{cost.shape[1]} != {value.shape[2]}")
+
+        num_item, num_strategy = cost.shape
+        value_dim = value.shape[1]
+
+        self.cost = cost
+        self.value = value
+        self.item_label = _as_label(item_label, num_item, "Item")
+        self.strategy_label = _as_label(strategy_label, num_strategy, "Strategy")
+        self.value_label = _as_label(value_label, value_dim, "Value")
+
+    @property
+    def num_item(self) -> int:
+        return self.cost.shape[0]
+
+    @property
+    def num_strategy(self) -> int:
+        return self.cost.shape[1]
+
+    @property
+    def value_dim(self) -> int:
+        return self.value.shape[1]
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        """(n_items, value_dim, n_strategies)"""
+        return self.value.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.cost.nbytes + self.value.nbytes
+
+    @classmethod
+    def from_dict(cls, problem: dict) -> "Problem":
+        """
+        기존의 문제 딕셔너리로부터 Problem을 생성합니다.
+
+        Args:
+            problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+
+        Returns:
+            Problem: 변환된 문제
+
+        Raises:
+            ValueError: 아이템 수 또는 전략 수가 일치하지 않을 경우
+        """
+        costs = problem["cost"]
+        values = problem["value"]
+
+        if len(values) == 0:
+            raise ValueError("가치 데이터가 비어 있습니다.")
+
+        value_dim, num_strategy = values[0].shape
+        value = np.empty((len(values), value_dim, num_strategy), dtype=np.float64)
+        for i, item_value in enumerate(values):
+            if item_value.shape != (value_dim, num_strategy):
+                raise ValueError(f"values[{i}].shape must be equal to {(value_dim, num_strategy)}. \n{item_value.shape}")
+            # 빈 셀(None)은 NaN으로 변환됩니다.
+            value[i] = np.asarray(item_value, dtype=np.float64)
+
+        return cls(cost=np.asarray(costs, dtype=np.float64),
+                   value=value,
+                   item_label=list(costs.index),
+                   strategy_label=list(costs.columns),
+                   value_label=list(values[0].index),
+                   )
+
+    def to_dict(self) -> dict:
+        """
+        기존의 문제 딕셔너리 형태로 변환합니다.
+
+        Returns:
+            문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        """
+        return {
+            "cost": self.cost_frame(),
+            "value": self.value_frames(),
+        }
+
+    def cost_frame(self) -> pd.DataFrame:
+        """
+        비용 배열을 DataFrame으로 반환합니다. 행은 아이템, 열은 전략입니다.
+        """
+        return pd.DataFrame(self.cost, index=list(self.item_label), columns=list(self.strategy_label))
+
+    def value_frames(self) -> list[pd.DataFrame]:
+        """
+        가치 배열을 아이템별 DataFrame 리스트로 반환합니다. 각 DataFrame의 행은 가치, 열은 전략입니다.
+        """
+        value_label = list(self.value_label)
+        strategy_label = list(self.strategy_label)
+        return [pd.DataFrame(item_value, index=value_label, columns=strategy_label) for item_value in self.value]
+
+    def __getitem__(self, key: str):
+        # 기존 딕셔너리 형태의 접근 problem["cost"], problem["value"]를 지원합니다.
+        if key == "cost":
+            return self.cost_frame()
+        if key == "value":
+            return self.value_frames()
+        raise KeyError(key)
+
+    def __repr__(self):
+        return (f"Problem(num_item={self.num_item}, num_strategy={self.num_strategy}, value_dim={self.value_dim}, "
+                f"strategy_label={list(self.strategy_label)}, value_label={list(self.value_label)})")
+
+
+def as_problem(problem) -> Problem:
+    """
+    문제 딕셔너리 또는 Problem을 Problem으로 변환합니다. 이미 Problem인 경우 그대로 반환합니다.
+
+    Args:
+        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]} 또는 Problem
+
+    Returns:
+        Problem: 변환된 문제
+    """
+    if isinstance(problem, Problem):
+        return problem
+    return Problem.from_dict(problem)
+
+
+def _as_label(label, size: int, prefix: str) -> np.ndarray:
+    """
+    레이블 목록을 object 배열로 변환합니다. None인 경우 "{prefix} {i}" 형태로 자동 생성합니다.
+    """
+    if label is None:
+        label = [f"{prefix} {i}" for i in range(size)]
+
+    result = np.empty(len(label), dtype=object)
+    result[:] = list(label)
+
+    if len(result) != size:
+        raise ValueError(f"len({prefix.lower()}_label) must be equal to {size}. \n{len(result)} != {size}")
+    return result
+
+
+def _check_finite(array):
+    """
+    비용 또는 가치 배열에 비어 있거나(NaN) 숫자가 아닌 값이 없는지 확인합니다.
+
+    Raises:
+        ValueError: 비어 있거나 숫자가 아닌 값이 포함된 경우
+    """
+    if not np.isfinite(array).all():
+        raise ValueError("비용 또는 가치 테이블에 비어 있거나 숫자가 아닌 셀이 있습니다. 입력 테이블의 범위를 확인하세요.")
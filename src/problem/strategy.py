@@ -3,12 +3,16 @@ import random
 import numpy as np
 import pandas as pd
 
+from src.problem.problem import Problem, as_problem
+
 """
 이 모듈은 유지보수 전략 최적화 문제를 생성하고 해결하는 데 사용됩니다.
 랜덤한 유지보수 전략 최적화 문제를 생성하고, SCIP, CP-SAT 솔버를 사용하여 문제를 해결합니다.
 
 최적화 문제는 아래와 같이 정의됩니다.
 각 아이템은 여러 개의 전략을 가질 수 있으며, 각 전략은 비용과 가치를 가집니다.
+내부적으로는 src.problem.problem.Problem의 dense 배열 cost[n_items, n_strategies], value[n_items, value_dim, n_strategies]를 사용하며,
+아래의 딕셔너리 형태와 Problem.from_dict(), Problem.to_dict()로 상호 변환할 수 있습니다.
 
 dict {
     "cost" : pandas.DataFrame
@@ -61,7 +65,7 @@ def make_random_problem(num_items: int = 50,
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
 
     Returns:
-        생성된 문제를 담은 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        Problem: 생성된 문제. problem.to_dict()로 {"cost": DataFrame, "value": [DataFrame...]} 형태를 얻을 수 있습니다.
 
     Raises:
         ValueError: strategy_label 또는 item_label의 길이가 올바르지 않을 경우
@@ -78,12 +82,9 @@ def make_random_problem(num_items: int = 50,
         values = [[sorted([random.uniform(*value_range) for _ in range(strategy_count - 1)] + [0], reverse=True) for _ in
                    range(value_dimension)] for _ in range(num_items)]
 
-    values = np.array(values)
-
     strategy_label = [f"Strategy {i}" for i in range(strategy_count)] if strategy_label is None else strategy_label
     value_label = [f"Value {i}" for i in range(value_dimension)]
     item_label = [f"Item {i}" for i in range(num_items)] if item_label is None else item_label
-    df_values = [pd.DataFrame(value, index=value_label, columns=strategy_label) for value in values]
 
     if len(strategy_label) != strategy_count:
         raise ValueError(
@@ -92,23 +93,18 @@ def make_random_problem(num_items: int = 50,
     if len(item_label) != num_items:
         raise ValueError(f"len(item_label) must be equal to num_items. \n{len(item_label)} != {num_items}")
 
-    total_costs = sum(costs[i][strategy_count - 1] for i in range(num_items))
-
-    costs = [
-        [cost * problem_cost_coef for cost in costs[i]]
-        for i in range(num_items)
-    ]
+    costs = np.array(costs, dtype=np.float64).reshape(num_items, strategy_count) * problem_cost_coef
+    values = np.array(values, dtype=np.float64).reshape(num_items, value_dimension, strategy_count)
 
-    costs = np.array(costs)
-    df_cost = pd.DataFrame(costs, index=item_label, columns=strategy_label)
-
-    return {
-        "cost": df_cost,
-        "value": df_values
-    }
+    return Problem(cost=costs,
+                   value=values,
+                   item_label=item_label,
+                   strategy_label=strategy_label,
+                   value_label=value_label,
+                   )
 
 
-def get_value_cost_constraint(problem: dict,
+def get_value_cost_constraint(problem: Problem | dict,
                               solution: list[int] | list[list[bool]],
                               cost_constraint: float = 100_000_000_000_000_000,
                               value_weights: list[float] = None,
@@ -118,7 +114,7 @@ def get_value_cost_constraint(problem: dict,
     주어진 문제와 솔루션에 대해 비용 제약 조건을 고려한 가치를 계산합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
         solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
         cost_constraint: 비용 제약 값
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
@@ -127,34 +123,102 @@ def get_value_cost_constraint(problem: dict,
     Returns:
         가치 총합. 비용 제약 초과 시 0 또는 페널티 값
     """
-    costs = problem["cost"]
-    values = problem["value"]
-
-    value_weights = [1.0 for _ in range(len(values[0].values.tolist()))] if value_weights is None else value_weights
-    value_weights = (np.array(value_weights) / sum(value_weights)).tolist()
+    result = evaluate_solutions(problem,
+                                _as_index_array(solution),
+                                value_weights=value_weights,
+                                cost_constraint=cost_constraint,
+                                penalty=penalty)
+
+    return float(result["fitness"][0])
+
+
+def evaluate_solutions(problem: Problem | dict,
+                       solutions: np.ndarray,
+                       value_weights: list[float] = None,
+                       cost_constraint: float = None,
+                       reliability_constraint: list[float] = None,
+                       penalty: bool = True,
+                       chunk_size: int = None,
+                       ) -> dict:
+    """
+    여러 솔루션의 비용과 가치를 한 번에 계산합니다.
+    솔루션 배열을 fancy indexing으로 비용/가치 배열에서 직접 추출하므로 Python 반복문 없이 평가합니다.
 
-    total_cost = 0
-    total_value = 0
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        solutions: 전략 인덱스 정수 배열 (n_solutions, n_items). -1은 '현상유지'(아무 전략도 선택하지 않음)를 의미합니다.
+            1차원 배열 (n_items,)이 주어진 경우 솔루션 하나로 취급합니다.
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배. 합이 1이 되도록 표준화됩니다.
+        cost_constraint: 비용 제약 값. None인 경우 fitness는 가중 가치와 같습니다.
+        reliability_constraint: 각 가치 차원별 최소 요구 신뢰도. 주어진 경우 부족분(shortfall)을 함께 계산합니다.
+        penalty: 비용 제약을 초과한 솔루션의 fitness를 (cost_constraint - cost)로 할지 여부. False인 경우 0입니다.
+        chunk_size: 한 번에 평가할 솔루션 수. None인 경우 중간 배열이 약 1,600만 원소를 넘지 않도록 자동으로 정합니다.
 
-    if type(solution[0]) is list:
-        solution = [solution[i].index(True) for i in range(len(solution))]
+    Returns:
+        dict {
+            "cost": 각 솔루션의 총 비용 (n_solutions,)
+            "value": 각 솔루션의 가치 차원별 총합 (n_solutions, value_dim)
+            "weighted_value": 표준화된 가중치가 적용된 가치 총합 (n_solutions,)
+            "fitness": 비용 제약 초과 시 페널티가 적용된 가중 가치 (n_solutions,)
+            "shortfall": 가치 차원별 신뢰도 부족분 (n_solutions, value_dim), reliability_constraint가 주어진 경우에만 포함
+        }
 
-    for i in range(len(solution)):
-        total_cost += costs.iloc[i].to_numpy()[solution[i]]
-        value = values[i].to_numpy()
-        for j, value_weight in enumerate(value_weights):
-            total_value += value[j][solution[i]] * value_weight
+    Raises:
+        ValueError: 솔루션의 아이템 수 또는 신뢰도 제약 길이가 올바르지 않을 경우
+    """
+    problem = as_problem(problem)
+    solutions = np.asarray(solutions)
+    if solutions.ndim == 1:
+        solutions = solutions[np.newaxis, :]
+
+    num_solution, num_item = solutions.shape
+    if num_item != problem.num_item:
+        raise ValueError(f"solutions.shape[1] must be equal to num_item. \n{num_item} != {problem.num_item}")
+
+    value_weights = np.asarray(_normalize_value_weights(problem.value, value_weights))
+    if chunk_size is None:
+        chunk_size = max(1, 16_000_000 // max(1, num_item * problem.value_dim))
+
+    total_cost = np.empty(num_solution, dtype=np.float64)
+    total_value = np.empty((num_solution, problem.value_dim), dtype=np.float64)
+    items = np.arange(num_item)
+
+    for start in range(0, num_solution, chunk_size):
+        chunk = solutions[start:start + chunk_size]
+        chosen = chunk >= 0
+        strategy = np.where(chosen, chunk, 0)
+
+        # (chunk, n_items), (chunk, n_items, value_dim)
+        cost = problem.cost[items, strategy]
+        value = problem.value[items, :, strategy]
+
+        total_cost[start:start + chunk_size] = np.where(chosen, cost, 0.0).sum(axis=1)
+        total_value[start:start + chunk_size] = np.matmul(chosen[:, np.newaxis, :].astype(np.float64), value)[:, 0]
+
+    weighted_value = total_value @ value_weights
+
+    fitness = weighted_value
+    if cost_constraint is not None:
+        over_budget = total_cost > cost_constraint
+        fitness = np.where(over_budget, cost_constraint - total_cost if penalty else 0.0, weighted_value)
+
+    result = {
+        "cost": total_cost,
+        "value": total_value,
+        "weighted_value": weighted_value,
+        "fitness": fitness,
+    }
 
-    if total_cost > cost_constraint:
-        if penalty:
-            return cost_constraint - total_cost
-        else:
-            return 0
+    if reliability_constraint is not None:
+        if len(reliability_constraint) != problem.value_dim:
+            raise ValueError(f"len(reliability_constraint) must be equal to value_dim. "
+                             f"\n{len(reliability_constraint)} != {problem.value_dim}")
+        result["shortfall"] = np.maximum(np.asarray(reliability_constraint, dtype=np.float64) - total_value, 0.0)
 
-    return total_value
+    return result
 
 
-def get_total_value(values: pd.DataFrame,
+def get_total_value(values: np.ndarray | list[pd.DataFrame],
                     solution: list[int] | list[list[bool]],
                     value_weights: list[float] = None,
                     ) -> list[float]:
@@ -162,61 +226,48 @@ def get_total_value(values: pd.DataFrame,
     주어진 문제와 솔루션에 대해 종합적인 가치를 계산합니다.
 
     Args:
-        values: 가치를 담은 데이터프레임 목록
+        values: 가치 배열 (n_items, value_dim, n_strategies) 또는 가치를 담은 데이터프레임 목록
         solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
 
     Returns:
         가중치가 적용된 가치 총합
     """
-    if value_weights is None:
-        value_weights = [1.0 for _ in range(len(values[0].values.tolist()))]
-
     return get_value(values, solution)
 
 
-def get_value(values: pd.DataFrame, solution: list[int] | list[list[bool]]) -> list[float]:
+def get_value(values: np.ndarray | list[pd.DataFrame], solution: list[int] | list[list[bool]]) -> list[float]:
     """
     주어진 문제와 솔루션에 대해 각 가치를 계산합니다.
 
     Args:
-        values: 가치를 담은 데이터프레임 목록
+        values: 가치 배열 (n_items, value_dim, n_strategies) 또는 가치를 담은 데이터프레임 목록
         solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
 
     Returns:
         각 가치 차원별 가치 총합 리스트
 
     Raises:
-        ValueError: 가치 차원이 일치하지 않거나 솔루션 길이가 올바르지 않을 경우
+        ValueError: 솔루션 길이가 올바르지 않을 경우
     """
-    value_dim = values[0].shape[0]
-    if value_dim != values[0].shape[0]:
-        raise ValueError(f"values[0].shape[0] must be equal to value_dim. \n{value_dim} != {values[0].shape[0]}")
-
-    if len(solution) != len(values):
-        raise ValueError(f"len(solution) must be equal to num_item of values. \n{len(solution)} != {len(values)}")
+    values = _as_value_array(values)
 
-    if type(solution[0]) is list:
-        solution = [solution[i].index(True) for i in range(len(solution))]
+    if len(solution) != values.shape[0]:
+        raise ValueError(f"len(solution) must be equal to num_item of values. \n{len(solution)} != {values.shape[0]}")
 
-    total_value = [0 for _ in range(value_dim)]
-    for i in range(len(solution)):
-        value = values[i].to_numpy()
-        for j in range(value_dim):
-            if solution[i] == -1:
-                total_value[j] += 0
-            else:
-                total_value[j] += value[j][solution[i]]
+    solution = _as_index_array(solution)
+    chosen = solution != -1
+    items = np.flatnonzero(chosen)
 
-    return total_value
+    return values[items, :, solution[chosen]].sum(axis=0).tolist()
 
 
-def get_cost(costs: pd.DataFrame, solution: list[int] | list[list[bool]]):
+def get_cost(costs: np.ndarray | pd.DataFrame, solution: list[int] | list[list[bool]]):
     """
     주어진 문제와 솔루션에 대해 총 비용을 계산합니다.
 
     Args:
-        costs: 비용을 담은 데이터프레임
+        costs: 비용 배열 (n_items, n_strategies) 또는 비용을 담은 데이터프레임
         solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
 
     Returns:
@@ -225,90 +276,91 @@ def get_cost(costs: pd.DataFrame, solution: list[int] | list[list[bool]]):
     Raises:
         ValueError: 솔루션 길이가 올바르지 않을 경우
     """
+    costs = np.asarray(costs, dtype=np.float64)
+
     if len(solution) != costs.shape[0]:
         raise ValueError(f"len(solution) must be equal to num_item of costs. \n{len(solution)} != {costs.shape[0]}")
 
-    if type(solution[0]) is list:
-        solution = [solution[i].index(True) for i in range(len(solution))]
+    solution = _as_index_array(solution)
+    chosen = solution != -1
+    items = np.flatnonzero(chosen)
 
-    return sum(costs.iloc[i, solution[i]] if solution[i] != -1 else 0 for i in range(len(solution)))
+    return float(costs[items, solution[chosen]].sum())
 
-def get_value_cost_ratio(problem: dict, solution: list[int] | list[list[bool]]) -> list[float]:
+
+def get_value_cost_ratio(problem: Problem | dict, solution: list[int] | list[list[bool]]) -> list[float]:
     """
     주어진 문제와 솔루션에 대해 가치 대비 비용 비율을 계산합니다.
-    :param problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+    :param problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
     :param solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
     :return: 각 가치에 대한 비용 대비 가치 비율 리스트
     """
-    costs = problem["cost"]
-    values = problem["value"]
+    problem = as_problem(problem)
+    solution = _as_index_array(solution)
+    items = np.arange(problem.num_item)
 
-    if type(solution[0]) is list:
-        solution = [solution[i].index(True) for i in range(len(solution))]
+    cost = problem.cost[items, solution]
+    value = problem.value[items, :, solution].sum(axis=1)
 
-    value_cost_ratio = []
-    for i in range(len(solution)):
-        cost = costs.iloc[i, solution[i]]
-        value = values[i].to_numpy()
-        if cost == 0:
-            value_cost_ratio.append(float('inf'))  # 비용이 0인 경우 무한대 비율
-        else:
-            value_cost_ratio.append(sum(value[j][solution[i]] for j in range(len(value))) / cost)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 비용이 0인 경우 무한대 비율
+        ratio = np.where(cost == 0, np.inf, value / cost)
 
-    return value_cost_ratio
+    return ratio.tolist()
 
 
-def display_solution(problem: dict, solution: list[int] | list[list[bool]], weights: list[float] = None):
+def display_solution(problem: Problem | dict, solution: list[int] | list[list[bool]], weights: list[float] = None):
     """
     주어진 문제와 솔루션을 출력합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
         solution: 각 아이템에 대해 선택된 전략 인덱스 또는 불리언 리스트
         weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
 
     Raises:
         ValueError: 가중치 길이가 가치 차원과 일치하지 않을 경우
     """
-    if type(solution[0]) is list:
-        solution = [solution[i].index(True) for i in range(len(solution))]
+    problem = as_problem(problem)
+    solution = _as_index_array(solution).tolist()
 
     if weights is None:
-        weights = [1.0 for _ in range(len(problem["value"][0].values.tolist()))]
+        weights = [1.0 for _ in range(problem.value_dim)]
 
-    value_dim = problem["value"][0].shape[0]
+    value_dim = problem.value_dim
     if value_dim != len(weights):
         raise ValueError(f"len(weights) must be equal to value_dim. \n{len(weights)} != {value_dim}")
 
     print("Solution:")
     for i in range(len(solution)):
-        print(f"{problem['cost'].index[i]} -> {problem['cost'].columns[solution[i]]}")
-        print(f"Cost: {problem['cost'].iloc[i][solution[i]]}")
+        print(f"{problem.item_label[i]} -> {problem.strategy_label[solution[i]]}")
+        print(f"Cost: {problem.cost[i, solution[i]]}")
         print(f"Value: ")
-        for value in problem["value"][i].iloc[:, solution[i]]:
+        for value in problem.value[i, :, solution[i]]:
             print(f"\t{value}")
         print()
 
-    total_cost = get_cost(problem["cost"], solution)
-    total_value = get_total_value(problem["value"], solution, value_weights=weights)
+    total_cost = get_cost(problem.cost, solution)
+    total_value = get_total_value(problem.value, solution, value_weights=weights)
 
     print(f"Total Cost: {total_cost}")
     print(f"Total Value: {total_value}")
 
 
-def display_problem(problem: dict):
+def display_problem(problem: Problem | dict):
     """
     주어진 문제를 출력합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
     """
+    problem = as_problem(problem)
     print(f"Problem:")
-    print(problem["cost"])
+    print(problem.cost_frame())
 
-    for i in range(len(problem["value"])):
-        print(problem["cost"].index[i])
-        print(problem["value"][i])
+    for label, value in zip(problem.item_label, problem.value_frames()):
+        print(label)
+        print(value)
         print()
 
 
@@ -317,7 +369,7 @@ def _normalize_value_weights(values, value_weights=None):
     가치 가중치를 표준화합니다.
 
     Args:
-        values: 가치를 담은 데이터프레임 목록
+        values: 가치 배열 (n_items, value_dim, n_strategies) 또는 가치를 담은 데이터프레임 목록
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
 
     Returns:
@@ -326,3 +378,222 @@ def _normalize_value_weights(values, value_weights=None):
     value_dim = values[0].shape[0]
     value_weights = [1.0 for _ in range(value_dim)] if value_weights is None else value_weights
     return (np.array(value_weights) / sum(value_weights)).tolist()
+
+
+def _as_value_array(values) -> np.ndarray:
+    """
+    가치 배열 또는 가치 데이터프레임 목록을 (n_items, value_dim, n_strategies) 배열로 변환합니다.
+    """
+    if isinstance(values, np.ndarray):
+        return values
+    return np.array([np.asarray(value, dtype=np.float64) for value in values], dtype=np.float64)
+
+
+def _as_index_array(solution) -> np.ndarray:
+    """
+    전략 인덱스 리스트 또는 불리언(one-hot) 리스트를 전략 인덱스 배열로 변환합니다. 선택하지 않은 경우 -1입니다.
+    """
+    if len(solution) > 0 and type(solution[0]) is list:
+        solution = [solution[i].index(True) if True in solution[i] else -1 for i in range(len(solution))]
+    return np.asarray(solution, dtype=np.int64)
+
+
+def _choice_arrays(costs, values, allow_zero_strategy):
+    """
+    아이템별 선택지의 비용, 가치 배열을 만듭니다. allow_zero_strategy인 경우 마지막 선택지는 "선택하지 않음"(비용, 가치 0)입니다.
+
+    Returns:
+        (choice_cost, choice_value): (num_item, num_choice), (num_item, num_choice, value_dim) 배열
+    """
+    choice_cost = costs
+    choice_value = values.transpose(0, 2, 1)
+    if allow_zero_strategy:
+        num_item, value_dim = values.shape[:2]
+        choice_cost = np.concatenate([choice_cost, np.zeros((num_item, 1))], axis=1)
+        choice_value = np.concatenate([choice_value, np.zeros((num_item, 1, value_dim))], axis=1)
+    return np.ascontiguousarray(choice_cost), np.ascontiguousarray(choice_value)
+
+
+def _upgrade(selected, choice_cost, choice_profit, cost_constraint):
+    """
+    예산 안에서 아이템별로 비용 대비 이익 증가율이 가장 큰 변경을 증가율 순서대로 적용합니다.
+
+    Returns:
+        (selected, ratio): 변경된 선택지 인덱스 (num_item,)와 예산에 들어가지 못한 첫 변경의 증가율(비용 1당 이익).
+        모든 변경이 예산에 들어가는 경우 ratio는 0입니다.
+    """
+    rows = np.arange(len(selected))
+    extra_cost = choice_cost - choice_cost[rows, selected][:, None]
+    extra_profit = choice_profit - choice_profit[rows, selected][:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where((extra_cost > 0) & (extra_profit > 0), extra_profit / extra_cost, -np.inf)
+    upgrade = ratio.argmax(axis=1)
+    upgrade_ratio = ratio[rows, upgrade]
+
+    order = np.argsort(-upgrade_ratio, kind="stable")
+    order = order[np.isfinite(upgrade_ratio[order])]
+    spent = choice_cost[rows, selected].sum() + np.cumsum(extra_cost[order, upgrade[order]])
+    fit = spent <= cost_constraint
+    marginal_ratio = float(upgrade_ratio[order[~fit][0]]) if not fit.all() else 0.0
+
+    selected = selected.copy()
+    selected[order[fit]] = upgrade[order[fit]]
+    return selected, marginal_ratio
+
+
+def _repair_cost_constraint(selected, choice_cost, choice_profit, cost_constraint):
+    """
+    예산을 넘는 해를 고칩니다. 이익 감소 대비 비용 절감이 가장 큰 변경부터 예산 안에 들 때까지 적용한 뒤,
+    남은 예산으로 _upgrade를 적용합니다.
+
+    Returns:
+        np.ndarray: 예산을 만족하는 선택지 인덱스 (num_item,)
+    """
+    rows = np.arange(len(selected))
+    selected = selected.copy()
+    excess = choice_cost[rows, selected].sum() - cost_constraint
+    while excess > 0:
+        saving = choice_cost[rows, selected][:, None] - choice_cost
+        loss = choice_profit[rows, selected][:, None] - choice_profit
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(saving > 0, np.maximum(loss, 0.0) / saving, np.inf)
+        downgrade = ratio.argmin(axis=1)
+        downgrade_ratio = ratio[rows, downgrade]
+
+        order = np.argsort(downgrade_ratio, kind="stable")
+        order = order[np.isfinite(downgrade_ratio[order])]
+        if len(order) == 0:
+            break
+        saved = np.cumsum(saving[order, downgrade[order]])
+        order = order[:np.searchsorted(saved, excess) + 1]
+        selected[order] = downgrade[order]
+        excess = choice_cost[rows, selected].sum() - cost_constraint
+
+    return _upgrade(selected, choice_cost, choice_profit, cost_constraint)[0]
+
+
+def _greedy_cost_constraint(choice_cost, choice_profit, cost_constraint):
+    """
+    비용 제약 문제의 초기 해를 탐욕적으로 구합니다.
+    각 아이템은 가장 싼 선택지에서 시작하고, 예산 안에서 _upgrade를 적용합니다.
+
+    Returns:
+        (selected, ratio): 아이템별 선택지 인덱스 (num_item,)와 예산에 들어가지 못한 첫 변경의 증가율
+
+    Raises:
+        ValueError: 가장 싼 선택지만으로도 예산을 넘는 경우
+    """
+    # 가장 싼 선택지 중 이익이 가장 큰 것을 기본 선택으로 사용
+    min_cost = choice_cost.min(axis=1, keepdims=True)
+    base = np.where(choice_cost == min_cost, choice_profit, -np.inf).argmax(axis=1)
+    if min_cost.sum() > cost_constraint:
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+
+    return _upgrade(base, choice_cost, choice_profit, cost_constraint)
+
+
+def _cover_shortfall(selected, choice_cost, choice_value, reliability_constraint):
+    """
+    신뢰도 부족분이 없어질 때까지, 부족분 1을 줄이는 비용이 가장 싼 아이템별 변경을 그 순서대로 적용합니다.
+    부족분은 모든 차원의 부족분의 합이며, 변경으로 다른 차원에 새로 생기는 부족분도 함께 계산합니다.
+    가치는 요구 신뢰도 대비 비율로 정규화된 값이어야 합니다.
+
+    Returns:
+        np.ndarray: 변경된 선택지 인덱스 (num_item,). 더 이상 부족분을 줄일 수 없는 경우 부족분이 남아 있을 수 있습니다.
+    """
+    rows = np.arange(len(selected))
+    selected = selected.copy()
+    value = choice_value[rows, selected].sum(axis=0)
+    shortfall = np.maximum(reliability_constraint - value, 0.0).sum()
+    while shortfall > 0:
+        gain = choice_value - choice_value[rows, selected][:, None, :]
+        covered = shortfall - np.maximum(reliability_constraint - (value + gain), 0.0).sum(axis=2)
+        extra_cost = choice_cost - choice_cost[rows, selected][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(covered > 0, extra_cost / covered, np.inf)
+        upgrade = ratio.argmin(axis=1)
+        upgrade_ratio = ratio[rows, upgrade]
+
+        order = np.argsort(upgrade_ratio, kind="stable")
+        order = order[upgrade_ratio[order] < np.inf]
+        if len(order) == 0:
+            break
+        # 누적 가치 증가가 모든 차원의 부족분을 채우는 지점까지 한 번에 적용
+        done = (value + np.cumsum(gain[order, upgrade[order]], axis=0) >= reliability_constraint).all(axis=1)
+        if done.any():
+            order = order[:int(np.argmax(done)) + 1]
+        changed = selected.copy()
+        changed[order] = upgrade[order]
+        changed_value = choice_value[rows, changed].sum(axis=0)
+        changed_shortfall = np.maximum(reliability_constraint - changed_value, 0.0).sum()
+        if changed_shortfall >= shortfall:
+            # 변경끼리 다른 차원의 가치를 깎아 부족분이 줄지 않으면 가장 싼 변경 하나만 적용(부족분이 항상 줄어 반복이 끝남)
+            changed = selected.copy()
+            changed[order[0]] = upgrade[order[0]]
+            changed_value = choice_value[rows, changed].sum(axis=0)
+            changed_shortfall = np.maximum(reliability_constraint - changed_value, 0.0).sum()
+        selected, value, shortfall = changed, changed_value, changed_shortfall
+    return selected
+
+
+def _trim_surplus(selected, choice_cost, choice_value, reliability_constraint):
+    """
+    신뢰도 제약을 만족하는 해에서, 가치 감소 대비 비용 절감이 가장 큰 아이템별 변경을 제약을 만족하는 동안 그 순서대로 적용합니다.
+    가치는 요구 신뢰도 대비 비율로 정규화된 값이어야 합니다.
+
+    Returns:
+        np.ndarray: 변경된 선택지 인덱스 (num_item,)
+    """
+    rows = np.arange(len(selected))
+    surplus = choice_value[rows, selected].sum(axis=0) - reliability_constraint
+    if (surplus < 0).any():
+        return selected
+
+    loss = choice_value[rows, selected][:, None, :] - choice_value
+    saving = choice_cost[rows, selected][:, None] - choice_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(saving > 0, saving / np.maximum(loss, 0.0).sum(axis=2), -np.inf)
+    downgrade = ratio.argmax(axis=1)
+    downgrade_ratio = ratio[rows, downgrade]
+
+    order = np.argsort(-downgrade_ratio, kind="stable")
+    order = order[downgrade_ratio[order] > -np.inf]
+    # 누적 가치 감소가 어느 차원에서든 여유분을 넘기 전까지만 적용
+    exceeded = (np.cumsum(loss[order, downgrade[order]], axis=0) > surplus).any(axis=1)
+    if exceeded.any():
+        order = order[:int(np.argmax(exceeded))]
+
+    selected = selected.copy()
+    selected[order] = downgrade[order]
+    return selected
+
+
+def _repair_reliability_constraint(selected, choice_cost, choice_value, reliability_constraint):
+    """
+    신뢰도 제약 문제의 해를 _cover_shortfall로 제약 안으로 고친 뒤 _trim_surplus로 불필요한 비용을 줄입니다.
+    """
+    selected = _cover_shortfall(selected, choice_cost, choice_value, reliability_constraint)
+    return _trim_surplus(selected, choice_cost, choice_value, reliability_constraint)
+
+
+def _to_selected(x, num_strategy):
+    """
+    선택지 인덱스를 전략 인덱스 리스트로 변환합니다. "선택하지 않음" 선택지는 -1입니다.
+    """
+    return np.where(x >= num_strategy, -1, x).tolist()
+
+
+def _to_choice(solution, num_item, num_choice, num_strategy):
+    """
+    전략 인덱스 리스트 또는 불리언 리스트를 선택지 인덱스로 변환합니다. 선택하지 않음(-1)은 마지막 선택지입니다.
+
+    Raises:
+        ValueError: 해의 길이가 아이템 수와 다르거나, 허용되지 않는 전략 인덱스가 있는 경우
+    """
+    solution = _as_index_array(solution)
+    choice = np.where(solution < 0, num_strategy, solution)
+    if choice.shape != (num_item,) or (choice >= num_choice).any():
+        raise ValueError("초기 해가 문제의 아이템 수 또는 전략 수와 맞지 않습니다. "
+                         "현상유지 전략이 없는 경우 allow_zero_strategy를 True로 설정해야 합니다.")
+    return choice
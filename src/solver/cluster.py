@@ -0,0 +1,196 @@
+import time
+
+import numpy as np
+
+from src.problem.problem import Problem, as_problem, _check_finite
+from src.problem.strategy import (get_cost, get_total_value, _normalize_value_weights, _choice_arrays,
+                                  _repair_cost_constraint, _to_choice, _to_selected)
+from src.solver.lagrangian import polish
+from src.solver.lp_greedy import lp_greedy_solution
+
+"""
+이 모듈은 비용과 가치가 거의 같은 아이템들을 군집(cluster)으로 묶어 작은 문제로 근사하여 푸는 방법을 제공합니다.
+
+1. 아이템별 비용과 가치 벡터를 열마다 표준편차로 나눈 뒤 k-means(k-means++ 초기화)로 num_clusters개의 군집으로 나눕니다.
+2. 각 아이템의 비용과 가치를 군집 안의 평균으로 바꾼 문제를 만듭니다.
+   같은 군집의 아이템은 완전히 같아지므로 SCIP, CP-SAT은 군집마다 정수 변수 하나로 풉니다. (presolve.aggregate_items)
+3. 군집 문제의 해를 원래 아이템에 그대로 적용합니다.
+4. 원래 비용과 가치로 국소 수정을 합니다. 예산을 넘으면 src.problem.strategy의 _repair_cost_constraint로 가치 손실 대비 비용 절감이 큰 변경부터 되돌리고(repair),
+   예산이 남으면 남은 예산 안에서 효율이 높은 변경을 적용합니다(polish).
+5. 원래 문제의 LP 완화 상한과 해의 가치의 차이를 최적값 대비 손실의 상한으로 보고합니다.
+
+num_clusters가 작을수록 빠르지만 손실이 커질 수 있으므로, 보고된 손실 상한을 보고 num_clusters를 정합니다.
+신뢰도 제약 문제는 지원하지 않습니다.
+군집 문제는 아이템 수가 원래 문제와 같으므로 aggregate를 켠 SCIP, CP-SAT에서만 작아집니다. 다른 solver로는 원래 문제를 푸는 것과 같습니다.
+"""
+
+# k-means의 최대 반복 횟수
+CLUSTER_MAX_ITERATIONS = 20
+# k-means에서 거리를 한 번에 계산하는 아이템 수. 메모리 사용량은 이 값 × 군집 수에 비례합니다.
+CLUSTER_CHUNK_SIZE = 4096
+# k-means++ 초기화의 난수 시드. 같은 입력에 대해 항상 같은 군집을 만듭니다.
+CLUSTER_RANDOM_SEED = 0
+
+
+def _nearest(features, centers):
+    """
+    아이템별로 가장 가까운 중심의 인덱스와 제곱 거리를 구합니다. 아이템을 CLUSTER_CHUNK_SIZE개씩 나누어 계산합니다.
+
+    Returns:
+        (labels, distances): (num_item,) 배열 두 개
+    """
+    labels = np.empty(len(features), dtype=np.int64)
+    distances = np.empty(len(features))
+    center_norm = (centers ** 2).sum(axis=1)
+    for start in range(0, len(features), CLUSTER_CHUNK_SIZE):
+        chunk = features[start:start + CLUSTER_CHUNK_SIZE]
+        squared = center_norm[np.newaxis, :] - 2 * chunk @ centers.T
+        labels[start:start + len(chunk)] = squared.argmin(axis=1)
+        distances[start:start + len(chunk)] = squared.min(axis=1) + (chunk ** 2).sum(axis=1)
+    return labels, np.maximum(distances, 0.0)
+
+
+def _kmeans(features, num_clusters, max_iterations=CLUSTER_MAX_ITERATIONS, seed=CLUSTER_RANDOM_SEED):
+    """
+    k-means로 아이템을 군집으로 나눕니다. 비어 있는 군집은 번호를 당겨 제거합니다.
+
+    Args:
+        features: 아이템별 특징 벡터 (num_item, num_feature)
+        num_clusters: 군집 수
+        max_iterations: 최대 반복 횟수
+        seed: k-means++ 초기화의 난수 시드
+
+    Returns:
+        np.ndarray: 아이템별 군집 인덱스 (num_item,)
+    """
+    rng = np.random.default_rng(seed)
+    num_item = len(features)
+
+    # k-means++: 가까운 중심과의 제곱 거리에 비례하는 확률로 다음 중심을 고름
+    centers = np.empty((num_clusters, features.shape[1]))
+    centers[0] = features[rng.integers(num_item)]
+    distances = ((features - centers[0]) ** 2).sum(axis=1)
+    for k in range(1, num_clusters):
+        total = distances.sum()
+        index = rng.choice(num_item, p=distances / total) if total > 0 else rng.integers(num_item)
+        centers[k] = features[index]
+        np.minimum(distances, ((features - centers[k]) ** 2).sum(axis=1), out=distances)
+
+    labels = None
+    for _ in range(max_iterations):
+        new_labels, _ = _nearest(features, centers)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        # 비어 있는 군집의 중심은 그대로 둠
+        sizes = np.bincount(labels, minlength=num_clusters)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, features)
+        filled = sizes > 0
+        centers[filled] = sums[filled] / sizes[filled, np.newaxis]
+
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels.reshape(-1)
+
+
+def cluster_problem(problem, num_clusters, stats=None):
+    """
+    비용과 가치가 비슷한 아이템들을 군집으로 묶고, 각 아이템의 비용과 가치를 군집 안의 평균으로 바꾼 문제를 만듭니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        num_clusters: 군집 수
+        stats: 주어진 경우 실제 군집 수("num_clusters")를 기록할 딕셔너리
+
+    Returns:
+        (clustered, labels): 군집의 평균 비용과 가치로 바꾼 문제와 아이템별 군집 인덱스 (n_items,)
+    """
+    problem = as_problem(problem)
+    num_item = problem.num_item
+    features = np.concatenate([problem.cost, problem.value.reshape(num_item, -1)], axis=1)
+    scale = features.std(axis=0)
+    features = features / np.where(scale > 0, scale, 1.0)
+
+    labels = _kmeans(features, min(int(num_clusters), num_item))
+    num_clusters = int(labels.max()) + 1
+    sizes = np.bincount(labels, minlength=num_clusters)
+
+    cost = np.zeros((num_clusters, problem.num_strategy))
+    np.add.at(cost, labels, problem.cost)
+    cost /= sizes[:, np.newaxis]
+    value = np.zeros((num_clusters,) + problem.value.shape[1:])
+    np.add.at(value, labels, problem.value)
+    value /= sizes[:, np.newaxis, np.newaxis]
+
+    print(f"군집화: 전체 {num_item}개 아이템을 {num_clusters}개의 군집으로 묶었습니다.")
+    if stats is not None:
+        stats.update(num_clusters=num_clusters)
+
+    clustered = Problem(cost[labels], value[labels], item_label=problem.item_label,
+                        strategy_label=problem.strategy_label, value_label=problem.value_label)
+    return clustered, labels
+
+
+def solve_clustered(problem, cost_constraint, solver, value_weights=None, allow_zero_strategy=False, num_clusters=100,
+                    stats=None, **options):
+    """
+    아이템을 군집으로 묶은 문제를 주어진 solver로 풀고, 원래 문제에서 국소 수정한 해와 손실 상한을 반환합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        solver: solver 모듈. aggregate를 지원하는 src.solver.scip 또는 src.solver.cpsat
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        num_clusters: 군집 수
+        stats: 주어진 경우 실제 군집 수("num_clusters"), 원래 문제의 LP 상한("upper_bound"), 해의 가중 가치("lower_bound"),
+            최적값 대비 손실의 상한("loss_bound")과 그 비율("gap"), 군집화 시간("cluster_time"), 전체 풀이 시간("solve_time")을 기록할 딕셔너리
+        **options: solver의 solve_cost_constraint에 전달할 추가 인자
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+        solver를 사용할 수 없는 경우 None
+
+    Raises:
+        ValueError: 실행 가능한 해가 없을 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    clustered, _ = cluster_problem(problem, num_clusters, stats)
+    cluster_time = time.time() - time_start
+
+    result = solver.solve_cost_constraint(clustered, cost_constraint, value_weights, allow_zero_strategy, **options)
+    if result is None:
+        return None
+
+    # 원래 비용과 가치로 예산을 넘으면 고치고, 남으면 채움
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    choice_profit = choice_value @ np.asarray(value_weights)
+    _, upper_bound = lp_greedy_solution(choice_cost, choice_profit, cost_constraint)
+
+    best = _to_choice(result[0], problem.num_item, choice_cost.shape[1], problem.num_strategy)
+    if choice_cost[np.arange(len(best)), best].sum() > cost_constraint:
+        best = _repair_cost_constraint(best, choice_cost, choice_profit, cost_constraint)
+    best = polish(best, choice_cost, choice_profit, cost_constraint)
+
+    elapsed_time = time.time() - time_start
+
+    lower_bound = float(choice_profit[np.arange(len(best)), best].sum())
+    loss_bound = max(upper_bound - lower_bound, 0.0)
+    gap = loss_bound / abs(upper_bound) if upper_bound != 0 else 0.0
+    print(f"군집화 해의 최적값 대비 손실 상한: {loss_bound} (LP 상한 대비 {gap:.4%})")
+
+    if stats is not None:
+        stats.update(upper_bound=upper_bound, lower_bound=lower_bound, loss_bound=loss_bound, gap=gap,
+                     cluster_time=cluster_time, solve_time=elapsed_time)
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
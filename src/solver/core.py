@@ -0,0 +1,139 @@
+import time
+
+import numpy as np
+
+import src.solver.cpsat as cpsat
+import src.solver.scip as scip
+from src.problem.problem import Problem, as_problem, _check_finite
+from src.problem.strategy import get_cost, get_total_value, _normalize_value_weights, _choice_arrays, _to_selected
+from src.solver.lagrangian import search_multiplier
+from src.solver.lp_greedy import lp_greedy_solution
+
+"""
+이 모듈은 코어(core) 기법으로 아이템 수가 많은 비용 제약 문제의 최적해를 구합니다. (Pisinger의 core 알고리즘)
+
+대부분의 아이템은 LP 완화 문제의 해와 같은 선택을 하고, 효율이 LP 해의 경계(break) 근처인 소수의 아이템만 최적해에서 달라집니다.
+
+1. LP 완화 탐욕 알고리즘(lp_greedy)의 정수 해를 각 아이템의 고정 선택으로, 라그랑주 승수 λ(경계 효율)를 구합니다.
+2. 아이템 i가 고정 선택이 아닌 선택지 j를 고르는 모든 해의 가치는 다음 상한을 넘지 않습니다. (축소 비용, reduced cost)
+
+    L(λ) - (max_k r_ik - r_ij),    r_ij = 가치_ij - λ * 비용_ij
+
+3. 상한이 가장 큰(고정 선택에서 벗어나도 손해가 가장 적은) core_size개의 아이템을 코어로 정합니다.
+4. 코어 밖의 아이템은 고정하고, 코어 아이템만으로 만든 작은 문제를 남은 예산으로 정확한 solver(SCIP 또는 CP-SAT)에서 풉니다.
+5. 코어 밖의 아이템 중 상한이 지금까지의 최적값보다 큰 아이템이 있으면 코어에 추가하고 4를 반복합니다. (expanding core)
+   그런 아이템이 없으면 코어 밖의 아이템이 고정 선택에서 벗어나는 해는 더 좋을 수 없으므로, 코어 문제의 최적해가 전체 문제의 최적해입니다.
+
+최적성은 코어 문제를 푸는 solver의 최적성 기준(SCIP은 상대 gap SCIP_RELATIVE_GAP)을 따릅니다.
+신뢰도 제약 문제는 지원하지 않습니다.
+"""
+
+# 코어 문제를 푸는 정확한 solver
+CORE_SOLVERS = {
+    'SCIP': scip,
+    'CP-SAT': cpsat,
+}
+# 처음 코어에 넣는 아이템 수
+CORE_INITIAL_SIZE = 32
+# 상한과 최적값을 비교할 때의 상대 허용치. 부동소수점 오차로 코어에 넣어야 할 아이템을 빠뜨리지 않도록 보수적으로 비교합니다.
+CORE_TOLERANCE = 1e-9
+
+
+def _deviation_bounds(choice_cost, choice_profit, fixed, multiplier, cost_constraint):
+    """
+    아이템별로 고정 선택이 아닌 선택지를 고르는 해의 가치 상한을 구합니다.
+
+    Returns:
+        np.ndarray: 아이템별 상한 (num_item,). 다른 선택지가 없으면 -inf
+    """
+    rows = np.arange(len(fixed))
+    reduced = choice_profit - multiplier * choice_cost
+    best = reduced.max(axis=1)
+    dual = multiplier * cost_constraint + float(best.sum())
+
+    reduced[rows, fixed] = -np.inf
+    return dual - (best - reduced.max(axis=1))
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False, core_solver="SCIP",
+                          core_size=CORE_INITIAL_SIZE, stats=None):
+    """
+    코어 기법을 사용하여 비용 제약 문제의 최적해를 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        core_solver: 코어 문제를 풀 solver의 종류 (SCIP 또는 CP-SAT)
+        core_size: 처음 코어에 넣는 아이템 수
+        stats: 주어진 경우 최종 코어의 아이템 수("core_size"), 코어 문제를 푼 횟수("core_iterations"),
+            풀이 시간("solve_time")을 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+        코어 solver를 사용할 수 없는 경우 None
+
+    Raises:
+        ValueError: core_solver가 지원되지 않거나 실행 가능한 해가 없을 경우
+    """
+    if core_solver not in CORE_SOLVERS:
+        raise ValueError(f"지원하지 않는 코어 solver입니다: {core_solver}. {', '.join(CORE_SOLVERS)} 중 하나를 선택하세요.")
+    solver = CORE_SOLVERS[core_solver]
+
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    choice_profit = choice_value @ np.asarray(value_weights)
+    rows = np.arange(problem.num_item)
+
+    fixed, _ = lp_greedy_solution(choice_cost, choice_profit, cost_constraint)
+    _, _, multiplier, _, _ = search_multiplier(choice_cost, choice_profit, cost_constraint)
+    bounds = _deviation_bounds(choice_cost, choice_profit, fixed, multiplier, cost_constraint)
+
+    selected = fixed
+    best = float(choice_profit[rows, fixed].sum())
+
+    in_core = np.zeros(problem.num_item, dtype=bool)
+    in_core[np.argsort(-bounds, kind="stable")[:core_size]] = True
+    in_core &= np.isfinite(bounds)
+    iterations = 0
+    while True:
+        if in_core.any():
+            iterations += 1
+            core = np.flatnonzero(in_core)
+            sub_problem = Problem(costs[core], values[core], item_label=problem.item_label[core],
+                                  strategy_label=problem.strategy_label, value_label=problem.value_label)
+            budget = cost_constraint - float(choice_cost[~in_core, fixed[~in_core]].sum())
+            result = solver.solve_cost_constraint(sub_problem, budget, value_weights, allow_zero_strategy)
+            if result is None:
+                return None
+
+            # 코어 solver의 "선택하지 않음"(-1)은 마지막 선택지
+            candidate = fixed.copy()
+            candidate[core] = np.where(np.asarray(result[0]) < 0, problem.num_strategy, result[0])
+            value = float(choice_profit[rows, candidate].sum())
+            if value > best:
+                selected, best = candidate, value
+
+        # 코어 밖에서 고정 선택을 바꾸어 더 좋아질 수 있는 아이템
+        missing = ~in_core & (bounds > best - CORE_TOLERANCE * max(abs(best), 1.0))
+        if not missing.any():
+            break
+        in_core |= missing
+
+    elapsed_time = time.time() - time_start
+
+    print(f"코어: 전체 {problem.num_item}개 아이템 중 {int(in_core.sum())}개를 최적화했습니다. (코어 문제 {iterations}회)")
+    if stats is not None:
+        stats.update(core_size=int(in_core.sum()), core_iterations=iterations, solve_time=elapsed_time)
+
+    selected = _to_selected(selected, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
@@ -1,54 +1,295 @@
+import threading
 import time
 
+import numpy as np
+from ortools.sat import cp_model_pb2
 from ortools.sat.python import cp_model
 
+from src.problem.problem import as_problem
 from src.problem.strategy import get_cost, get_total_value, get_value, _normalize_value_weights, make_random_problem, \
     display_problem
+from src.solver.presolve import presolve as presolve_strategies, aggregate_items, expand_counts, count_selection
 from src.utils.utils import process_solution
 
-CP_SAT_COEF = 100_000
+# 실수 계수를 정수로 바꿀 때 허용하는 반올림 오차. 계수별 오차가 (가장 큰 계수의 절댓값 × CP_SAT_PRECISION) 이하가 되도록 배율을 정합니다.
+CP_SAT_PRECISION = 1e-6
+# stop_event를 확인하는 간격(초). 중단 요청 후 탐색이 멈추기까지 최대 이만큼 걸립니다.
+CP_SAT_STOP_INTERVAL = 0.1
 
-def _init_cpsat_solver(num_item, action_dim, allow_zero_strategy=False):
+def _init_cpsat_solver(num_item, action_dim, allow_zero_strategy=False, keep=None, counts=None):
     """
     CP-SAT 솔버를 초기화하고 변수를 설정합니다.
+    변수와 아이템별 제약은 Python 변수 객체를 만들지 않고 모델 proto에 한 번에 추가합니다.
 
     Args:
         num_item: 아이템 수
         action_dim: 각 아이템에 대한 전략(액션) 수
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        keep: 변수를 만들 전략의 bool 배열 (num_item, action_dim). None인 경우 모든 전략
+        counts: 아이템(묶음)별 아이템 수 (num_item,). 주어진 경우 x[i, j]는 묶음 i에서 전략 j를 선택한 아이템 수를 나타내는
+            0 이상 counts[i] 이하의 정수 변수입니다.
 
     Returns:
-        (model, x): CP-SAT 모델 객체와 변수 2차원 배열
+        (model, x): CP-SAT 모델 객체와 변수 인덱스 2차원 배열 (num_item, action_dim)
+        x[i, j]는 아이템 i가 전략 j를 선택하는지를 나타내는 bool 변수의 proto 인덱스이며, 제거된 전략은 -1입니다.
     """
     model = cp_model.CpModel()
+    proto = model.proto
 
     # 변수 선언
-    x = [[model.NewBoolVar(f'x[{i}][{j}]') for j in range(action_dim)] for i in range(num_item)]
-
+    if keep is None:
+        x = np.arange(num_item * action_dim, dtype=np.int64).reshape(num_item, action_dim)
+    else:
+        x = np.full((num_item, action_dim), -1, dtype=np.int64)
+        x[keep] = np.arange(np.count_nonzero(keep))
+    rows = x.tolist() if keep is None else [row[row >= 0].tolist() for row in x]
+
+    if counts is not None:
+        # 묶음마다 전략별로 선택한 아이템 수의 합이 묶음의 아이템 수(allow_zero_strategy인 경우 이하)
+        upper = np.broadcast_to(np.asarray(counts, dtype=np.int64)[:, np.newaxis], x.shape)[x >= 0]
+        proto.variables.extend(cp_model_pb2.IntegerVariableProto(domain=[0, count]) for count in upper.tolist())
+        proto.constraints.extend(
+            cp_model_pb2.ConstraintProto(linear=cp_model_pb2.LinearConstraintProto(
+                vars=row, coeffs=[1] * len(row), domain=[0 if allow_zero_strategy else count, count]))
+            for row, count in zip(rows, np.asarray(counts).tolist()))
+        return model, x
+
+    proto.variables.extend([cp_model_pb2.IntegerVariableProto(domain=[0, 1])] * np.count_nonzero(x >= 0))
     if allow_zero_strategy:
         # 전략 선택하지 않음으로 "현상유지" 전략을 구현
-        for i in range(num_item):
-            model.Add(sum(x[i][j] for j in range(action_dim)) <= 1)
+        proto.constraints.extend(
+            cp_model_pb2.ConstraintProto(at_most_one=cp_model_pb2.BoolArgumentProto(literals=row))
+            for row in rows if row)
     else:
         # 하나의 item은 하나의 전략만 선택할 수 있음
-        for i in range(num_item):
-            model.Add(sum(x[i][j] for j in range(action_dim)) == 1)
+        proto.constraints.extend(
+            cp_model_pb2.ConstraintProto(exactly_one=cp_model_pb2.BoolArgumentProto(literals=row))
+            for row in rows)
 
     return model, x
 
-def _run_cpsat_solver(model):
+def _add_linear_constraint(model, x, coefs, lower_bound=cp_model.INT_MIN, upper_bound=cp_model.INT_MAX):
     """
-    CP-SAT 솔버를 실행하고 결과를 반환합니다.
+    sum(coefs[i, j] * x[i, j])가 [lower_bound, upper_bound] 범위에 있도록 하는 선형 제약을 한 번에 추가합니다.
 
     Args:
         model: CP-SAT 모델 객체
+        x: 변수 인덱스 2차원 배열
+        coefs: 정수 계수 배열, x와 같은 크기
+        lower_bound: 하한
+        upper_bound: 상한
+
+    Returns:
+        int: 추가된 제약의 proto 인덱스
+    """
+    nonzero = (coefs != 0) & (x >= 0)
+    constraint = model.proto.constraints.add()
+    constraint.linear.vars.extend(x[nonzero].tolist())
+    constraint.linear.coeffs.extend(coefs[nonzero].tolist())
+    constraint.linear.domain.extend([int(lower_bound), int(upper_bound)])
+    return len(model.proto.constraints) - 1
+
+def _set_objective(model, x, coefs, maximize=True, factor=1.0):
+    """
+    sum(coefs[i, j] * x[i, j])를 목적 함수로 설정합니다.
+    cp_model.CpModel.maximize와 같이 최대화 문제는 계수의 부호를 바꾸고 scaling_factor를 음수로 저장합니다.
+    scaling_factor에 정수화 배율의 역수를 곱해 두므로 솔버가 보고하는 목적 함수 값과 상한은 원래 단위입니다.
+
+    Args:
+        model: CP-SAT 모델 객체
+        x: 변수 인덱스 2차원 배열
+        coefs: 정수 계수 배열, x와 같은 크기
+        maximize: 최대화 여부. False인 경우 최소화합니다.
+        factor: coefs의 정수화 배율 (_to_cpsat_int의 factor)
+    """
+    nonzero = (coefs != 0) & (x >= 0)
+    objective = model.proto.objective
+    objective.Clear()
+    objective.vars.extend(x[nonzero].tolist())
+    objective.coeffs.extend((-coefs[nonzero] if maximize else coefs[nonzero]).tolist())
+    objective.scaling_factor = (-1.0 if maximize else 1.0) / factor
+
+def _set_hint(model, x, selected, group=None):
+    """
+    아이템별 선택된 전략을 solution hint로 설정합니다. 사전 처리로 제거된 전략의 hint는 생략합니다.
+
+    Args:
+        model: CP-SAT 모델 객체
+        x: 변수 인덱스 2차원 배열
+        selected: 각 아이템에 대해 선택된 전략의 인덱스, 선택하지 않음은 -1
+        group: 아이템별 묶음 인덱스. 주어진 경우 x는 묶음별 정수 변수입니다.
+    """
+    hint = model.proto.solution_hint
+    hint.Clear()
+    hint.vars.extend(x[x >= 0].tolist())
+    hint.values.extend(count_selection(selected, group, x.shape)[x >= 0].tolist())
+
+def _to_cpsat_int(array, precision=CP_SAT_PRECISION, direction=0, name="", stats=None):
+    """
+    실수 계수를 정수로 변환합니다. 제약(또는 목적 함수)마다 따로 호출하여 각각의 배율을 정합니다.
+    계수별 반올림 오차가 precision * max|계수| 이하가 되는 가장 작은 10의 거듭제곱 배율을 곱해 정수로 만든 뒤,
+    정수 계수들의 최대공약수로 나눕니다. 계수가 작을수록 CP-SAT의 전파가 빠르고 오버플로의 위험이 줄어듭니다.
+
+    Args:
+        array: 실수 계수 배열 (num_item, action_dim)
+        precision: 허용하는 상대 반올림 오차
+        direction: 1이면 올림, -1이면 내림, 0이면 반올림합니다.
+            상한 제약은 올림, 하한 제약은 내림을 사용하면 정수화한 모델의 해가 원래 제약도 만족합니다.
+        name: 출력과 stats에 사용할 제약의 이름
+        stats: 주어진 경우 stats["scaling"][name]에 배율("factor"), 가장 큰 정수 계수("max_coef"),
+            계수별 최대 반올림 오차("max_error"), 한 해에서 생길 수 있는 오차 합의 최댓값("total_error")을 기록할 딕셔너리
+
+    Returns:
+        (coefs, factor): 정수 계수 배열과 배율. coefs ≈ array * factor
+
+    Raises:
+        ValueError: 비어 있거나 숫자가 아닌 값이 포함된 경우
+    """
+    array = np.asarray(array, dtype=np.float64)
+    coefs, factor = _scale_to_int(array, precision, direction)
+    if not coefs.any():
+        return coefs, factor
+
+    error = np.abs(coefs / factor - array)
+    max_coef = int(np.abs(coefs).max())
+    max_error = float(error.max())
+    total_error = float(error.max(axis=-1).sum())
+    print(f"CP-SAT 정수화({name}): 배율 {factor:.6g}, 가장 큰 계수 {max_coef}, "
+          f"최대 반올림 오차 {max_error:.6g} (해 전체 {total_error:.6g} 이하)")
+    if stats is not None:
+        stats.setdefault("scaling", {})[name] = dict(factor=factor, max_coef=max_coef, max_error=max_error,
+                                                     total_error=total_error)
+    return coefs, factor
+
+def _scale_to_int(array, precision=CP_SAT_PRECISION, direction=0):
+    """
+    _to_cpsat_int의 정수화만 합니다. 출력하거나 stats에 기록하지 않으며, 같은 배열에는 항상 같은 배율을 반환합니다.
+
+    Returns:
+        (coefs, factor): 정수 계수 배열과 배율
+
+    Raises:
+        ValueError: 숫자가 아닌 값이 포함된 경우
+    """
+    array = np.asarray(array, dtype=np.float64)
+    if not np.isfinite(array).all():
+        raise ValueError("비용 또는 가치 테이블에 비어 있거나 숫자가 아닌 셀이 있습니다. 입력 테이블의 범위를 확인하세요.")
+
+    largest = float(np.abs(array).max()) if array.size else 0.0
+    if largest == 0:
+        return np.zeros(array.shape, dtype=np.int64), 1.0
+
+    # 가장 큰 계수가 한 자리 정수가 되는 배율부터 오차 조건을 만족할 때까지 10배씩 키움
+    exponent = -int(np.floor(np.log10(largest)))
+    while True:
+        scale = 10.0 ** exponent
+        scaled = array * scale
+        coefs = np.rint(scaled)
+        if direction != 0:
+            # 부동소수점 오차로 정수에서 조금 벗어난 값은 그 정수로 봄
+            exact = np.abs(scaled - coefs) <= 1e-9 * np.maximum(np.abs(scaled), 1.0)
+            coefs = np.where(exact, coefs, np.ceil(scaled) if direction > 0 else np.floor(scaled))
+        if np.abs(coefs / scale - array).max() <= precision * largest:
+            break
+        exponent += 1
+
+    coefs = coefs.astype(np.int64)
+    divisor = int(np.gcd.reduce(np.abs(coefs[coefs != 0])))
+    coefs //= divisor
+    return coefs, scale / divisor
+
+
+def _to_cpsat_bound(bound, factor, upper=True):
+    """
+    제약의 우변을 _to_cpsat_int의 배율로 정수화합니다. 상한은 내림, 하한은 올림합니다.
+    """
+    scaled = bound * factor
+    rounded = round(scaled)
+    if abs(scaled - rounded) <= 1e-9 * max(abs(scaled), 1.0):
+        return int(rounded)
+    return int(np.floor(scaled)) if upper else int(np.ceil(scaled))
+
+class _IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    """
+    CP-SAT이 더 좋은 해를 찾을 때마다 해를 아이템별 전략으로 바꾸어 on_solution에 전달하는 콜백입니다.
+    on_solution이 True를 반환하면 탐색을 멈춥니다.
+    """
+
+    def __init__(self, x, num_item, action_dim, on_solution, group=None):
+        super().__init__()
+        self.x = x
+        self.num_item = num_item
+        self.action_dim = action_dim
+        self.on_solution = on_solution
+        self.group = group
+
+    def on_solution_callback(self):
+        solution = np.asarray(self.response_proto.solution, dtype=np.int64)
+        if self.group is None:
+            selected = process_solution(np.where(self.x >= 0, solution[self.x], 0).reshape(self.num_item,
+                                                                                          self.action_dim))
+        else:
+            selected = expand_counts(np.where(self.x >= 0, solution[self.x], 0), self.group)
+
+        objective = float(self.objective_value)
+        bound = float(self.best_objective_bound)
+        incumbent = dict(objective=objective, bound=bound, gap=abs(objective - bound) / max(abs(objective), 1.0),
+                         elapsed_time=float(self.wall_time), selected=selected)
+        if self.on_solution(incumbent):
+            self.stop_search()
+
+def _run_cpsat_solver(model, num_search_workers=None, time_limit=None, relative_gap=None, absolute_gap=None,
+                      seed=None, deterministic=False, callback=None, stop_event=None):
+    """
+    CP-SAT 솔버를 실행하고 결과를 반환합니다. None인 매개변수는 CP-SAT의 기본값을 사용합니다.
+
+    Args:
+        model: CP-SAT 모델 객체
+        num_search_workers: 탐색 스레드 수. 기본값(0)은 CPU 코어 수만큼 사용합니다.
+        time_limit: 최대 풀이 시간(초). deterministic인 경우 CP-SAT의 결정적 시간 단위입니다.
+        relative_gap: 목적 함수 값과 상한의 상대 차이가 이 값 이하가 되면 멈춥니다.
+        absolute_gap: 목적 함수 값과 상한의 차이(원래 단위)가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        deterministic: True이면 스레드 수와 관계없이 같은 입력에 같은 해를 내는 interleave 탐색을 사용합니다.
+        callback: 해를 찾을 때마다 호출할 CpSolverSolutionCallback
+        stop_event: 주어진 경우 이 threading.Event가 설정되면 CP_SAT_STOP_INTERVAL 안에 탐색을 멈춥니다.
 
     Returns:
         (status, solver, float): 솔버 실행 상태와 솔버 객체 및 실행 시간
     """
     solver = cp_model.CpSolver()
+    parameters = solver.parameters
+    if num_search_workers is not None:
+        parameters.num_workers = int(num_search_workers)
+    if relative_gap is not None:
+        parameters.relative_gap_limit = float(relative_gap)
+    if absolute_gap is not None:
+        parameters.absolute_gap_limit = float(absolute_gap)
+    if seed is not None:
+        parameters.random_seed = int(seed)
+    if deterministic:
+        # 실제 시간 제한은 실행마다 결과가 달라지므로 결정적 시간으로 제한
+        parameters.interleave_search = True
+        if time_limit is not None:
+            parameters.max_deterministic_time = float(time_limit)
+    elif time_limit is not None:
+        parameters.max_time_in_seconds = float(time_limit)
+
+    finished = threading.Event()
+    if stop_event is not None:
+        # 다른 스레드의 중단 요청을 확인. stop_search는 풀이 시작 전에는 효과가 없으므로 끝날 때까지 반복해서 호출
+        def watch():
+            while not finished.wait(CP_SAT_STOP_INTERVAL):
+                if stop_event.is_set():
+                    solver.stop_search()
+
+        threading.Thread(target=watch, daemon=True).start()
+
     time_start = time.time()
-    status = solver.Solve(model)
+    try:
+        status = solver.Solve(model, callback)
+    finally:
+        finished.set()
     time_end = time.time()
 
     if status == cp_model.OPTIMAL:
@@ -58,29 +299,51 @@ def _run_cpsat_solver(model):
 
     return status, solver, time_end - time_start
 
+def _objective_bound(status, solver, stats=None):
+    """
+    해의 목적 함수 값과 솔버가 증명한 목적 함수의 한계(최대화는 상한, 최소화는 하한), 둘의 상대 차이(gap)를 출력합니다.
+    gap은 CP-SAT의 relative_gap_limit과 같이 |값 - 한계| / max(|값|, 1)입니다.
+
+    Args:
+        status: 솔버 실행 상태
+        solver: CP-SAT 솔버 객체
+        stats: 주어진 경우 목적 함수의 한계("objective_bound")와 gap("gap")을 기록할 딕셔너리
+    """
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return
+    bound = float(solver.best_objective_bound)
+    gap = abs(solver.objective_value - bound) / max(abs(solver.objective_value), 1.0)
+    print(f"목적 함수 한계: {bound}, gap: {gap:.4%}")
+    if stats is not None:
+        stats.update(objective_bound=bound, gap=gap)
+
 def _process_cpsat_result(status, solver, x, num_item, action_dim, costs, values, value_weights=None,
-                          is_cost_constraint=True):
+                          is_cost_constraint=True, group=None):
     """
-    CP-SAT 솔버 결과를 처리합니다.
+    CP-SAT 솔버 결과를 처리합니다. 모든 변수의 값은 응답의 solution 배열에서 한 번에 읽어옵니다.
 
     Args:
         status: 솔버 실행 상태
         solver: CP-SAT 솔버 객체
-        x: 변수 2차원 배열
+        x: 변수 인덱스 2차원 배열
         num_item: 아이템 수
         action_dim: 각 아이템에 대한 전략(액션) 수
-        costs: 비용을 담은 데이터프레임
-        values: 가치를 담은 데이터프레임 목록
+        costs: 비용 배열 (n_items, n_strategies)
+        values: 가치 배열 (n_items, value_dim, n_strategies)
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
         is_cost_constraint: 비용 제약 문제 여부 (True: 비용 제약, False: 신뢰도 제약)
+        group: 아이템별 묶음 인덱스. 주어진 경우 x는 묶음별 정수 변수이며, 아이템별 전략으로 되돌립니다.
 
     Returns:
         (selected, cost, value): 선택된 전략, 총 비용, 총 가치/가치 리스트
         최적 해를 찾지 못한 경우 None
     """
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        selected = [[solver.Value(x[i][j]) for j in range(action_dim)] for i in range(num_item)]
-        selected = process_solution(selected)
+        solution = np.asarray(solver.response_proto.solution, dtype=np.int64)
+        if group is None:
+            selected = process_solution(np.where(x >= 0, solution[x], 0).reshape(num_item, action_dim))
+        else:
+            selected = expand_counts(np.where(x >= 0, solution[x], 0), group)
 
         if is_cost_constraint:
             return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights)
@@ -90,110 +353,329 @@ def _process_cpsat_result(status, solver, x, num_item, action_dim, costs, values
         print("최적 해를 찾지 못했습니다.")
         raise ValueError("No optimal solution found.")
 
-def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False):
+def _build_cost_constraint_model(problem, cost_constraint, value_weights=None, allow_zero_strategy=False,
+                                 presolve=True, lp_dominance=False, aggregate=True, precision=CP_SAT_PRECISION,
+                                 stats=None):
+    """
+    비용 제약 문제의 CP-SAT 모델을 만듭니다.
+
+    Returns:
+        (model, x, budget, value_weights, group, budget_factor): 모델, 변수 인덱스 배열, 비용 제약의 proto 인덱스, 표준화된 가중치,
+        아이템별 묶음 인덱스(같은 아이템을 묶지 않은 경우 None), 비용 제약의 정수화 배율
+    """
+    # 가중치 표준화
+    value_weights = _normalize_value_weights(problem.value, value_weights)
+
+    # 같은 아이템을 묶음으로 합침
+    group = counts = None
+    if aggregate:
+        problem, group, counts = aggregate_items(problem, stats)
+
+    values = problem.value
+    costs = problem.cost
+    num_item, action_dim = costs.shape
+
+    # 지배되는 전략 제거
+    keep = None
+    if presolve:
+        keep = presolve_strategies(problem, value_weights, allow_zero_strategy, lp_dominance=lp_dominance, stats=stats)
+
+    # 솔버 초기화 및 변수 설정
+    model, x = _init_cpsat_solver(num_item, action_dim, allow_zero_strategy, keep, counts)
+
+    # 비용 제약 조건
+    cost_coefs, budget_factor = _to_cpsat_int(costs, precision, 1, "cost", stats)
+    budget = _add_linear_constraint(model, x, cost_coefs, upper_bound=_to_cpsat_bound(cost_constraint, budget_factor))
+
+    # 가치를 최대화하는 목적 함수
+    value_coefs, value_factor = _to_cpsat_int(np.einsum("idj,d->ij", values, value_weights), precision, 0, "objective",
+                                              stats)
+    _set_objective(model, x, value_coefs, maximize=True, factor=value_factor)
+
+    return model, x, budget, value_weights, group, budget_factor
+
+def _set_budget(model, budget, cost_constraint, budget_factor):
+    """
+    비용 제약의 상한(예산)만 바꿉니다.
+    """
+    model.proto.constraints[budget].linear.domain[1] = _to_cpsat_bound(cost_constraint, budget_factor)
+
+def _set_term(variables, coeffs, variable, coef):
+    """
+    proto의 변수 목록과 계수 목록에서 variable의 계수를 바꿉니다. 목록에 없는 변수는 추가합니다.
+    """
+    position = np.flatnonzero(np.asarray(variables) == variable)
+    if len(position):
+        coeffs[int(position[0])] = coef
+    else:
+        variables.append(variable)
+        coeffs.append(coef)
+
+def _update_cost_constraint_model(model, x, budget, item, strategy, costs, profits, cost_constraint, budget_factor,
+                                  precision=CP_SAT_PRECISION):
+    """
+    비용 제약 문제의 모델에서 한 아이템의 한 전략의 비용 계수와 목적 함수 계수를 바꿉니다.
+    바뀐 배열을 모델을 만들 때와 같은 방법으로 다시 정수화하여, 배율이 그대로이면 그 계수만 고치고,
+    배율이 바뀌면(예: 모두 100의 배수이던 비용에 150이 들어온 경우) 비용 제약이나 목적 함수 전체를 새 배율로 다시 씁니다.
+    따라서 고친 모델은 바뀐 문제로 새로 만든 모델과 같습니다.
+
+    Args:
+        model: CP-SAT 모델 객체
+        x: 변수 인덱스 2차원 배열. 사전 처리와 묶음 없이 만든 모델이어야 합니다.
+        budget: 비용 제약의 proto 인덱스
+        item: 아이템 인덱스
+        strategy: 전략 인덱스
+        costs: 바뀐 비용 배열 (num_item, action_dim)
+        profits: 바뀐 가중 가치 배열 (num_item, action_dim)
+        cost_constraint: 최대 비용 제약
+        budget_factor: 지금 모델의 비용 제약 정수화 배율
+        precision: 계수를 정수로 바꿀 때 허용하는 상대 반올림 오차. 모델을 만들 때와 같아야 합니다.
+
+    Returns:
+        (budget_factor,): 비용 제약의 정수화 배율
+    """
+    variable = int(x[item, strategy])
+
+    cost_coefs, new_budget_factor = _scale_to_int(costs, precision, 1)
+    linear = model.proto.constraints[budget].linear
+    if new_budget_factor == budget_factor:
+        _set_term(linear.vars, linear.coeffs, variable, int(cost_coefs[item, strategy]))
+    else:
+        print(f"CP-SAT 정수화(cost): 배율이 {budget_factor:.6g}에서 {new_budget_factor:.6g}로 바뀌어 비용 제약을 다시 씁니다.")
+        nonzero = (cost_coefs != 0) & (x >= 0)
+        del linear.vars[:]
+        del linear.coeffs[:]
+        linear.vars.extend(x[nonzero].tolist())
+        linear.coeffs.extend(cost_coefs[nonzero].tolist())
+        linear.domain[1] = _to_cpsat_bound(cost_constraint, new_budget_factor)
+
+    value_coefs, value_factor = _scale_to_int(profits, precision, 0)
+    # 목적 함수의 scaling_factor는 (최대화이므로 음수인) 배율의 역수
+    objective = model.proto.objective
+    if objective.scaling_factor == -1.0 / value_factor:
+        _set_term(objective.vars, objective.coeffs, variable, -int(value_coefs[item, strategy]))
+    else:
+        print(f"CP-SAT 정수화(objective): 배율이 {value_factor:.6g}로 바뀌어 목적 함수를 다시 씁니다.")
+        _set_objective(model, x, value_coefs, maximize=True, factor=value_factor)
+
+    return (new_budget_factor,)
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False, presolve=True,
+                          lp_dominance=False, aggregate=True, precision=CP_SAT_PRECISION, num_search_workers=None,
+                          time_limit=None, relative_gap=None, absolute_gap=None, seed=None, deterministic=False,
+                          on_solution=None, stop_event=None, initial_solution=None, stats=None):
     """
     CP-SAT 솔버를 사용하여 비용 제약 문제를 해결합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
         cost_constraint: 최대 비용 제약
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        presolve: 모델을 만들기 전에 지배되는 전략을 제거할지 여부
+        lp_dominance: presolve에서 LP 지배 전략도 제거할지 여부. 정수해의 최적성이 보장되지 않습니다.
+        aggregate: 비용과 가치가 모두 같은 아이템들을 묶어 전략별 선택 수를 정수 변수로 둘지 여부
+        precision: 계수를 정수로 바꿀 때 허용하는 상대 반올림 오차
+        num_search_workers: CP-SAT 탐색 스레드 수. None인 경우 CPU 코어 수만큼 사용합니다.
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: 목적 함수 값과 한계의 상대 차이가 이 값 이하가 되면 최적성 증명 전에 멈춥니다. None인 경우 최적해까지 풉니다.
+        absolute_gap: 목적 함수 값과 한계의 차이가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        deterministic: 스레드 수와 관계없이 같은 결과를 내는 결정적(interleave) 탐색을 사용할지 여부
+        on_solution: 더 좋은 해를 찾을 때마다 호출할 함수. 목적 함수 값("objective"), 한계("bound"), gap("gap"),
+            풀이 시작부터의 시간("elapsed_time"), 선택된 전략("selected")의 딕셔너리를 받으며, True를 반환하면 탐색을 멈춥니다.
+            incumbent.jsonl_sink나 Qt Signal의 emit을 그대로 전달할 수 있습니다.
+        stop_event: 주어진 경우 이 threading.Event가 설정되면 탐색을 멈추고 그때까지 찾은 가장 좋은 해를 반환합니다.
+        initial_solution: 탐색을 시작할 해(전략 인덱스 리스트, 선택하지 않음은 -1). solution hint로 전달합니다.
+        stats: 주어진 경우 모델 생성 시간("build_time"), 풀이 시간("solve_time"), 정수화 정보("scaling"),
+            목적 함수의 한계("objective_bound")와 gap("gap")을 기록할 딕셔너리
 
     Returns:
-        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
-        최적 해를 찾지 못한 경우 None
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간(풀이 시간)
+        최적 해를 찾지 못한 경우 None. 시간 또는 gap 제한으로 멈춘 경우 그때까지 찾은 가장 좋은 해
     """
-    values = problem["value"]
-    costs = problem["cost"]
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
     num_item, action_dim = costs.shape
 
-    # 솔버 초기화 및 변수 설정
-    model, x = _init_cpsat_solver(num_item, action_dim, allow_zero_strategy)
-
-    # 비용 제약 조건
-    model.Add(
-        sum(int(costs.iloc[i, j] * CP_SAT_COEF) * x[i][j] for i in range(num_item) for j in range(action_dim))
-        <= int(cost_constraint * CP_SAT_COEF)
-    )
+    build_start = time.time()
 
-    # 가중치 표준화
-    value_weights = _normalize_value_weights(values, value_weights)
+    model, x, _, value_weights, group, _ = _build_cost_constraint_model(problem, cost_constraint, value_weights,
+                                                                        allow_zero_strategy, presolve, lp_dominance,
+                                                                        aggregate, precision, stats)
 
-    # 가치를 최대화하는 목적 함수
-    try:
-        objective_expr = sum(
-            int(values[i].iloc[k, j] * weight * CP_SAT_COEF) * x[i][j]
-            for i in range(num_item) for j in range(action_dim)
-            for k, weight in enumerate(value_weights)
-        )
-    except IndexError as e:
-        raise IndexError(f"{e}"
-                         f"비용테이블과 가치테이블에 존재하는 장치의 수가 일치하지 않을 수 있습니다.\n"
-                         f"비용테이블의 장치: {len(costs.index.tolist())}\n"
-                         f"가치테이블의 장치: {len([values[i].index.tolist() for i in range(len(values))])}\n"
-                         f"위 두 값이 일정하지 않을 경우, 입력 테이블의 범위가 잘못 설정되었을 수 있습니다.\n")
+    build_time = time.time() - build_start
+    print(f"모델 생성 시간: {build_time:.4f}초")
 
-
-    model.Maximize(objective_expr)
+    if initial_solution is not None:
+        _set_hint(model, x, initial_solution, group)
 
     # 솔버 실행
-    status, solver, elapsed_time = _run_cpsat_solver(model)
+    callback = None if on_solution is None else _IncumbentCallback(x, num_item, action_dim, on_solution, group)
+    status, solver, elapsed_time = _run_cpsat_solver(model, num_search_workers, time_limit, relative_gap, absolute_gap,
+                                                     seed, deterministic, callback, stop_event)
+    _objective_bound(status, solver, stats)
+
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=elapsed_time)
 
     # 결과 처리
-    return *_process_cpsat_result(status, solver, x, num_item, action_dim, costs, values, value_weights, True), elapsed_time
+    return *_process_cpsat_result(status, solver, x, num_item, action_dim, costs, values, value_weights, True,
+                                  group), elapsed_time
+
+def solve_cost_constraint_sweep(problem, cost_constraints, value_weights=None, allow_zero_strategy=False, use_hint=True,
+                                presolve=True, lp_dominance=False, aggregate=True, precision=CP_SAT_PRECISION,
+                                num_search_workers=None, time_limit=None, relative_gap=None, absolute_gap=None,
+                                seed=None, deterministic=False, stats=None):
+    """
+    CP-SAT 모델을 한 번만 만들고 비용 제약의 우변만 바꾸어 가며 여러 예산에 대해 비용 제약 문제를 차례로 해결합니다.
+    이전 예산의 최적해는 다음 풀이의 solution hint로 전달합니다. 예산이 오름차순이면 이전 해가 항상 실행 가능한 hint가 됩니다.
 
-def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False):
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraints: 최대 비용 제약 목록
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        use_hint: 이전 예산의 해를 hint로 전달할지 여부
+        presolve: 모델을 만들기 전에 지배되는 전략을 제거할지 여부
+        lp_dominance: presolve에서 LP 지배 전략도 제거할지 여부. 정수해의 최적성이 보장되지 않습니다.
+        aggregate: 비용과 가치가 모두 같은 아이템들을 묶어 전략별 선택 수를 정수 변수로 둘지 여부
+        precision: 계수를 정수로 바꿀 때 허용하는 상대 반올림 오차
+        num_search_workers: CP-SAT 탐색 스레드 수. None인 경우 CPU 코어 수만큼 사용합니다.
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: 목적 함수 값과 한계의 상대 차이가 이 값 이하가 되면 최적성 증명 전에 멈춥니다. None인 경우 최적해까지 풉니다.
+        absolute_gap: 목적 함수 값과 한계의 차이가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        deterministic: 스레드 수와 관계없이 같은 결과를 내는 결정적(interleave) 탐색을 사용할지 여부
+        stats: 주어진 경우 모델 생성 시간("build_time"), 전체 풀이 시간("solve_time"), 정수화 정보("scaling")를 기록할 딕셔너리
+
+    Yields:
+        (cost_constraint, selected, elapsed_time): 예산, 선택된 전략(해가 없는 경우 None), 풀이 시간
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    num_item, action_dim = costs.shape
+    cost_constraints = list(cost_constraints)
+    if len(cost_constraints) == 0:
+        return
+
+    build_start = time.time()
+    model, x, budget, value_weights, group, budget_factor = _build_cost_constraint_model(
+        problem, cost_constraints[0], value_weights, allow_zero_strategy, presolve, lp_dominance, aggregate, precision,
+        stats)
+    build_time = time.time() - build_start
+    print(f"모델 생성 시간: {build_time:.4f}초")
+
+    solve_time = 0.0
+    for cost_constraint in cost_constraints:
+        # 비용 제약의 상한만 바꿈
+        _set_budget(model, budget, cost_constraint, budget_factor)
+
+        status, solver, elapsed_time = _run_cpsat_solver(model, num_search_workers, time_limit, relative_gap,
+                                                         absolute_gap, seed, deterministic)
+        _objective_bound(status, solver)
+        solve_time += elapsed_time
+        try:
+            selected, _, _ = _process_cpsat_result(status, solver, x, num_item, action_dim, costs, values,
+                                                   value_weights, True, group)
+        except ValueError:
+            selected = None
+
+        if use_hint and selected is not None:
+            # 이번 해를 다음 풀이의 hint로 사용
+            _set_hint(model, x, selected, group)
+
+        yield cost_constraint, selected, elapsed_time
+
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=solve_time)
+
+def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False, presolve=True, aggregate=True,
+                                 precision=CP_SAT_PRECISION, num_search_workers=None, time_limit=None, relative_gap=None,
+                                 absolute_gap=None, seed=None, deterministic=False, on_solution=None,
+                                 stop_event=None, initial_solution=None, stats=None):
     """
     CP-SAT 솔버를 사용하여 신뢰도 제약 문제를 해결합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
         reliability_constraint: 각 가치 차원별 최소 요구 신뢰도
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        presolve: 모델을 만들기 전에 지배되는 전략을 제거할지 여부
+        aggregate: 비용과 가치가 모두 같은 아이템들을 묶어 전략별 선택 수를 정수 변수로 둘지 여부
+        precision: 계수를 정수로 바꿀 때 허용하는 상대 반올림 오차
+        num_search_workers: CP-SAT 탐색 스레드 수. None인 경우 CPU 코어 수만큼 사용합니다.
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: 목적 함수 값과 한계의 상대 차이가 이 값 이하가 되면 최적성 증명 전에 멈춥니다. None인 경우 최적해까지 풉니다.
+        absolute_gap: 목적 함수 값과 한계의 차이가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        deterministic: 스레드 수와 관계없이 같은 결과를 내는 결정적(interleave) 탐색을 사용할지 여부
+        on_solution: 더 좋은 해를 찾을 때마다 호출할 함수. 목적 함수 값("objective"), 한계("bound"), gap("gap"),
+            풀이 시작부터의 시간("elapsed_time"), 선택된 전략("selected")의 딕셔너리를 받으며, True를 반환하면 탐색을 멈춥니다.
+            incumbent.jsonl_sink나 Qt Signal의 emit을 그대로 전달할 수 있습니다.
+        stop_event: 주어진 경우 이 threading.Event가 설정되면 탐색을 멈추고 그때까지 찾은 가장 좋은 해를 반환합니다.
+        initial_solution: 탐색을 시작할 해(전략 인덱스 리스트, 선택하지 않음은 -1). solution hint로 전달합니다.
+        stats: 주어진 경우 모델 생성 시간("build_time"), 풀이 시간("solve_time"), 정수화 정보("scaling"),
+            목적 함수의 한계("objective_bound")와 gap("gap")을 기록할 딕셔너리
 
     Returns:
-        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간
-        최적 해를 찾지 못한 경우 None
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간(풀이 시간)
+        최적 해를 찾지 못한 경우 None. 시간 또는 gap 제한으로 멈춘 경우 그때까지 찾은 가장 좋은 해
 
     Raises:
         ValueError: 신뢰도 제약 길이가 가치 차원과 일치하지 않을 경우
     """
-    values = problem["value"]
-    costs = problem["cost"]
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
     num_item, action_dim = costs.shape
 
-    # 솔버 초기화 및 변수 설정
-    model, x = _init_cpsat_solver(num_item, action_dim, allow_zero_strategy)
-
     # 신뢰도 제약 조건
-    if len(reliability_constraint) != values[0].shape[0]:
+    if len(reliability_constraint) != problem.value_dim:
         raise ValueError(
-            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {values[0].shape[0]}")
+            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {problem.value_dim}")
 
-    try:
-        for k in range(len(reliability_constraint)):
-            model.Add(
-                sum(int(values[i].iloc[k, j] * CP_SAT_COEF) * x[i][j] for i in range(num_item) for j in range(action_dim))
-                > int(reliability_constraint[k] * CP_SAT_COEF)
-            )
-    except IndexError as e:
-        raise IndexError(f"{e}"
-                         f"비용테이블과 가치테이블에 존재하는 장치의 수가 일치하지 않을 수 있습니다.\n"
-                         f"비용테이블의 장치: {len(costs.index.tolist())}\n"
-                         f"가치테이블의 장치: {len([values[i].index.tolist() for i in range(len(values))])}\n"
-                         f"위 두 값이 일정하지 않을 경우, 입력 테이블의 범위가 잘못 설정되었을 수 있습니다.\n")
+    build_start = time.time()
+
+    # 같은 아이템을 묶음으로 합침
+    model_problem, group, counts = aggregate_items(problem, stats) if aggregate else (problem, None, None)
+
+    # 지배되는 전략 제거
+    keep = presolve_strategies(model_problem, allow_zero_strategy=allow_zero_strategy, stats=stats) if presolve else None
+
+    # 솔버 초기화 및 변수 설정
+    model, x = _init_cpsat_solver(model_problem.num_item, action_dim, allow_zero_strategy, keep, counts)
+
+    # 가치 차원마다 따로 정수화
+    for k in range(len(reliability_constraint)):
+        value_coefs, factor = _to_cpsat_int(model_problem.value[:, k, :], precision, -1, f"value {k}", stats)
+        _add_linear_constraint(model, x, value_coefs,
+                               lower_bound=_to_cpsat_bound(reliability_constraint[k], factor, upper=False))
 
     # 비용을 최소화하는 목적 함수
-    objective_expr = sum(
-        int(costs.iloc[i, j] * CP_SAT_COEF) * x[i][j] for i in range(num_item) for j in range(action_dim))
-    model.Minimize(objective_expr)
+    cost_coefs, cost_factor = _to_cpsat_int(model_problem.cost, precision, 0, "objective", stats)
+    _set_objective(model, x, cost_coefs, maximize=False, factor=cost_factor)
+
+    build_time = time.time() - build_start
+    print(f"모델 생성 시간: {build_time:.4f}초")
+
+    if initial_solution is not None:
+        _set_hint(model, x, initial_solution, group)
 
     # 솔버 실행
-    status, solver, elapsed_time = _run_cpsat_solver(model)
+    callback = None if on_solution is None else _IncumbentCallback(x, num_item, action_dim, on_solution, group)
+    status, solver, elapsed_time = _run_cpsat_solver(model, num_search_workers, time_limit, relative_gap, absolute_gap,
+                                                     seed, deterministic, callback, stop_event)
+    _objective_bound(status, solver, stats)
+
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=elapsed_time)
 
     # 결과 처리
-    return *_process_cpsat_result(status, solver, x, num_item, action_dim, costs, values, None, False), elapsed_time
+    return *_process_cpsat_result(status, solver, x, num_item, action_dim, costs, values, None, False,
+                                  group), elapsed_time
 
 def main():
     problem = make_random_problem(random_seed=4)
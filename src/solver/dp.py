@@ -0,0 +1,289 @@
+import math
+import time
+
+import numpy as np
+
+from src.problem.problem import as_problem
+from src.problem.strategy import get_cost, get_total_value, get_value, _normalize_value_weights
+
+"""
+이 모듈은 Multiple-Choice Knapsack Problem(MCKP)을 동적계획법으로 풀이합니다.
+
+비용을 정수 격자(cost_unit 단위)로 변환한 뒤, 예산 b에 대해 f[b] = "비용 합이 b 이하일 때의 최대 가치"를 아이템 순서대로 갱신합니다.
+각 아이템 단계는 전략별로 f를 비용만큼 이동시킨 배열들의 NumPy 최댓값으로 계산합니다.
+해의 복원은 분할정복(Hirschberg 방식)으로 수행하므로 전체 DP 테이블을 저장하지 않고, 메모리는 O(capacity)입니다.
+"""
+
+# cost_unit을 자동으로 정할 때 사용하는 예산 격자의 최대 크기
+DP_MAX_CAPACITY = 100_000
+# 분할정복에서 선택 테이블을 직접 저장하고 역추적하는 구간의 크기
+DP_LEAF_SIZE = 64
+
+
+def _stage(f, weights, profits, allow_zero_strategy, at_least=False, choice=None):
+    """
+    아이템 하나를 추가했을 때의 DP 배열을 계산합니다.
+
+    Args:
+        f: 이전 단계의 DP 배열 (capacity + 1,)
+        weights: 아이템의 전략별 정수 가중치(상태 축) (action_dim,)
+        profits: 아이템의 전략별 이익(최대화 대상) (action_dim,)
+        allow_zero_strategy: 아무 전략도 선택하지 않는 경우를 허용할지 여부
+        at_least: True인 경우 상태 b는 "가중치 합이 b 이상"을, False인 경우 "b 이하"를 의미합니다.
+        choice: 주어진 경우 각 상태에서 선택된 전략 인덱스를 기록할 배열 (capacity + 1,), 선택하지 않음은 -1
+
+    Returns:
+        np.ndarray: 갱신된 DP 배열 (capacity + 1,)
+    """
+    capacity = len(f) - 1
+    g = f.copy() if allow_zero_strategy else np.full_like(f, -np.inf)
+    if choice is not None:
+        choice[:] = -1
+
+    for j in range(len(weights)):
+        weight = int(weights[j])
+        if weight > capacity:
+            if not at_least:
+                continue
+            weight = capacity + 1
+
+        # 상태 b >= weight: 이전 상태 b - weight에서 전략 j를 선택
+        candidate = f[:capacity + 1 - weight] + profits[j]
+        target = g[weight:]
+        if choice is None:
+            np.maximum(target, candidate, out=target)
+        else:
+            better = candidate > target
+            target[better] = candidate[better]
+            choice[weight:][better] = j
+
+        # at_least인 경우 상태 b < weight는 이전 상태 0에서 도달할 수 있음
+        if at_least and weight > 0:
+            head = g[:weight]
+            candidate = f[0] + profits[j]
+            if choice is None:
+                np.maximum(head, candidate, out=head)
+            else:
+                better = candidate > head
+                head[better] = candidate
+                choice[:weight][better] = j
+
+    return g
+
+
+def _initial(capacity, at_least=False):
+    """
+    아이템이 없을 때의 DP 배열을 반환합니다.
+    """
+    if at_least:
+        f = np.full(capacity + 1, -np.inf)
+        f[0] = 0.0
+        return f
+    return np.zeros(capacity + 1)
+
+
+def forward(weights, profits, capacity, allow_zero_strategy, at_least=False):
+    """
+    주어진 아이템들에 대해 DP 배열을 끝까지 계산합니다. 중간 단계는 저장하지 않습니다.
+    """
+    f = _initial(capacity, at_least)
+    for i in range(len(weights)):
+        f = _stage(f, weights[i], profits[i], allow_zero_strategy, at_least)
+    return f
+
+
+def _solve_segment(weights, profits, capacity, allow_zero_strategy, at_least, selected, offset):
+    """
+    weights[offset:offset + n] 구간의 아이템에 대해 용량 capacity에서 최적인 선택을 selected에 기록합니다.
+    구간이 DP_LEAF_SIZE보다 크면 절반으로 나누어 최적 분할 용량을 찾은 뒤 재귀적으로 복원합니다.
+
+    Returns:
+        float: 구간의 최대 이익, 가능한 해가 없으면 -inf
+    """
+    num_item = len(weights)
+    if num_item == 0:
+        return 0.0 if capacity == 0 or not at_least else -np.inf
+
+    if num_item <= DP_LEAF_SIZE:
+        table = np.empty((num_item, capacity + 1), dtype=np.int16)
+        f = _initial(capacity, at_least)
+        for i in range(num_item):
+            f = _stage(f, weights[i], profits[i], allow_zero_strategy, at_least, choice=table[i])
+
+        best = float(f[capacity])
+        if not np.isfinite(best):
+            return best
+
+        b = capacity
+        for i in range(num_item - 1, -1, -1):
+            j = int(table[i, b])
+            selected[offset + i] = j
+            if j >= 0:
+                b = max(b - int(weights[i][j]), 0) if at_least else b - int(weights[i][j])
+        return best
+
+    mid = num_item // 2
+    front = forward(weights[:mid], profits[:mid], capacity, allow_zero_strategy, at_least)
+    back = forward(weights[mid:], profits[mid:], capacity, allow_zero_strategy, at_least)
+    total = front + back[::-1]
+    split = int(np.argmax(total))
+    best = float(total[split])
+    if not np.isfinite(best):
+        return best
+
+    _solve_segment(weights[:mid], profits[:mid], split, allow_zero_strategy, at_least, selected, offset)
+    _solve_segment(weights[mid:], profits[mid:], capacity - split, allow_zero_strategy, at_least, selected,
+                   offset + mid)
+    return best
+
+
+def mckp_dp(weights, profits, capacity, allow_zero_strategy=False, at_least=False):
+    """
+    정수 가중치 합이 capacity 이하(at_least인 경우 이상)인 조건에서 이익의 합을 최대화하는 전략을 찾습니다.
+
+    Args:
+        weights: 정수 가중치 배열 (num_item, action_dim)
+        profits: 이익 배열 (num_item, action_dim)
+        capacity: 용량
+        allow_zero_strategy: 아무 전략도 선택하지 않는 경우를 허용할지 여부
+        at_least: 가중치 합이 capacity 이상이어야 하는지 여부
+
+    Returns:
+        (selected, best): 아이템별 선택된 전략 인덱스 배열(선택하지 않음은 -1)과 최대 이익
+
+    Raises:
+        ValueError: 가능한 해가 없을 경우
+    """
+    selected = np.full(len(weights), -1, dtype=np.int64)
+    best = _solve_segment(weights, profits, capacity, allow_zero_strategy, at_least, selected, 0)
+    if not np.isfinite(best):
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+    return selected, best
+
+
+def _choose_cost_unit(costs, total, max_capacity):
+    """
+    비용을 정수 격자로 변환할 단위를 정합니다.
+    비용이 모두 정수이고 total이 max_capacity 이하이면 1을 사용하여 정확한 해를 구하고,
+    그렇지 않은 경우 total이 max_capacity개의 격자가 되도록 단위를 정합니다. total이 0 이하이면 1을 사용합니다.
+    """
+    if total <= 0 or (np.all(costs == np.round(costs)) and total <= max_capacity):
+        return 1.0
+    return float(total) / max_capacity
+
+
+def _to_int_costs(costs, cost_unit):
+    """
+    비용을 cost_unit 단위의 정수로 올림 변환합니다. 올림을 사용하므로 변환된 비용으로 구한 해는 원래 비용에서도 실행 가능합니다.
+
+    Raises:
+        ValueError: 비어 있거나 음수인 비용이 있을 경우
+    """
+    if not np.isfinite(costs).all():
+        raise ValueError("비용 테이블에 비어 있거나 숫자가 아닌 셀이 있습니다. 입력 테이블의 범위를 확인하세요.")
+    if (costs < 0).any():
+        raise ValueError("동적계획법 솔버는 음수 비용을 지원하지 않습니다.")
+    return np.ceil(costs / cost_unit - 1e-9).astype(np.int64)
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False, cost_unit=None,
+                          max_capacity=DP_MAX_CAPACITY, stats=None):
+    """
+    동적계획법을 사용하여 비용 제약 문제를 해결합니다.
+    비용은 cost_unit 단위로 올림하여 정수화되므로, 비용이 정수이고 cost_unit이 1인 경우 정확한 최적해를 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        cost_unit: 비용 격자 단위. None인 경우 자동으로 정합니다.
+        max_capacity: cost_unit을 자동으로 정할 때 사용하는 예산 격자의 최대 크기
+        stats: 주어진 경우 풀이 정보("cost_unit", "capacity", "solve_time")를 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+
+    time_start = time.time()
+
+    if cost_unit is None:
+        cost_unit = _choose_cost_unit(costs, cost_constraint, max_capacity)
+    weights = _to_int_costs(costs, cost_unit)
+    capacity = int(math.floor(cost_constraint / cost_unit + 1e-9))
+    if capacity < 0:
+        raise ValueError("No optimal solution found.")
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    profits = np.einsum("idj,d->ij", values, value_weights)
+
+    selected, _ = mckp_dp(weights, profits, capacity, allow_zero_strategy)
+
+    elapsed_time = time.time() - time_start
+    if stats is not None:
+        stats.update(cost_unit=cost_unit, capacity=capacity, solve_time=elapsed_time)
+
+    selected = selected.tolist()
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
+
+
+def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False, cost_unit=None,
+                                 max_capacity=DP_MAX_CAPACITY, stats=None):
+    """
+    동적계획법을 사용하여 신뢰도 제약 문제를 해결합니다.
+    예산별 최대 가치 f[b]를 한 번 계산한 뒤 f[b] >= 신뢰도 제약을 만족하는 가장 작은 예산을 찾습니다.
+    가치 차원이 여러 개인 경우 상태 공간이 차원 수만큼 곱해지므로 가치 차원이 1개인 문제만 지원합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        reliability_constraint: 각 가치 차원별 최소 요구 신뢰도
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        cost_unit: 비용 격자 단위. None인 경우 자동으로 정합니다.
+        max_capacity: cost_unit을 자동으로 정할 때 사용하는 예산 격자의 최대 크기
+        stats: 주어진 경우 풀이 정보("cost_unit", "capacity", "solve_time")를 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간
+
+    Raises:
+        ValueError: 신뢰도 제약 길이가 가치 차원과 일치하지 않거나, 가치 차원이 2개 이상이거나, 해가 없을 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+
+    if len(reliability_constraint) != problem.value_dim:
+        raise ValueError(
+            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {problem.value_dim}")
+    if problem.value_dim != 1:
+        raise ValueError("동적계획법 솔버는 가치 차원이 1개인 신뢰도 제약 문제만 지원합니다. SCIP 또는 CP-SAT을 사용하세요.")
+
+    time_start = time.time()
+
+    # 모든 아이템이 가장 비싼 전략을 선택했을 때의 비용이 필요한 예산의 상한
+    total_cost = float(np.nanmax(costs, axis=1).sum())
+    if cost_unit is None:
+        cost_unit = _choose_cost_unit(costs, total_cost, max_capacity)
+    weights = _to_int_costs(costs, cost_unit)
+    capacity = int(weights.max(axis=1).sum())
+
+    profits = values[:, 0, :]
+    best = forward(weights, profits, capacity, allow_zero_strategy)
+    feasible = np.flatnonzero(best >= reliability_constraint[0])
+    if len(feasible) == 0:
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+    budget = int(feasible[0])
+
+    selected, _ = mckp_dp(weights, profits, budget, allow_zero_strategy)
+
+    elapsed_time = time.time() - time_start
+    if stats is not None:
+        stats.update(cost_unit=cost_unit, capacity=budget, solve_time=elapsed_time)
+
+    selected = selected.tolist()
+    return selected, get_cost(costs, selected), get_value(values, selected), elapsed_time
@@ -0,0 +1,128 @@
+import math
+import time
+
+import numpy as np
+
+from src.problem.problem import as_problem, _check_finite
+from src.problem.strategy import get_cost, get_total_value, _normalize_value_weights, _choice_arrays, _to_selected
+from src.solver.dp import forward, mckp_dp
+from src.solver.lp_greedy import lp_greedy_solution
+
+"""
+이 모듈은 완전 다항 시간 근사 기법(FPTAS)으로 비용 제약 문제의 (1 - epsilon) 근사해를 구합니다.
+
+1. 아이템마다 가장 작은 이익을 빼서 모든 이익을 0 이상으로 만듭니다. 이하의 이익은 이 값을 기준으로 합니다.
+2. LP 완화 탐욕 알고리즘(lp_greedy)으로 상한 U와 하한 L을 구합니다. 하한은 탐욕 해와 "한 아이템만 바꾼 해" 중 좋은 것이므로 U <= 2L입니다.
+3. 이익을 K = epsilon * L / n 단위로 내림하여 정수화합니다. (n: 이익이 달라질 수 있는 아이템 수)
+4. 정수 이익의 합 p(0 <= p <= U / K)마다 "정수 이익의 합이 p 이상인 최소 비용"을 DP로 계산하고,
+   최소 비용이 예산 이하인 가장 큰 p의 해를 복원합니다. DP와 복원은 dp 모듈의 구현(at_least)을 그대로 사용합니다.
+
+최적해의 정수 이익의 합은 OPT / K - n 이상이므로, 구한 해의 이익은 OPT - n * K = OPT - epsilon * L >= (1 - epsilon) * OPT 이상입니다.
+DP 배열의 크기는 U / K <= 2n / epsilon이므로 전체 계산량은 O(n^2 * m / epsilon * log n)이며, 입력 값이나 solver의 휴리스틱과 관계없이 정해집니다.
+신뢰도 제약 문제는 지원하지 않습니다.
+"""
+
+# 기본 근사 정확도. 최적값의 (1 - FPTAS_EPSILON) 이상을 보장합니다.
+FPTAS_EPSILON = 0.05
+
+
+def _single_upgrade(choice_cost, choice_profit, base, cost_constraint):
+    """
+    모든 아이템이 base를 선택한 상태에서 한 아이템만 다른 선택지로 바꾸어 얻을 수 있는 가장 큰 이익을 구합니다.
+
+    Returns:
+        (item, choice, profit): 바꿀 아이템, 선택지, 그때의 이익의 합
+    """
+    rows = np.arange(len(base))
+    base_cost = choice_cost[rows, base]
+    base_profit = choice_profit[rows, base]
+    slack = cost_constraint - base_cost.sum()
+
+    gain = choice_profit - base_profit[:, np.newaxis]
+    gain[choice_cost - base_cost[:, np.newaxis] > slack] = -np.inf
+    item, choice = np.unravel_index(int(np.argmax(gain)), gain.shape)
+    return int(item), int(choice), float(base_profit.sum() + gain[item, choice])
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False,
+                          epsilon=FPTAS_EPSILON, stats=None):
+    """
+    FPTAS를 사용하여 비용 제약 문제의 (1 - epsilon) 근사해를 구합니다.
+    보장은 아이템별 가장 작은 가치를 뺀 가치의 합에 대한 것이며, 가장 작은 가치가 0인 경우(가치가 0 이상인 "선택하지 않음"을 허용하는 경우 등) 총 가치에 대한 보장과 같습니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        epsilon: 근사 정확도 (0 < epsilon < 1). 작을수록 정확하지만 계산량이 1 / epsilon에 비례해 늘어납니다.
+        stats: 주어진 경우 근사 정확도("epsilon"), 이익 단위("profit_unit"), DP 배열 크기("capacity"), LP 상한("upper_bound"),
+            해의 가중 가치("lower_bound"), 상한 대비 차이 비율("gap"), 풀이 시간("solve_time")을 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+
+    Raises:
+        ValueError: epsilon이 (0, 1) 범위가 아니거나 실행 가능한 해가 없을 경우
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError(f"epsilon은 0보다 크고 1보다 작아야 합니다. epsilon={epsilon}")
+
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    choice_profit = choice_value @ np.asarray(value_weights)
+
+    # 아이템별 가장 작은 이익을 기준으로 한 이익
+    offset = choice_profit.min(axis=1)
+    profit = choice_profit - offset[:, np.newaxis]
+    rows = np.arange(len(profit))
+
+    # 다른 아이템이 모두 가장 싼 선택지를 고르더라도 예산을 넘는 선택지는 LP 상한 계산에서 제외 (이익을 가장 작은 값으로)
+    base = np.argmin(choice_cost, axis=1)
+    slack = cost_constraint - choice_cost[rows, base].sum()
+    fits = choice_cost - choice_cost[rows, base][:, np.newaxis] <= slack
+    best, upper_bound = lp_greedy_solution(choice_cost, np.where(fits, profit, 0.0), cost_constraint)
+    lower_bound = float(profit[rows, best].sum())
+    item, choice, single = _single_upgrade(choice_cost, profit, base, cost_constraint)
+    if single > lower_bound:
+        best = base.copy()
+        best[item] = choice
+        lower_bound = single
+
+    profit_unit = 0.0
+    capacity = 0
+    if lower_bound > 0:
+        num_varying = int((profit.max(axis=1) > 0).sum())
+        profit_unit = epsilon * lower_bound / num_varying
+        weights = np.floor(profit / profit_unit).astype(np.int64)
+        capacity = int(math.floor(upper_bound / profit_unit + 1e-9))
+
+        # f[p]: 정수 이익의 합이 p 이상인 해의 최소 비용의 음수
+        f = forward(weights, -choice_cost, capacity, allow_zero_strategy=False, at_least=True)
+        target = int(np.flatnonzero(-f <= cost_constraint)[-1])
+        x, _ = mckp_dp(weights, -choice_cost, target, allow_zero_strategy=False, at_least=True)
+        if profit[rows, x].sum() > lower_bound:
+            best = x
+            lower_bound = float(profit[rows, best].sum())
+
+    elapsed_time = time.time() - time_start
+
+    upper_bound += float(offset.sum())
+    lower_bound += float(offset.sum())
+    gap = (upper_bound - lower_bound) / abs(upper_bound) if upper_bound != 0 else 0.0
+    print(f"FPTAS 보장: 최적값의 {1 - epsilon:.2%} 이상, LP 상한: {upper_bound}, 상한 대비 차이: {gap:.4%}")
+
+    if stats is not None:
+        stats.update(epsilon=epsilon, profit_unit=profit_unit, capacity=capacity, upper_bound=upper_bound,
+                     lower_bound=lower_bound, gap=gap, solve_time=elapsed_time)
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
@@ -1,134 +1,403 @@
-def cal_pop_fitness(equation_inputs, pop):
-    # Calculating the fitness value of each solution in the current population.
-    # The fitness function calulates the sum of products between each input and its corresponding weight.
-    fitness = numpy.sum(pop*equation_inputs, axis=1)
-    return fitness
-
-def select_mating_pool(pop, fitness, num_parents):
-    # Selecting the best individuals in the current generation as parents for producing the offspring of the next generation.
-    parents = numpy.empty((num_parents, pop.shape[1]))
-    for parent_num in range(num_parents):
-        max_fitness_idx = numpy.where(fitness == numpy.max(fitness))
-        max_fitness_idx = max_fitness_idx[0][0]
-        parents[parent_num, :] = pop[max_fitness_idx, :]
-        fitness[max_fitness_idx] = -99999999999
-    return parents
-
-def crossover(parents, offspring_size):
-    offspring = numpy.empty(offspring_size)
-    # The point at which crossover takes place between two parents. Usually, it is at the center.
-    crossover_point = numpy.uint8(offspring_size[1]/2)
-
-    for k in range(offspring_size[0]):
-        # Index of the first parent to mate.
-        parent1_idx = k%parents.shape[0]
-        # Index of the second parent to mate.
-        parent2_idx = (k+1)%parents.shape[0]
-        # The new offspring will have its first half of its genes taken from the first parent.
-        offspring[k, 0:crossover_point] = parents[parent1_idx, 0:crossover_point]
-        # The new offspring will have its second half of its genes taken from the second parent.
-        offspring[k, crossover_point:] = parents[parent2_idx, crossover_point:]
-    return offspring
-
-def mutation(offspring_crossover, num_mutations=1):
-    mutations_counter = numpy.uint8(offspring_crossover.shape[1] / num_mutations)
-    # Mutation changes a number of genes as defined by the num_mutations argument. The changes are random.
-    for idx in range(offspring_crossover.shape[0]):
-        gene_idx = mutations_counter - 1
-        for mutation_num in range(num_mutations):
-            # The random value to be added to the gene.
-            random_value = numpy.random.uniform(-1.0, 1.0, 1)
-            offspring_crossover[idx, gene_idx] = offspring_crossover[idx, gene_idx] + random_value
-            gene_idx = gene_idx + mutations_counter
-    return offspring_crossover
-
-
-if __name__ == "__main__":
-    import numpy
-    """
-    The y=target is to maximize this equation ASAP:
-        y = w1x1+w2x2+w3x3+w4x4+w5x5+6wx6
-        where (x1,x2,x3,x4,x5,x6)=(4,-2,3.5,5,-11,-4.7)
-        What are the best values for the 6 weights w1 to w6?
-        We are going to use the genetic algorithm for the best possible values after a number of generations.
-    """
-
-    # Inputs of the equation.
-    equation_inputs = [4, -2, 3.5, 5, -11, -4.7]
-
-    # Number of the weights we are looking to optimize.
-    num_weights = len(equation_inputs)
-
-    """
-    Genetic algorithm parameters:
-        Mating pool size
-        Population size
-    """
-    sol_per_pop = 8
-    num_parents_mating = 4
-
-    # Defining the population size.
-    pop_size = (sol_per_pop,
-                num_weights)  # The population will have sol_per_pop chromosome where each chromosome has num_weights genes.
-    # Creating the initial population.
-    new_population = numpy.random.uniform(low=-4.0, high=4.0, size=pop_size)
-    print(new_population)
-
-    """
-    new_population[0, :] = [2.4,  0.7, 8, -2,   5,   1.1]
-    new_population[1, :] = [-0.4, 2.7, 5, -1,   7,   0.1]
-    new_population[2, :] = [-1,   2,   2, -3,   2,   0.9]
-    new_population[3, :] = [4,    7,   12, 6.1, 1.4, -4]
-    new_population[4, :] = [3.1,  4,   0,  2.4, 4.8,  0]
-    new_population[5, :] = [-2,   3,   -7, 6,   3,    3]
-    """
-
-    best_outputs = []
-    num_generations = 1000
-    for generation in range(num_generations):
-        print("Generation : ", generation)
-        # Measuring the fitness of each chromosome in the population.
-        fitness = cal_pop_fitness(equation_inputs, new_population)
-        print("Fitness")
-        print(fitness)
-
-        best_outputs.append(numpy.max(numpy.sum(new_population * equation_inputs, axis=1)))
-        # The best result in the current iteration.
-        print("Best result : ", numpy.max(numpy.sum(new_population * equation_inputs, axis=1)))
-
-        # Selecting the best parents in the population for mating.
-        parents = select_mating_pool(new_population, fitness,
-                                        num_parents_mating)
-        print("Parents")
-        print(parents)
-
-        # Generating next generation using crossover.
-        offspring_crossover = crossover(parents,
-                                           offspring_size=(pop_size[0] - parents.shape[0], num_weights))
-        print("Crossover")
-        print(offspring_crossover)
-
-        # Adding some variations to the offspring using mutation.
-        offspring_mutation = mutation(offspring_crossover, num_mutations=2)
-        print("Mutation")
-        print(offspring_mutation)
-
-        # Creating the new population based on the parents and offspring.
-        new_population[0:parents.shape[0], :] = parents
-        new_population[parents.shape[0]:, :] = offspring_mutation
-
-    # Getting the best solution after iterating finishing all generations.
-    # At first, the fitness is calculated for each solution in the final generation.
-    fitness = cal_pop_fitness(equation_inputs, new_population)
-    # Then return the index of that solution corresponding to the best fitness.
-    best_match_idx = numpy.where(fitness == numpy.max(fitness))
-
-    print("Best solution : ", new_population[best_match_idx, :])
-    print("Best solution fitness : ", fitness[best_match_idx])
-
-    import matplotlib.pyplot
-
-    matplotlib.pyplot.plot(best_outputs)
-    matplotlib.pyplot.xlabel("Iteration")
-    matplotlib.pyplot.ylabel("Fitness")
-    matplotlib.pyplot.show()
\ No newline at end of file
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.problem.problem import as_problem, _check_finite
+from src.problem.strategy import (get_cost, get_total_value, get_value, evaluate_solutions, _normalize_value_weights,
+                                  _choice_arrays, _greedy_cost_constraint, _repair_cost_constraint,
+                                  _repair_reliability_constraint, _to_choice, _to_selected)
+
+"""
+이 모듈은 유전 알고리즘(Genetic Algorithm, GA)으로 비용 제약 문제와 신뢰도 제약 문제의 근사해를 구합니다.
+
+개체군은 아이템별 선택지 인덱스를 담은 정수 배열 (population_size, num_item)입니다.
+선택지가 127개 이하이면 int8, 그렇지 않으면 int16을 사용하며, allow_zero_strategy인 경우 마지막 선택지가 "선택하지 않음"입니다.
+
+한 세대는 아래 순서로 진행됩니다.
+1. 토너먼트 선택으로 부모를 고릅니다.
+2. 균등 교차(uniform crossover)로 자식을 만듭니다.
+3. 유전자마다 mutation_rate의 확률로 다른 선택지로 바꿉니다(범주형 변이).
+4. 수선(repair) 연산으로 자식을 제약 안으로 고칩니다. 비용 제약 문제는 예산을 넘는 만큼 효율이 낮은 변경을 되돌린 뒤 남은 예산을 채우고,
+   신뢰도 제약 문제는 부족분을 채운 뒤 불필요한 비용을 줄입니다.
+5. 적합도는 evaluate_solutions로 개체군 전체를 한 번에 계산하며, 상위 num_elite개의 개체는 그대로 다음 세대로 넘어갑니다.
+
+num_islands가 2 이상이면 섬 모델(island model)을 사용합니다. 섬마다 독립된 개체군을 별도의 프로세스에서 진화시키고,
+migration_interval 세대마다 각 섬의 상위 개체를 고리 모양으로 다음 섬에 보내 가장 나쁜 개체를 대체합니다.
+"""
+
+# 섬 하나의 개체 수
+GA_POPULATION_SIZE = 64
+# 진화할 세대 수
+GA_NUM_GENERATIONS = 200
+# 토너먼트 선택에서 한 번에 비교하는 개체 수
+GA_TOURNAMENT_SIZE = 3
+# 다음 세대로 그대로 넘어가는 상위 개체 수
+GA_NUM_ELITE = 2
+# 부모 쌍이 교차할 확률. 교차하지 않는 경우 첫 번째 부모를 그대로 사용합니다.
+GA_CROSSOVER_RATE = 0.9
+# mutation_rate를 지정하지 않은 경우, 자식 하나당 변이하는 유전자 수의 기댓값
+GA_MUTATIONS_PER_CHILD = 2.0
+# 섬 모델에서 이주가 일어나는 세대 간격과 한 번에 이주하는 개체 수
+GA_MIGRATION_INTERVAL = 20
+GA_NUM_MIGRANTS = 2
+
+# 섬 모델의 작업 프로세스가 사용하는 문제 정보. _init_worker에서 한 번만 설정됩니다.
+_worker_context = None
+
+
+def _make_context(problem, choice_cost, choice_value, cost_constraint=None, value_weights=None,
+                  reliability_constraint=None, population_size=GA_POPULATION_SIZE, tournament_size=GA_TOURNAMENT_SIZE,
+                  num_elite=GA_NUM_ELITE, crossover_rate=GA_CROSSOVER_RATE, mutation_rate=None):
+    """
+    진화에 필요한 문제 정보와 파라미터를 딕셔너리로 묶습니다. 섬 모델에서는 이 딕셔너리를 작업 프로세스마다 한 번 전달합니다.
+    """
+    num_item, num_choice = choice_cost.shape
+    context = {
+        "problem": problem,
+        "choice_cost": choice_cost,
+        "choice_value": choice_value,
+        "cost_constraint": cost_constraint,
+        "value_weights": value_weights,
+        "reliability_constraint": reliability_constraint,
+        "population_size": population_size,
+        "tournament_size": tournament_size,
+        "num_elite": min(num_elite, population_size),
+        "crossover_rate": crossover_rate,
+        "mutation_rate": min(GA_MUTATIONS_PER_CHILD / num_item, 1.0) if mutation_rate is None else mutation_rate,
+        "dtype": np.int8 if num_choice <= np.iinfo(np.int8).max else np.int16,
+    }
+    if reliability_constraint is None:
+        context["choice_profit"] = choice_value @ value_weights
+    else:
+        scale = np.where(reliability_constraint != 0, np.abs(reliability_constraint), 1.0)
+        context["scale"] = scale
+        context["choice_norm"] = choice_value / scale
+        context["required_norm"] = reliability_constraint / scale
+        # 정규화된 부족분 1에 대한 적합도 페널티. 모든 아이템의 비용 변동 폭보다 크게 정하여 부족분이 있는 개체가 항상 더 나쁘도록 함
+        context["penalty"] = float((choice_cost.max(axis=1) - choice_cost.min(axis=1)).sum()) + 1.0
+    return context
+
+
+def _repair(context, individual):
+    """
+    개체 하나를 제약 안으로 고칩니다.
+    """
+    if context["reliability_constraint"] is None:
+        return _repair_cost_constraint(individual, context["choice_cost"], context["choice_profit"],
+                                       context["cost_constraint"])
+    return _repair_reliability_constraint(individual, context["choice_cost"], context["choice_norm"],
+                                          context["required_norm"])
+
+
+def _fitness(context, population):
+    """
+    개체군 전체의 적합도(최대화 대상)를 계산합니다.
+    비용 제약 문제는 가중 가치 합(예산 초과 시 evaluate_solutions의 페널티), 신뢰도 제약 문제는 -(총 비용 + 페널티 * 정규화된 부족분)입니다.
+
+    Returns:
+        (fitness, feasible): 적합도 (population_size,)와 제약 만족 여부 (population_size,)
+    """
+    problem = context["problem"]
+    solutions = np.where(population >= problem.num_strategy, -1, population)
+    if context["reliability_constraint"] is None:
+        result = evaluate_solutions(problem, solutions, value_weights=context["value_weights"],
+                                    cost_constraint=context["cost_constraint"])
+        return result["fitness"], result["cost"] <= context["cost_constraint"]
+
+    result = evaluate_solutions(problem, solutions, reliability_constraint=context["reliability_constraint"])
+    shortfall = (result["shortfall"] / context["scale"]).sum(axis=1)
+    return -(result["cost"] + context["penalty"] * shortfall), shortfall == 0
+
+
+def _tournament(rng, fitness, num_parents, tournament_size):
+    """
+    토너먼트 선택으로 부모 개체의 인덱스를 고릅니다.
+    """
+    candidates = rng.integers(len(fitness), size=(num_parents, tournament_size))
+    return candidates[np.arange(num_parents), fitness[candidates].argmax(axis=1)]
+
+
+def _crossover(rng, first, second, crossover_rate):
+    """
+    균등 교차로 자식을 만듭니다. 교차하지 않는 쌍은 첫 번째 부모를 그대로 사용합니다.
+    """
+    mask = rng.random(first.shape) < 0.5
+    mask[rng.random(len(first)) >= crossover_rate] = True
+    return np.where(mask, first, second)
+
+
+def _mutate(rng, children, num_choice, mutation_rate):
+    """
+    유전자마다 mutation_rate의 확률로 현재와 다른 임의의 선택지로 바꿉니다.
+    """
+    if num_choice < 2:
+        return children
+    mask = rng.random(children.shape) < mutation_rate
+    offsets = rng.integers(1, num_choice, size=int(np.count_nonzero(mask)))
+    children[mask] = (children[mask] + offsets) % num_choice
+    return children
+
+
+def _initial_population(context, rng, initial):
+    """
+    초기 개체군을 만듭니다. 첫 번째 개체는 initial이고, 나머지는 임의의 선택지를 수선한 개체입니다.
+    """
+    num_item, num_choice = context["choice_cost"].shape
+    population = np.empty((context["population_size"], num_item), dtype=context["dtype"])
+    population[0] = initial
+    for k in range(1, len(population)):
+        population[k] = _repair(context, rng.integers(num_choice, size=num_item))
+    return population
+
+
+def _evolve(context, population, fitness, rng, num_generations, deadline=None):
+    """
+    개체군을 num_generations 세대 동안 진화시킵니다. deadline(time.time() 기준)이 지나면 중단합니다.
+
+    Returns:
+        (population, fitness, rng, generations): 진화한 개체군, 적합도, 난수 생성기, 실제로 진행한 세대 수
+    """
+    num_choice = context["choice_cost"].shape[1]
+    population_size = len(population)
+    num_elite = context["num_elite"]
+    num_children = population_size - num_elite
+
+    generations = 0
+    for _ in range(num_generations):
+        if deadline is not None and time.time() >= deadline:
+            break
+
+        first = population[_tournament(rng, fitness, num_children, context["tournament_size"])]
+        second = population[_tournament(rng, fitness, num_children, context["tournament_size"])]
+        children = _crossover(rng, first, second, context["crossover_rate"])
+        children = _mutate(rng, children, num_choice, context["mutation_rate"])
+        for k in range(num_children):
+            children[k] = _repair(context, children[k])
+
+        elite = np.argsort(-fitness, kind="stable")[:num_elite]
+        population = np.concatenate([population[elite], children])
+        fitness = np.concatenate([fitness[elite], _fitness(context, children)[0]])
+        generations += 1
+
+    return population, fitness, rng, generations
+
+
+def _init_worker(context):
+    """
+    섬 모델 작업 프로세스의 초기화 함수입니다. 문제 정보를 프로세스 전역 변수에 저장합니다.
+    """
+    global _worker_context
+    _worker_context = context
+
+
+def _evolve_worker(population, fitness, rng, num_generations, deadline):
+    """
+    작업 프로세스에서 _evolve를 실행합니다.
+    """
+    return _evolve(_worker_context, population, fitness, rng, num_generations, deadline)
+
+
+def _migrate(islands, num_migrants):
+    """
+    각 섬의 상위 num_migrants개 개체로 다음 섬(고리 모양)의 가장 나쁜 개체를 대체합니다.
+
+    Args:
+        islands: (population, fitness) 리스트
+    """
+    migrants = []
+    for population, fitness in islands:
+        best = np.argsort(-fitness, kind="stable")[:num_migrants]
+        migrants.append((population[best].copy(), fitness[best].copy()))
+
+    for i, (population, fitness) in enumerate(islands):
+        incoming, incoming_fitness = migrants[i - 1]
+        worst = np.argsort(fitness, kind="stable")[:len(incoming)]
+        population[worst] = incoming
+        fitness[worst] = incoming_fitness
+
+
+def _run(context, initial, num_generations=GA_NUM_GENERATIONS, num_islands=1, num_workers=None,
+         migration_interval=GA_MIGRATION_INTERVAL, num_migrants=GA_NUM_MIGRANTS, time_limit=None, seed=None,
+         stats=None):
+    """
+    유전 알고리즘을 실행하고, 모든 섬에서 찾은 가장 좋은 실행 가능한 개체를 반환합니다.
+
+    Returns:
+        np.ndarray: 가장 좋은 개체의 선택지 인덱스 (num_item,), 실행 가능한 개체를 찾지 못한 경우 None
+    """
+    time_start = time.time()
+    deadline = None if time_limit is None else time_start + time_limit
+
+    rngs = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(num_islands)]
+    islands = []
+    for rng in rngs:
+        population = _initial_population(context, rng, initial)
+        islands.append((population, _fitness(context, population)[0]))
+
+    # 섬이 하나인 경우 이주 없이 한 번에 진화
+    interval = migration_interval if num_islands > 1 else num_generations
+    executor = None
+    if num_islands > 1:
+        num_workers = min(num_islands, os.cpu_count() or 1) if num_workers is None else num_workers
+        executor = ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(context,))
+
+    generation = 0
+    try:
+        while generation < num_generations and (deadline is None or time.time() < deadline):
+            epoch = min(interval, num_generations - generation)
+            if executor is None:
+                results = [_evolve(context, population, fitness, rng, epoch, deadline)
+                           for (population, fitness), rng in zip(islands, rngs)]
+            else:
+                futures = [executor.submit(_evolve_worker, population, fitness, rng, epoch, deadline)
+                           for (population, fitness), rng in zip(islands, rngs)]
+                results = [future.result() for future in futures]
+
+            islands = [(population, fitness) for population, fitness, _, _ in results]
+            rngs = [rng for _, _, rng, _ in results]
+            evolved = max(generations for _, _, _, generations in results)
+            generation += evolved
+            if evolved < epoch:
+                break
+            if num_islands > 1:
+                _migrate(islands, num_migrants)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    population = np.concatenate([population for population, _ in islands])
+    fitness, feasible = _fitness(context, population)
+    fitness = np.where(feasible, fitness, -np.inf)
+    best = int(np.argmax(fitness))
+
+    if stats is not None:
+        stats.update(generations=generation,
+                     num_islands=num_islands,
+                     best_fitness=float(fitness[best]),
+                     solve_time=time.time() - time_start)
+
+    if not feasible[best]:
+        return None
+    return population[best].astype(np.int64)
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False,
+                          population_size=GA_POPULATION_SIZE, num_generations=GA_NUM_GENERATIONS, mutation_rate=None,
+                          num_islands=1, num_workers=None, migration_interval=GA_MIGRATION_INTERVAL,
+                          time_limit=None, initial_solution=None, seed=None, stats=None):
+    """
+    유전 알고리즘을 사용하여 비용 제약 문제의 근사해를 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        population_size: 섬 하나의 개체 수
+        num_generations: 진화할 세대 수
+        mutation_rate: 유전자 하나가 변이할 확률. None인 경우 자식 하나당 평균 2개의 유전자가 변이하도록 정합니다.
+        num_islands: 섬의 수. 2 이상인 경우 섬마다 별도의 프로세스에서 진화합니다.
+        num_workers: 섬 모델에서 사용할 프로세스 수. None인 경우 min(num_islands, CPU 수)
+        migration_interval: 섬 모델에서 이주가 일어나는 세대 간격
+        time_limit: 최대 실행 시간(초)
+        initial_solution: 초기 개체군에 포함할 해(전략 인덱스 리스트). None인 경우 탐욕 해를 사용합니다.
+        seed: 난수 시드
+        stats: 주어진 경우 풀이 정보("generations", "best_fitness", "solve_time" 등)를 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+
+    Raises:
+        ValueError: 실행 가능한 해가 없을 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    context = _make_context(problem, choice_cost, choice_value, cost_constraint=cost_constraint,
+                            value_weights=np.asarray(value_weights), population_size=population_size,
+                            mutation_rate=mutation_rate)
+
+    initial, _ = _greedy_cost_constraint(choice_cost, context["choice_profit"], cost_constraint)
+    if initial_solution is not None:
+        initial = _repair(context, _to_choice(initial_solution, *choice_cost.shape, problem.num_strategy))
+
+    best = _run(context, initial, num_generations=num_generations, num_islands=num_islands, num_workers=num_workers,
+                migration_interval=migration_interval, time_limit=time_limit, seed=seed, stats=stats)
+
+    elapsed_time = time.time() - time_start
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
+
+
+def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False,
+                                 population_size=GA_POPULATION_SIZE, num_generations=GA_NUM_GENERATIONS,
+                                 mutation_rate=None, num_islands=1, num_workers=None,
+                                 migration_interval=GA_MIGRATION_INTERVAL, time_limit=None, initial_solution=None,
+                                 seed=None, stats=None):
+    """
+    유전 알고리즘을 사용하여 신뢰도 제약 문제의 근사해를 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        reliability_constraint: 각 가치 차원별 최소 요구 신뢰도
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        population_size: 섬 하나의 개체 수
+        num_generations: 진화할 세대 수
+        mutation_rate: 유전자 하나가 변이할 확률. None인 경우 자식 하나당 평균 2개의 유전자가 변이하도록 정합니다.
+        num_islands: 섬의 수. 2 이상인 경우 섬마다 별도의 프로세스에서 진화합니다.
+        num_workers: 섬 모델에서 사용할 프로세스 수. None인 경우 min(num_islands, CPU 수)
+        migration_interval: 섬 모델에서 이주가 일어나는 세대 간격
+        time_limit: 최대 실행 시간(초)
+        initial_solution: 초기 개체군에 포함할 해(전략 인덱스 리스트). None인 경우 탐욕 해를 사용합니다.
+        seed: 난수 시드
+        stats: 주어진 경우 풀이 정보("generations", "best_fitness", "solve_time" 등)를 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간
+
+    Raises:
+        ValueError: 신뢰도 제약 길이가 가치 차원과 일치하지 않거나, 실행 가능한 해를 찾지 못한 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    if len(reliability_constraint) != problem.value_dim:
+        raise ValueError(
+            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {problem.value_dim}")
+
+    time_start = time.time()
+
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    context = _make_context(problem, choice_cost, choice_value,
+                            reliability_constraint=np.asarray(reliability_constraint, dtype=np.float64),
+                            population_size=population_size, mutation_rate=mutation_rate)
+
+    # 가장 싼 선택지에서 시작하는 탐욕 해
+    initial = choice_cost.argmin(axis=1)
+    if initial_solution is not None:
+        initial = _to_choice(initial_solution, *choice_cost.shape, problem.num_strategy)
+    initial = _repair(context, initial)
+
+    best = _run(context, initial, num_generations=num_generations, num_islands=num_islands, num_workers=num_workers,
+                migration_interval=migration_interval, time_limit=time_limit, seed=seed, stats=stats)
+    if best is None:
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+
+    elapsed_time = time.time() - time_start
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_value(values, selected), elapsed_time
@@ -0,0 +1,88 @@
+import json
+import queue
+import threading
+
+import numpy as np
+
+"""
+이 모듈은 on_solution 인자를 받는 solver(CP-SAT)가 풀이 도중에 찾는 해(incumbent)를 받아 쓰는 방법을 제공합니다.
+
+solver는 더 좋은 해를 찾을 때마다 on_solution에 다음 딕셔너리를 전달합니다.
+
+    {"objective": 목적 함수 값, "bound": 목적 함수의 한계, "gap": 상대 차이, "elapsed_time": 풀이 시작부터의 시간, "selected": 선택된 전략}
+
+1. jsonl_sink: 해마다 JSON 한 줄을 파일에 추가합니다. 풀이가 오래 걸려도 다른 프로그램에서 파일을 읽어 진행 상황을 볼 수 있습니다.
+2. stream_incumbents: 풀이를 별도의 스레드에서 실행하고 해를 generator로 차례로 반환합니다.
+   generator를 닫으면(for 문을 break 등) 탐색을 멈추므로, 호출하는 쪽에서 원하는 시점에 그때까지의 가장 좋은 해를 사용할 수 있습니다.
+3. Qt에서는 Signal의 emit을 on_solution으로 그대로 전달하면 됩니다. 풀이는 GUI 스레드가 아닌 작업 스레드에서 실행해야 합니다.
+"""
+
+
+def _to_json(incumbent):
+    """
+    해 딕셔너리를 JSON으로 변환할 수 있도록 numpy 배열을 리스트로 바꿉니다.
+    """
+    return {key: value.tolist() if isinstance(value, np.ndarray) else value for key, value in incumbent.items()}
+
+
+def jsonl_sink(file_path):
+    """
+    해를 찾을 때마다 JSON 한 줄을 file_path에 추가하는 on_solution 함수를 만듭니다. 파일의 기존 내용은 지웁니다.
+    해마다 파일을 열고 닫으므로 풀이가 중간에 멈추어도 그때까지의 해는 파일에 남습니다.
+
+    Args:
+        file_path: JSONL 파일 경로
+
+    Returns:
+        callable: solver의 on_solution에 전달할 함수
+    """
+    open(file_path, 'w', encoding='utf-8').close()
+
+    def on_solution(incumbent):
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(_to_json(incumbent), ensure_ascii=False) + "\n")
+
+    return on_solution
+
+
+def stream_incumbents(solve_function, *args, **kwargs):
+    """
+    solve_function을 별도의 스레드에서 실행하고, 더 좋은 해를 찾을 때마다 해 딕셔너리를 반환합니다.
+    generator를 닫으면 탐색을 멈추고 풀이 스레드가 끝날 때까지 기다립니다.
+
+    Args:
+        solve_function: on_solution과 stop_event 인자를 받는 함수 (예: cpsat.solve_cost_constraint)
+        *args: solve_function에 전달할 인자
+        **kwargs: solve_function에 전달할 키워드 인자
+
+    Yields:
+        dict: 해 딕셔너리. 마지막 해가 solve_function이 반환하는 해입니다.
+
+    Raises:
+        ValueError: solve_function이 예외를 발생시킨 경우(실행 가능한 해가 없는 경우 등) 그 예외
+    """
+    incumbents = queue.Queue()
+    stop_event = threading.Event()
+    # 풀이 스레드의 예외. 리스트에 담아 generator로 전달
+    errors = []
+    done = object()
+
+    def solve():
+        try:
+            solve_function(*args, on_solution=incumbents.put, stop_event=stop_event, **kwargs)
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            incumbents.put(done)
+
+    thread = threading.Thread(target=solve, daemon=True)
+    thread.start()
+    try:
+        while (incumbent := incumbents.get()) is not done:
+            yield incumbent
+    finally:
+        stop_event.set()
+        thread.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,397 @@
+import time
+
+import numpy as np
+
+from src.problem.problem import as_problem, _check_finite
+from src.problem.strategy import (get_cost, get_total_value, get_value, _normalize_value_weights, _choice_arrays,
+                                  _repair_cost_constraint, _repair_reliability_constraint, _to_selected)
+
+"""
+이 모듈은 라그랑주 완화(Lagrangian relaxation)로 아이템 수가 매우 많은 비용 제약 문제의 근사해와 상한을 구합니다.
+
+예산 제약을 승수 λ(예산 1당 가치)로 목적 함수에 옮기면, 문제는 아이템별로 독립된 문제로 나뉩니다.
+
+    L(λ) = λ * 예산 + Σ_i max_j (가치_ij - λ * 비용_ij)
+
+각 아이템의 최적 선택은 (num_item, num_choice) 배열의 argmax 한 번으로 구하며, 모델을 만들지 않으므로 메모리는 문제 배열 크기 정도만 사용합니다.
+λ가 커질수록 선택의 총 비용은 줄어드므로, 총 비용이 예산과 만나는 λ를 이분 탐색으로 찾습니다.
+모든 λ >= 0에 대해 L(λ)는 최적값의 상한(쌍대 상한)이며, 탐색 중 가장 작은 L(λ)를 상한으로 보고합니다.
+
+이분 탐색이 끝나면 예산 안의 해에는 남은 예산으로 효율이 높은 변경을 적용하고(polish),
+예산을 넘는 해는 효율이 낮은 변경을 되돌려 예산 안으로 고친 뒤(repair) 같은 방법으로 채워, 둘 중 좋은 해를 반환합니다.
+
+신뢰도 제약 문제는 가치 차원마다 제약이 있으므로 차원별 승수 μ_k로 모든 제약을 완화합니다.
+
+    L(μ) = Σ_k μ_k * 요구 신뢰도_k + Σ_i min_j (비용_ij - Σ_k μ_k * 가치_ijk)
+
+가치는 차원마다 크기가 크게 다르므로 요구 신뢰도의 크기로 나누어 정규화한 뒤 사용합니다.
+L(μ)는 최소 비용의 하한이며, 부분 기울기법(subgradient method)으로 L(μ)를 키우는 μ를 찾습니다.
+일정 간격마다 완화 문제의 해를 src.problem.strategy의 _repair_reliability_constraint로 제약 안으로 고쳐(repair) 실행 가능한 해를 얻고, 가장 싼 해를 반환합니다.
+repair는 모든 차원의 부족분 합을 1 줄이는 비용이 가장 싼 변경부터 적용하며,
+고친 해는 남는 신뢰도 안에서 비용을 줄이는 변경을 더 적용할 수 없을 때까지 반복해서 적용(polish)한 뒤 비교합니다.
+"""
+
+# 이분 탐색의 최대 반복 횟수
+LAGRANGIAN_MAX_ITERATIONS = 100
+# 이분 탐색 구간의 상대 너비가 이 값보다 작아지면 멈춤
+LAGRANGIAN_TOLERANCE = 1e-7
+# 남은 예산을 채우는 변경을 반복 적용하는 최대 횟수
+LAGRANGIAN_POLISH_ROUNDS = 10
+# 신뢰도 제약 문제의 부분 기울기법 최대 반복 횟수
+LAGRANGIAN_SUBGRADIENT_ITERATIONS = 300
+# 부분 기울기법의 초기 보폭 계수와, 하한이 개선되지 않을 때 보폭 계수를 절반으로 줄이는 반복 횟수
+LAGRANGIAN_STEP_SCALE = 2.0
+LAGRANGIAN_STEP_PATIENCE = 10
+# 보폭 계수가 이 값보다 작아지면 멈춤
+LAGRANGIAN_MIN_STEP_SCALE = 1e-4
+# 완화 문제의 해를 제약 안으로 고쳐 실행 가능한 해를 갱신하는 반복 간격
+LAGRANGIAN_REPAIR_INTERVAL = 10
+# 가장 싼 해의 비용과 하한의 상대 차이가 이 값보다 작아지면 멈춤
+LAGRANGIAN_GAP_TOLERANCE = 1e-4
+# 정규화된 요구 신뢰도 대비 허용하는 부족분. 정규화(나눗셈)의 부동소수점 오차로 요구 신뢰도를 정확히 채운 해를 버리지 않도록 함
+LAGRANGIAN_FEASIBILITY_TOLERANCE = 1e-9
+
+
+def _relaxed(choice_cost, choice_profit, multiplier, out=None):
+    """
+    승수가 multiplier일 때 아이템별 최적 선택과 L(multiplier)를 구합니다.
+
+    Args:
+        out: 주어진 경우 (num_item, num_choice) 크기의 계산용 배열로 재사용
+
+    Returns:
+        (selected, cost, dual): 선택지 인덱스 (num_item,), 선택의 총 비용, L(multiplier)
+    """
+    reduced = np.multiply(choice_cost, -multiplier, out=out)
+    reduced += choice_profit
+    selected = reduced.argmax(axis=1)
+    chosen = selected[:, np.newaxis]
+    return (selected, float(np.take_along_axis(choice_cost, chosen, axis=1).sum()),
+            float(np.take_along_axis(reduced, chosen, axis=1).sum()))
+
+
+def search_multiplier(choice_cost, choice_profit, cost_constraint, max_iterations=LAGRANGIAN_MAX_ITERATIONS,
+                       tolerance=LAGRANGIAN_TOLERANCE):
+    """
+    총 비용이 예산과 만나는 승수를 이분 탐색으로 찾습니다.
+
+    Returns:
+        (feasible, infeasible, multiplier, upper_bound, iterations):
+        예산 안의 해, 예산을 넘는 해(없으면 None), 예산 안의 해를 만든 승수, 가장 작은 쌍대 상한, 반복 횟수
+    """
+    buffer = np.empty_like(choice_cost)
+    selected, cost, dual = _relaxed(choice_cost, choice_profit, 0.0, buffer)
+    if cost <= cost_constraint:
+        # 예산 제약이 없어도 예산 안이면 그대로 최적해
+        return selected, None, 0.0, dual, 0
+
+    lower, infeasible = 0.0, selected
+    upper_bound = dual
+    iterations = 0
+
+    # 예산 안의 해가 나올 때까지 승수를 두 배씩 키움
+    upper = 1.0
+    while True:
+        iterations += 1
+        feasible, cost, dual = _relaxed(choice_cost, choice_profit, upper, buffer)
+        upper_bound = min(upper_bound, upper * cost_constraint + dual)
+        if cost <= cost_constraint:
+            break
+        lower, infeasible = upper, feasible
+        upper *= 2.0
+
+    while iterations < max_iterations and upper - lower > tolerance * upper:
+        iterations += 1
+        middle = (lower + upper) / 2
+        selected, cost, dual = _relaxed(choice_cost, choice_profit, middle, buffer)
+        upper_bound = min(upper_bound, middle * cost_constraint + dual)
+        if cost <= cost_constraint:
+            upper, feasible = middle, selected
+        else:
+            lower, infeasible = middle, selected
+
+    return feasible, infeasible, upper, upper_bound, iterations
+
+
+def polish(selected, choice_cost, choice_profit, cost_constraint, rounds=LAGRANGIAN_POLISH_ROUNDS):
+    """
+    남은 예산 안에 들어가는 변경 중 아이템별로 비용 대비 이익 증가율이 가장 큰 것을 증가율 순서대로 적용합니다.
+    남은 예산이 줄어들면 들어가는 변경도 바뀌므로, 더 적용할 변경이 없을 때까지 반복합니다.
+    """
+    rows = np.arange(len(selected))
+    selected = selected.copy()
+    for _ in range(rounds):
+        slack = cost_constraint - choice_cost[rows, selected].sum()
+        extra_cost = choice_cost - choice_cost[rows, selected][:, None]
+        extra_profit = choice_profit - choice_profit[rows, selected][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where((extra_cost > 0) & (extra_cost <= slack) & (extra_profit > 0),
+                             extra_profit / extra_cost, -np.inf)
+        upgrade = ratio.argmax(axis=1)
+        upgrade_ratio = ratio[rows, upgrade]
+
+        order = np.argsort(-upgrade_ratio, kind="stable")
+        order = order[np.isfinite(upgrade_ratio[order])]
+        if len(order) == 0:
+            break
+        fit = order[np.cumsum(extra_cost[order, upgrade[order]]) <= slack]
+        selected[fit] = upgrade[fit]
+    return selected
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False,
+                          max_iterations=LAGRANGIAN_MAX_ITERATIONS, stats=None):
+    """
+    라그랑주 완화를 사용하여 비용 제약 문제의 근사해와 쌍대 상한을 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        max_iterations: 승수 탐색의 최대 반복 횟수
+        stats: 주어진 경우 승수("multiplier"), 쌍대 상한("upper_bound"), 해의 가중 가치("lower_bound"),
+            상한 대비 차이 비율("gap"), 반복 횟수("iterations"), 풀이 시간("solve_time")을 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+
+    Raises:
+        ValueError: 실행 가능한 해가 없을 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    choice_profit = choice_value @ np.asarray(value_weights)
+
+    if choice_cost.min(axis=1).sum() > cost_constraint:
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+
+    feasible, infeasible, multiplier, upper_bound, iterations = search_multiplier(
+        choice_cost, choice_profit, cost_constraint, max_iterations=max_iterations)
+
+    rows = np.arange(len(feasible))
+    candidates = [polish(feasible, choice_cost, choice_profit, cost_constraint)]
+    if infeasible is not None:
+        repaired = _repair_cost_constraint(infeasible, choice_cost, choice_profit, cost_constraint)
+        candidates.append(polish(repaired, choice_cost, choice_profit, cost_constraint))
+    candidates = [candidate for candidate in candidates if choice_cost[rows, candidate].sum() <= cost_constraint]
+    best = max(candidates, key=lambda candidate: choice_profit[rows, candidate].sum())
+
+    elapsed_time = time.time() - time_start
+
+    lower_bound = float(choice_profit[rows, best].sum())
+    upper_bound = max(upper_bound, lower_bound)
+    gap = (upper_bound - lower_bound) / abs(upper_bound) if upper_bound != 0 else 0.0
+    print(f"쌍대 상한: {upper_bound}, 상한 대비 차이: {gap:.4%}, 승수: {multiplier}, 반복 횟수: {iterations}")
+
+    if stats is not None:
+        stats.update(multiplier=multiplier, upper_bound=upper_bound, lower_bound=lower_bound, gap=gap,
+                     iterations=iterations, solve_time=elapsed_time)
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
+
+
+def _relaxed_reliability(choice_cost, choice_value, reliability_constraint, multipliers, out=None):
+    """
+    승수가 multipliers일 때 신뢰도 제약 문제의 아이템별 최적 선택과 L(multipliers)를 구합니다.
+
+    Args:
+        choice_value: 정규화된 가치 배열 (num_item, num_choice, value_dim)
+        reliability_constraint: 정규화된 요구 신뢰도 (value_dim,)
+        out: 주어진 경우 (num_item, num_choice) 크기의 계산용 배열로 재사용
+
+    Returns:
+        (selected, value, dual): 선택지 인덱스 (num_item,), 선택의 차원별 총 가치 (value_dim,), L(multipliers)
+    """
+    reduced = np.matmul(choice_value, -multipliers, out=out)
+    reduced += choice_cost
+    selected = reduced.argmin(axis=1)
+    chosen = selected[:, np.newaxis]
+    value = np.take_along_axis(choice_value, chosen[:, :, np.newaxis], axis=1)[:, 0, :].sum(axis=0)
+    dual = float(np.take_along_axis(reduced, chosen, axis=1).sum() + multipliers @ reliability_constraint)
+    return selected, value, dual
+
+
+def _polish_reliability(selected, choice_cost, choice_value, reliability_constraint,
+                        rounds=LAGRANGIAN_POLISH_ROUNDS):
+    """
+    신뢰도 제약을 만족하는 해에서, 여유분 안에 들어가는 변경 중 아이템별로 가치 감소 대비 비용 절감이 가장 큰 것을 그 순서대로 적용합니다.
+    여유분이 줄어들면 들어가는 변경도 바뀌므로, 더 적용할 변경이 없을 때까지 반복합니다.
+
+    Args:
+        choice_value: 정규화된 가치 배열 (num_item, num_choice, value_dim)
+        reliability_constraint: 정규화된 요구 신뢰도 (value_dim,)
+    """
+    rows = np.arange(len(selected))
+    selected = selected.copy()
+    for _ in range(rounds):
+        surplus = choice_value[rows, selected].sum(axis=0) - reliability_constraint
+        loss = choice_value[rows, selected][:, None, :] - choice_value
+        saving = choice_cost[rows, selected][:, None] - choice_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where((saving > 0) & (loss <= surplus).all(axis=2),
+                             saving / np.maximum(loss, 0.0).sum(axis=2), -np.inf)
+        downgrade = ratio.argmax(axis=1)
+        downgrade_ratio = ratio[rows, downgrade]
+
+        order = np.argsort(-downgrade_ratio, kind="stable")
+        order = order[downgrade_ratio[order] > -np.inf]
+        if len(order) == 0:
+            break
+        # 누적 가치 감소가 어느 차원에서든 여유분을 넘기 전까지 적용. 첫 변경은 혼자서 여유분 안에 들어감
+        exceeded = (np.cumsum(loss[order, downgrade[order]], axis=0) > surplus).any(axis=1)
+        if exceeded.any():
+            order = order[:max(int(np.argmax(exceeded)), 1)]
+        selected[order] = downgrade[order]
+    return selected
+
+
+def _subgradient(choice_cost, choice_value, reliability_constraint, max_iterations=LAGRANGIAN_SUBGRADIENT_ITERATIONS):
+    """
+    부분 기울기법으로 신뢰도 제약 문제의 라그랑주 하한을 키우고, 그 과정에서 찾은 가장 싼 실행 가능한 해를 반환합니다.
+    실행 가능한 해를 찾기 전에는 매 반복 repair를 시도하고, Polyak 보폭의 목표로 모든 해의 비용 상한(아이템별 최대 비용의 합)보다 큰 값을 사용합니다.
+    repair가 실패해도 승수를 계속 바꾸며, 끝까지 실패하면 아이템별로 정규화된 가치의 합이 가장 큰 선택에서 한 번 더 repair합니다.
+
+    Args:
+        choice_value: 정규화된 가치 배열 (num_item, num_choice, value_dim)
+        reliability_constraint: 정규화된 요구 신뢰도 (value_dim,)
+
+    Returns:
+        (best, lower_bound, multipliers, iterations): 가장 싼 실행 가능한 해(없으면 None), 가장 큰 하한, 그 하한의 승수, 반복 횟수.
+        best가 None이고 하한이 아이템별 최대 비용의 합보다 크면 제약을 만족할 수 없는 문제입니다.
+    """
+    rows = np.arange(choice_cost.shape[0])
+    buffer = np.empty_like(choice_cost)
+
+    best, upper_bound = None, np.inf
+
+    def update_best(selected):
+        nonlocal best, upper_bound
+        selected = _repair_reliability_constraint(selected, choice_cost, choice_value, reliability_constraint)
+        if (choice_value[rows, selected].sum(axis=0) < reliability_constraint - LAGRANGIAN_FEASIBILITY_TOLERANCE).any():
+            return
+        selected = _polish_reliability(selected, choice_cost, choice_value, reliability_constraint)
+        cost = float(choice_cost[rows, selected].sum())
+        if cost < upper_bound:
+            best, upper_bound = selected, cost
+
+    # 어떤 실행 가능한 해의 비용도 이 값을 넘지 않음
+    cost_ceiling = float(choice_cost.max(axis=1).sum())
+    multipliers = np.zeros(len(reliability_constraint))
+    best_multipliers = multipliers
+    lower_bound = -np.inf
+    step_scale = LAGRANGIAN_STEP_SCALE
+    stalled = 0
+
+    iterations = 0
+    while iterations < max_iterations and step_scale >= LAGRANGIAN_MIN_STEP_SCALE:
+        selected, value, dual = _relaxed_reliability(choice_cost, choice_value, reliability_constraint, multipliers,
+                                                     buffer)
+        if dual > lower_bound:
+            lower_bound, best_multipliers, stalled = dual, multipliers, 0
+        else:
+            stalled += 1
+            if stalled >= LAGRANGIAN_STEP_PATIENCE:
+                step_scale, stalled = step_scale / 2, 0
+
+        if best is None or iterations % LAGRANGIAN_REPAIR_INTERVAL == 0:
+            update_best(selected)
+        iterations += 1
+        if lower_bound > cost_ceiling:
+            # 하한이 모든 해의 비용 상한보다 크면 제약을 만족할 수 없는 문제
+            break
+
+        subgradient = reliability_constraint - value
+        if best is not None and upper_bound - lower_bound <= LAGRANGIAN_GAP_TOLERANCE * abs(upper_bound):
+            break
+        norm = subgradient @ subgradient
+        if norm == 0:
+            break
+        # Polyak 보폭: 현재 하한과 가장 싼 해의 비용 차이에 비례.
+        # 해를 찾기 전에는 하한이 모든 해의 비용 상한을 넘어 불가능을 보일 수 있도록 상한보다 큰 값을 목표로 함
+        target = upper_bound if best is not None else 2 * cost_ceiling + 1
+        multipliers = np.maximum(multipliers + step_scale * (target - dual) / norm * subgradient, 0.0)
+
+    selected, _, _ = _relaxed_reliability(choice_cost, choice_value, reliability_constraint, best_multipliers, buffer)
+    update_best(selected)
+    if best is None and lower_bound <= cost_ceiling:
+        update_best(choice_value.sum(axis=2).argmax(axis=1))
+
+    return best, lower_bound, best_multipliers, iterations
+
+
+def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False,
+                                 max_iterations=LAGRANGIAN_SUBGRADIENT_ITERATIONS, stats=None):
+    """
+    라그랑주 완화를 사용하여 신뢰도 제약 문제의 근사해와 최소 비용의 하한을 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        reliability_constraint: 각 가치 차원별 최소 요구 신뢰도
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        max_iterations: 부분 기울기법의 최대 반복 횟수
+        stats: 주어진 경우 차원별 승수("multiplier"), 라그랑주 하한("lower_bound"), 해의 총 비용("upper_bound"),
+            하한 대비 차이 비율("gap"), 반복 횟수("iterations"), 풀이 시간("solve_time")을 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간
+
+    Raises:
+        ValueError: 신뢰도 제약 길이가 가치 차원과 일치하지 않거나, 제약을 만족하는 해가 없거나(차원별 최대 가치의 합 또는
+            라그랑주 하한으로 확인), 실행 가능한 해를 찾지 못한 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    if len(reliability_constraint) != problem.value_dim:
+        raise ValueError(
+            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {problem.value_dim}")
+
+    time_start = time.time()
+
+    reliability_constraint = np.asarray(reliability_constraint, dtype=np.float64)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+
+    # 요구 신뢰도의 크기로 정규화
+    scale = np.where(reliability_constraint != 0, np.abs(reliability_constraint), 1.0)
+    choice_norm, required_norm = choice_value / scale, reliability_constraint / scale
+    # 차원마다 아이템별 최대 가치를 모두 더해도 요구 신뢰도에 못 미치면 제약을 만족할 수 없는 문제
+    if (choice_norm.max(axis=1).sum(axis=0) < required_norm - LAGRANGIAN_FEASIBILITY_TOLERANCE).any():
+        print("신뢰도 제약을 만족하는 해가 없습니다.")
+        raise ValueError("No feasible solution exists.")
+
+    best, lower_bound, multipliers, iterations = _subgradient(choice_cost, choice_norm, required_norm,
+                                                              max_iterations=max_iterations)
+    if best is None:
+        if lower_bound > choice_cost.max(axis=1).sum():
+            print("신뢰도 제약을 만족하는 해가 없습니다.")
+            raise ValueError("No feasible solution exists.")
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+
+    elapsed_time = time.time() - time_start
+
+    upper_bound = float(choice_cost[np.arange(len(best)), best].sum())
+    lower_bound = min(lower_bound, upper_bound)
+    gap = (upper_bound - lower_bound) / abs(upper_bound) if upper_bound != 0 else 0.0
+    print(f"라그랑주 하한: {lower_bound}, 하한 대비 차이: {gap:.4%}, 반복 횟수: {iterations}")
+
+    if stats is not None:
+        stats.update(multiplier=(multipliers / scale).tolist(), lower_bound=lower_bound, upper_bound=upper_bound,
+                     gap=gap, iterations=iterations, solve_time=elapsed_time)
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_value(values, selected), elapsed_time
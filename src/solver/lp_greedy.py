@@ -0,0 +1,163 @@
+import time
+
+import numpy as np
+
+from src.problem.problem import as_problem, _check_finite
+from src.problem.strategy import get_cost, get_total_value, _normalize_value_weights, _choice_arrays, _to_selected
+
+"""
+이 모듈은 다중 선택 배낭 문제(MCKP)의 LP 완화를 이용한 탐욕 알고리즘으로 비용 제약 문제의 근사해와 상한을 구합니다.
+
+1. 아이템마다 (비용, 가중 가치) 점의 위쪽 볼록 껍질(upper convex hull)을 구합니다.
+   껍질 아래의 전략은 LP 완화 문제의 최적해에 쓰이지 않습니다.
+2. 모든 아이템은 껍질의 가장 싼 꼭짓점에서 시작합니다.
+3. 껍질의 이웃한 꼭짓점으로 옮겨가는 변경(증분)을 비용 1당 가치 증가량(효율)의 내림차순으로 정렬합니다.
+   볼록 껍질이므로 한 아이템의 증분은 항상 순서대로 나옵니다.
+4. 예산이 허락하는 만큼 증분을 적용합니다. 처음으로 예산에 들어가지 못한 증분을 비율만큼 적용한 값이 LP 완화 문제의 최적값, 즉 상한입니다.
+5. 정수 해는 그 증분을 적용하지 않고, 이후의 증분 중 예산에 들어가는 것을 차례로 적용해 남은 예산을 채웁니다.
+
+정렬이 대부분이므로 O(n log n)에 풀리며, 최적해를 보장하지 않는 대신 상한과의 차이(gap)로 해의 품질을 알려줍니다.
+신뢰도 제약 문제는 지원하지 않습니다.
+"""
+
+
+def _upper_hull(choice_cost, choice_profit):
+    """
+    아이템별 (비용, 이익) 점의 위쪽 볼록 껍질을 구합니다. 모든 아이템을 배열 연산으로 한 번에 처리합니다. (monotone chain)
+
+    Returns:
+        (hull, size): 껍질 꼭짓점의 선택지 인덱스 (num_item, num_choice)와 아이템별 꼭짓점 수 (num_item,)
+        hull[i, :size[i]]는 비용 오름차순이며, 이익과 비용이 모두 증가하고 효율은 감소합니다.
+    """
+    num_item, num_choice = choice_cost.shape
+    rows = np.arange(num_item)
+    # 비용 오름차순, 비용이 같으면 이익 내림차순
+    order = np.lexsort((-choice_profit, choice_cost), axis=-1)
+
+    hull = np.zeros((num_item, num_choice), dtype=np.int64)
+    size = np.zeros(num_item, dtype=np.int64)
+    for k in range(num_choice):
+        point = order[:, k]
+        cost = choice_cost[rows, point]
+        profit = choice_profit[rows, point]
+
+        # 이익이 늘지 않는 점은 더 싼 꼭짓점에 지배되므로 건너뜀
+        top = hull[rows, np.maximum(size - 1, 0)]
+        push = (size == 0) | (profit > choice_profit[rows, top])
+
+        # 새 점과 그 앞의 꼭짓점을 잇는 선분 위 또는 아래에 있는 마지막 꼭짓점을 제거
+        while True:
+            top = hull[rows, np.maximum(size - 1, 0)]
+            second = hull[rows, np.maximum(size - 2, 0)]
+            below = ((choice_profit[rows, top] - choice_profit[rows, second]) * (cost - choice_cost[rows, second])
+                     <= (profit - choice_profit[rows, second]) * (choice_cost[rows, top] - choice_cost[rows, second]))
+            pop = push & (size >= 2) & below
+            if not pop.any():
+                break
+            size -= pop
+
+        hull[rows[push], size[push]] = point[push]
+        size += push
+
+    return hull, size
+
+
+def lp_greedy_solution(choice_cost, choice_profit, cost_constraint):
+    """
+    LP 완화 문제를 탐욕적으로 풀고, 그 해로부터 정수 해를 만듭니다.
+
+    Returns:
+        (selected, upper_bound): 아이템별 선택지 인덱스 (num_item,)와 LP 완화 문제의 최적값(상한)
+
+    Raises:
+        ValueError: 가장 싼 선택지만으로도 예산을 넘는 경우
+    """
+    num_item, num_choice = choice_cost.shape
+    rows = np.arange(num_item)
+    hull, size = _upper_hull(choice_cost, choice_profit)
+
+    base = hull[:, 0]
+    remaining = cost_constraint - choice_cost[rows, base].sum()
+    if remaining < 0:
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+
+    # 껍질의 이웃한 꼭짓점 사이의 증분
+    item, step = np.nonzero(np.arange(num_choice - 1)[np.newaxis, :] < (size - 1)[:, np.newaxis])
+    source = hull[item, step]
+    target = hull[item, step + 1]
+    extra_cost = choice_cost[item, target] - choice_cost[item, source]
+    extra_profit = choice_profit[item, target] - choice_profit[item, source]
+
+    # 효율의 내림차순. 효율이 같으면 아이템 안의 순서를 유지
+    order = np.lexsort((step, -extra_profit / extra_cost))
+    item, step, extra_cost, extra_profit = item[order], step[order], extra_cost[order], extra_profit[order]
+
+    spent = np.cumsum(extra_cost)
+    num_fit = int(np.searchsorted(spent, remaining, side="right"))
+    left = remaining - (spent[num_fit - 1] if num_fit > 0 else 0.0)
+
+    upper_bound = choice_profit[rows, base].sum() + extra_profit[:num_fit].sum()
+    if num_fit < len(order):
+        upper_bound += extra_profit[num_fit] * left / extra_cost[num_fit]
+
+    # LP 해에서 온전히 적용된 증분
+    position = np.bincount(item[:num_fit], minlength=num_item)
+
+    # 나머지 증분 중 현재 꼭짓점에서 이어지고 예산에 들어가는 것을 차례로 적용
+    if num_fit < len(order):
+        cheapest = np.minimum.accumulate(extra_cost[::-1])[::-1]
+        for k, i, s, c in zip(range(num_fit, len(order)), item[num_fit:].tolist(), step[num_fit:].tolist(),
+                              extra_cost[num_fit:].tolist()):
+            if left < cheapest[k]:
+                break
+            if position[i] == s and c <= left:
+                position[i] += 1
+                left -= c
+
+    return hull[rows, position], float(upper_bound)
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False, stats=None):
+    """
+    LP 완화 탐욕 알고리즘을 사용하여 비용 제약 문제의 근사해와 상한을 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        stats: 주어진 경우 LP 상한("upper_bound"), 해의 가중 가치("lower_bound"), 상한 대비 차이 비율("gap"),
+            풀이 시간("solve_time")을 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+
+    Raises:
+        ValueError: 실행 가능한 해가 없을 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    choice_profit = choice_value @ np.asarray(value_weights)
+
+    best, upper_bound = lp_greedy_solution(choice_cost, choice_profit, cost_constraint)
+
+    elapsed_time = time.time() - time_start
+
+    lower_bound = float(choice_profit[np.arange(len(best)), best].sum())
+    gap = (upper_bound - lower_bound) / abs(upper_bound) if upper_bound != 0 else 0.0
+    print(f"LP 상한: {upper_bound}, 상한 대비 차이: {gap:.4%}")
+
+    if stats is not None:
+        stats.update(upper_bound=upper_bound, lower_bound=lower_bound, gap=gap, solve_time=elapsed_time)
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
@@ -0,0 +1,185 @@
+import numpy as np
+
+from src.problem.problem import Problem, as_problem
+
+"""
+이 모듈은 모델을 만들기 전에 최적해에 쓰이지 않는 (아이템, 전략) 쌍을 찾아 제거하는 사전 처리(presolve)를 제공합니다.
+
+지배(dominance): 같은 아이템의 다른 전략이 비용은 같거나 적고 가치는 모든 차원에서 같거나 큰 경우, 그 전략은 제거해도 최적값이 변하지 않습니다.
+    비용 제약 문제에서 value_weights가 주어지면 가중 합한 가치 하나로 비교하므로 더 많은 전략이 제거됩니다.
+    allow_zero_strategy인 경우 비용과 가치가 모두 0인 "선택하지 않음"도 비교 대상에 포함합니다.
+    비용과 가치가 완전히 같은 전략들은 인덱스가 가장 작은 것 하나만 남깁니다.
+
+LP 지배(LP-dominance): 비용 제약 문제에서 (비용, 가중 가치) 평면의 볼록 껍질(convex hull) 아래에 있는 전략을 제거합니다.
+    LP 완화 문제의 최적값은 변하지 않지만 정수해의 최적값은 나빠질 수 있으므로, lp_dominance=True로 지정한 경우에만 적용합니다.
+
+결과는 원래 (n_items, n_strategies) 크기의 bool 배열(keep)이며, solver는 keep이 True인 전략에 대해서만 변수를 만듭니다.
+전략의 열 인덱스는 바뀌지 않으므로 solver가 반환하는 선택된 전략과 write_solution_to_excel의 출력은 사전 처리 여부와 관계없이 같은 형태입니다.
+
+아이템 묶음(aggregate_items): 비용과 가치가 모두 같은 아이템들을 하나의 묶음으로 합칩니다.
+    solver는 묶음마다 전략별로 선택한 아이템 수를 정수 변수로 두므로, 같은 아이템끼리 선택을 바꾼 대칭인 해들이 하나로 합쳐집니다.
+    풀이 후 expand_counts로 아이템별 선택된 전략으로 되돌리므로 solver가 반환하는 형태는 같습니다.
+"""
+
+
+def presolve(problem, value_weights=None, allow_zero_strategy=False, lp_dominance=False, stats=None) -> np.ndarray:
+    """
+    지배되는 전략을 찾아 남길 전략의 마스크를 반환합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        value_weights: 비용 제약 문제의 가치 가중치. None인 경우 가치의 모든 차원을 각각 비교합니다. (신뢰도 제약 문제)
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        lp_dominance: LP 지배 전략도 제거할지 여부. value_weights가 주어진 경우에만 사용됩니다.
+        stats: 주어진 경우 제거된 전략 수("presolve_removed")를 기록할 딕셔너리
+
+    Returns:
+        np.ndarray: 남길 전략의 bool 배열 (n_items, n_strategies)
+    """
+    problem = as_problem(problem)
+    costs = problem.cost
+    if value_weights is None:
+        values = problem.value
+    else:
+        values = np.einsum("idj,d->ij", problem.value, np.asarray(value_weights, dtype=np.float64))[:, np.newaxis, :]
+
+    num_item, num_strategy = costs.shape
+    if allow_zero_strategy:
+        # 마지막 열에 "선택하지 않음"을 추가해 함께 비교
+        costs = np.concatenate([costs, np.zeros((num_item, 1))], axis=1)
+        values = np.concatenate([values, np.zeros((num_item, values.shape[1], 1))], axis=2)
+
+    keep = ~_dominated(costs, values)
+    if lp_dominance and value_weights is not None:
+        keep &= ~_lp_dominated(costs, values[:, 0, :], keep)
+    keep = keep[:, :num_strategy]
+
+    removed = int(keep.size - keep.sum())
+    print(f"사전 처리: 전체 {keep.size}개 전략 중 {removed}개를 제거했습니다.")
+    if stats is not None:
+        stats.update(presolve_removed=removed)
+    return keep
+
+
+def _dominated(costs, values):
+    """
+    같은 아이템의 다른 전략에 지배되는 전략을 찾습니다.
+
+    Args:
+        costs: 비용 배열 (n_items, n_choices)
+        values: 가치 배열 (n_items, value_dim, n_choices)
+
+    Returns:
+        np.ndarray: 지배되는 전략의 bool 배열 (n_items, n_choices)
+    """
+    num_choice = costs.shape[1]
+    # [i, a, b]: 아이템 i에서 전략 a가 전략 b보다 나쁘지 않음
+    no_worse = ((costs[:, :, np.newaxis] <= costs[:, np.newaxis, :])
+                & (values[:, :, :, np.newaxis] >= values[:, :, np.newaxis, :]).all(axis=1))
+    better = ((costs[:, :, np.newaxis] < costs[:, np.newaxis, :])
+              | (values[:, :, :, np.newaxis] > values[:, :, np.newaxis, :]).any(axis=1))
+    # 완전히 같은 전략끼리는 인덱스가 작은 쪽이 지배
+    earlier = np.tri(num_choice, k=-1, dtype=bool).T
+    dominates = no_worse & (better | earlier)
+    return dominates.any(axis=1)
+
+
+def _lp_dominated(costs, values, keep):
+    """
+    남은 전략 중 (비용, 가치) 평면에서 더 싼 전략과 더 비싼 전략을 잇는 선분보다 아래에 있는 전략을 찾습니다.
+
+    Args:
+        costs: 비용 배열 (n_items, n_choices)
+        values: 가중 가치 배열 (n_items, n_choices)
+        keep: 지배되지 않은 전략의 bool 배열 (n_items, n_choices)
+
+    Returns:
+        np.ndarray: LP 지배되는 전략의 bool 배열 (n_items, n_choices)
+    """
+    # [i, a, b, c]: 전략 a, c를 잇는 선분이 전략 b보다 위에 있음 (cost_a < cost_b < cost_c)
+    cost_a = costs[:, :, np.newaxis, np.newaxis]
+    cost_b = costs[:, np.newaxis, :, np.newaxis]
+    cost_c = costs[:, np.newaxis, np.newaxis, :]
+    value_a = values[:, :, np.newaxis, np.newaxis]
+    value_b = values[:, np.newaxis, :, np.newaxis]
+    value_c = values[:, np.newaxis, np.newaxis, :]
+
+    between = (cost_a < cost_b) & (cost_b < cost_c)
+    below = (value_b - value_a) * (cost_c - cost_a) < (value_c - value_a) * (cost_b - cost_a)
+    endpoints = keep[:, :, np.newaxis, np.newaxis] & keep[:, np.newaxis, np.newaxis, :]
+    return (between & below & endpoints).any(axis=(1, 3))
+
+
+def aggregate_items(problem, stats=None):
+    """
+    비용과 가치가 모두 같은 아이템들을 하나의 묶음으로 합칩니다.
+    같은 아이템들은 서로 바꾸어도 해의 비용과 가치가 같으므로(대칭), solver는 묶음마다 전략별로 선택한 아이템 수를 정수 변수로 둡니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        stats: 주어진 경우 합쳐져 줄어든 아이템 수("aggregated_items")를 기록할 딕셔너리
+
+    Returns:
+        (problem, group, counts): 묶음별 대표 아이템으로 만든 문제, 아이템별 묶음 인덱스 (n_items,), 묶음별 아이템 수 (n_groups,)
+        같은 아이템이 없는 경우 (problem, None, None)
+    """
+    problem = as_problem(problem)
+    rows = np.concatenate([problem.cost, problem.value.reshape(problem.num_item, -1)], axis=1)
+    _, representative, group, counts = np.unique(rows, axis=0, return_index=True, return_inverse=True,
+                                                 return_counts=True)
+    if len(counts) == problem.num_item:
+        return problem, None, None
+
+    print(f"아이템 묶음: 전체 {problem.num_item}개 아이템을 같은 비용과 가치의 묶음 {len(counts)}개로 합쳤습니다.")
+    if stats is not None:
+        stats.update(aggregated_items=problem.num_item - len(counts))
+
+    aggregated = Problem(problem.cost[representative], problem.value[representative],
+                         item_label=problem.item_label[representative], strategy_label=problem.strategy_label,
+                         value_label=problem.value_label)
+    return aggregated, group.reshape(-1), counts
+
+
+def expand_counts(counts, group):
+    """
+    묶음별로 전략마다 선택한 아이템 수를 아이템별 선택된 전략으로 되돌립니다.
+    묶음 안의 아이템에는 원래 순서대로 전략 인덱스 순서로 배정하고, 남는 아이템은 선택하지 않음(-1)으로 둡니다.
+
+    Args:
+        counts: 묶음별 전략마다 선택한 아이템 수 (n_groups, n_strategies)
+        group: 아이템별 묶음 인덱스 (n_items,)
+
+    Returns:
+        list[int]: 각 아이템에 대해 선택된 전략의 인덱스
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    num_strategy = counts.shape[1]
+
+    # 묶음 안에서 아이템의 순번
+    order = np.argsort(group, kind="stable")
+    sizes = np.bincount(group, minlength=len(counts))
+    rank = np.empty(len(group), dtype=np.int64)
+    rank[order] = np.arange(len(group)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    strategy = (np.cumsum(counts, axis=1)[group] <= rank[:, np.newaxis]).sum(axis=1)
+    return np.where(strategy < num_strategy, strategy, -1).tolist()
+
+
+def count_selection(selected, group, shape):
+    """
+    아이템별 선택된 전략을 solver 변수의 값으로 변환합니다. (hint 등에 사용)
+
+    Args:
+        selected: 각 아이템에 대해 선택된 전략의 인덱스, 선택하지 않음은 -1
+        group: 아이템별 묶음 인덱스. None인 경우 아이템별 one-hot
+        shape: 변수 배열의 크기 (n_groups 또는 n_items, n_strategies)
+
+    Returns:
+        np.ndarray: 전략마다 선택한 아이템 수 (shape)
+    """
+    selected = np.asarray(selected, dtype=np.int64)
+    rows = np.arange(len(selected)) if group is None else group
+    counts = np.zeros(shape, dtype=np.int64)
+    chosen = selected >= 0
+    np.add.at(counts, (rows[chosen], selected[chosen]), 1)
+    return counts
@@ -0,0 +1,331 @@
+import time
+
+import numpy as np
+
+from src.problem.problem import as_problem, _check_finite
+from src.problem.strategy import (get_cost, get_total_value, get_value, _normalize_value_weights, _choice_arrays,
+                                  _greedy_cost_constraint, _repair_cost_constraint, _repair_reliability_constraint,
+                                  _to_choice, _to_selected)
+
+"""
+이 모듈은 담금질 기법(Simulated Annealing, SA)으로 비용 제약 문제와 신뢰도 제약 문제의 근사해를 구합니다.
+
+여러 개의 독립적인 체인을 NumPy 배열로 동시에 진행합니다. 각 체인의 해는 아이템별 전략 인덱스이며,
+체인마다 총 비용과 가치 차원별 총 가치를 누적값으로 유지합니다.
+한 번의 이동은 임의의 아이템 하나의 전략을 바꾸는 것이고, 이동의 평가는 해당 아이템의 비용/가치 차이만으로 O(1)에 계산됩니다.
+
+제약은 페널티로 처리합니다. 에너지 = 목적 함수 + 승수 * 제약 위반량이며,
+목적 함수는 비용 제약 문제에서 -(가중 가치 합), 신뢰도 제약 문제에서 총 비용입니다.
+승수는 블록마다 제약을 위반한 체인에서는 키우고 만족한 체인에서는 줄여, 체인이 제약 경계 근처를 탐색하도록 합니다.
+예산을 넘는 이동을 모두 거부하면 예산이 빠듯할 때 거의 모든 이동이 거부되어 탐색이 멈추기 때문입니다.
+가장 좋은 해는 블록이 끝날 때 제약을 만족하는 체인 중에서 기록합니다.
+
+최적해를 보장하지 않으며, 정확한 해가 필요한 경우 SCIP, CP-SAT 또는 DP 솔버를 사용하세요.
+"""
+
+# 동시에 진행하는 체인의 수
+SA_NUM_CHAINS = 32
+# num_iterations를 지정하지 않은 경우, 아이템 하나당 체인별 이동 횟수
+SA_ITERATIONS_PER_ITEM = 20
+# num_iterations를 지정하지 않은 경우의 최소, 최대 이동 횟수
+SA_MIN_ITERATIONS = 20_000
+SA_MAX_ITERATIONS = 200_000
+# 난수를 미리 생성하고, 최적해 기록과 승수 조정을 하는 이동 횟수 단위
+SA_BLOCK_SIZE = 250
+# 초기 해 주변 이동의 평균 에너지 변화량 대비 초기 온도의 비율
+SA_INITIAL_TEMPERATURE_RATIO = 0.1
+# 마지막에 제약 안으로 고쳐 후보로 사용할 체인의 수(에너지가 낮은 순서)
+SA_REPAIR_CHAINS = 4
+# 초기 온도 대비 최종 온도의 비율
+SA_FINAL_TEMPERATURE_RATIO = 1e-3
+# 블록이 끝날 때 제약을 위반한 체인의 승수 증가 배율과 만족한 체인의 승수 감소 배율
+SA_MULTIPLIER_GROWTH = 1.1
+SA_MULTIPLIER_DECAY = 1 / 1.1
+# 초기 승수 대비 승수의 하한, 상한 비율
+SA_MULTIPLIER_RANGE = (1e-3, 1e9)
+
+
+def _violation(cost, value, cost_constraint, reliability_constraint, scale):
+    """
+    제약 위반량을 계산합니다. 양수인 경우 제약을 위반한 것입니다.
+    비용 제약 문제는 예산 초과액 (..., 1), 신뢰도 제약 문제는 요구 신뢰도 대비 비율로 정규화된 부족분 (..., value_dim)입니다.
+    """
+    if reliability_constraint is None:
+        return (cost - cost_constraint)[..., None]
+    return (reliability_constraint - value) / scale
+
+
+def _objective(cost, value, value_weights):
+    """
+    목적 함수(최소화 대상)를 계산합니다. 비용 제약 문제는 -(가중 가치 합), 신뢰도 제약 문제는 총 비용입니다.
+    """
+    if value_weights is None:
+        return cost
+    return -(value @ value_weights)
+
+
+def _anneal(choice_cost, choice_value, initial, initial_multiplier, cost_constraint=None, value_weights=None,
+            reliability_constraint=None, num_chains=SA_NUM_CHAINS, num_iterations=None, time_limit=None,
+            initial_temperature=None, seed=None, stats=None):
+    """
+    여러 체인에 대해 담금질 기법을 실행하고, 모든 체인에서 찾은 가장 좋은 실행 가능한 해를 반환합니다.
+
+    Args:
+        choice_cost: 선택지 비용 배열 (num_item, num_choice)
+        choice_value: 선택지 가치 배열 (num_item, num_choice, value_dim)
+        initial: 초기 선택지 인덱스 (num_item,)
+        initial_multiplier: 제약 위반량 1에 대한 초기 승수
+        cost_constraint: 최대 비용 제약, 신뢰도 제약 문제인 경우 None
+        value_weights: 가치 차원에 대한 가중치 (value_dim,), 신뢰도 제약 문제인 경우 None
+        reliability_constraint: 가치 차원별 최소 요구 신뢰도, 비용 제약 문제인 경우 None
+        num_chains: 동시에 진행하는 체인의 수
+        num_iterations: 체인별 이동 횟수
+        time_limit: 최대 실행 시간(초). 주어진 경우 온도는 이동 횟수와 경과 시간 중 더 많이 진행된 쪽을 기준으로 낮아집니다.
+        initial_temperature: 초기 온도. None인 경우 초기 해 주변 이동의 평균 에너지 변화량에 비례하여 정합니다.
+        seed: 난수 시드
+        stats: 주어진 경우 풀이 정보를 기록할 딕셔너리
+
+    Returns:
+        np.ndarray: 가장 좋은 해의 선택지 인덱스 (num_item,), 실행 가능한 해를 찾지 못한 경우 None
+    """
+    rng = np.random.default_rng(seed)
+    num_item, num_choice = choice_cost.shape
+    rows = np.arange(num_item)
+    chains = np.arange(num_chains)
+    time_start = time.time()
+
+    scale = None
+    if reliability_constraint is not None:
+        scale = np.where(reliability_constraint != 0, np.abs(reliability_constraint), 1.0)
+
+    def violation(cost, value):
+        return _violation(cost, value, cost_constraint, reliability_constraint, scale)
+
+    def energy_of(cost, value, multiplier):
+        return _objective(cost, value, value_weights) + (np.maximum(violation(cost, value), 0.0) * multiplier).sum(
+            axis=-1)
+
+    x = np.tile(initial, (num_chains, 1))
+    cost = np.full(num_chains, choice_cost[rows, initial].sum())
+    value = np.tile(choice_value[rows, initial].sum(axis=0), (num_chains, 1))
+
+    multiplier = np.full(violation(cost, value).shape, float(initial_multiplier))
+    min_multiplier, max_multiplier = (float(initial_multiplier) * ratio for ratio in SA_MULTIPLIER_RANGE)
+    energy = energy_of(cost, value, multiplier)
+
+    best_x = initial.copy()
+    best = float(_objective(cost[0], value[0], value_weights)) if (violation(cost[0], value[0]) <= 0).all() else np.inf
+
+    if num_iterations is None:
+        num_iterations = min(max(SA_MIN_ITERATIONS, SA_ITERATIONS_PER_ITEM * num_item), SA_MAX_ITERATIONS)
+    if num_choice < 2:
+        num_iterations = 0
+
+    if initial_temperature is None and num_iterations > 0:
+        # 초기 해에서 임의의 이동을 시도했을 때의 평균 에너지 변화량
+        item = rng.integers(num_item, size=num_chains)
+        new = (initial[item] + rng.integers(1, num_choice, size=num_chains)) % num_choice
+        delta = np.abs(energy_of(cost + choice_cost[item, new] - choice_cost[item, initial[item]],
+                                 value + choice_value[item, new] - choice_value[item, initial[item]],
+                                 multiplier) - energy)
+        initial_temperature = float(delta.mean()) * SA_INITIAL_TEMPERATURE_RATIO if delta.mean() > 0 else 1.0
+    final_temperature = (initial_temperature or 1.0) * SA_FINAL_TEMPERATURE_RATIO
+
+    iteration = 0
+    accepted = 0
+    while iteration < num_iterations:
+        block = min(SA_BLOCK_SIZE, num_iterations - iteration)
+        progress = iteration / num_iterations
+        if time_limit is not None:
+            elapsed = time.time() - time_start
+            if elapsed >= time_limit:
+                break
+            progress = max(progress, elapsed / time_limit)
+        temperature = initial_temperature * (final_temperature / initial_temperature) ** np.minimum(
+            progress + np.arange(block) / num_iterations, 1.0)
+
+        items = rng.integers(num_item, size=(block, num_chains))
+        offsets = rng.integers(1, num_choice, size=(block, num_chains))
+        thresholds = -temperature[:, None] * np.log(rng.random((block, num_chains)))
+
+        for t in range(block):
+            item = items[t]
+            current = x[chains, item]
+            new = current + offsets[t]
+            new[new >= num_choice] -= num_choice
+
+            # 바뀌는 아이템 하나의 차이만으로 새 상태를 계산
+            new_cost = cost + (choice_cost[item, new] - choice_cost[item, current])
+            new_value = value + (choice_value[item, new] - choice_value[item, current])
+            new_energy = energy_of(new_cost, new_value, multiplier)
+
+            accept = new_energy - energy <= thresholds[t]
+            x[chains, item] = np.where(accept, new, current)
+            cost = np.where(accept, new_cost, cost)
+            value = np.where(accept[:, None], new_value, value)
+            energy = np.where(accept, new_energy, energy)
+            accepted += int(np.count_nonzero(accept))
+
+        iteration += block
+
+        # 제약을 만족하는 체인 중 가장 좋은 해를 기록하고, 누적값을 다시 계산하여 부동소수점 오차가 쌓이지 않도록 함
+        violated = violation(cost, value) > 0
+        feasible = ~violated.any(axis=-1)
+        current_objective = np.where(feasible, _objective(cost, value, value_weights), np.inf)
+        chain = int(np.argmin(current_objective))
+        if current_objective[chain] < best:
+            best_x = x[chain].copy()
+            best = float(current_objective[chain])
+            cost[chain] = choice_cost[rows, best_x].sum()
+            value[chain] = choice_value[rows, best_x].sum(axis=0)
+
+        # 제약을 위반한 체인은 승수를 키우고, 만족한 체인은 줄임
+        multiplier = np.clip(np.where(violated, multiplier * SA_MULTIPLIER_GROWTH, multiplier * SA_MULTIPLIER_DECAY),
+                             min_multiplier, max_multiplier)
+        energy = energy_of(cost, value, multiplier)
+
+    # 에너지가 가장 낮은 체인들의 마지막 상태를 제약 안으로 고친 해도 후보로 사용
+    if reliability_constraint is None:
+        choice_profit = choice_value @ value_weights
+    else:
+        choice_norm, required_norm = choice_value / scale, reliability_constraint / scale
+    for chain in np.argsort(energy, kind="stable")[:SA_REPAIR_CHAINS].tolist():
+        if reliability_constraint is None:
+            repaired = _repair_cost_constraint(x[chain], choice_cost, choice_profit, cost_constraint)
+        else:
+            repaired = _repair_reliability_constraint(x[chain], choice_cost, choice_norm, required_norm)
+        repaired_cost = choice_cost[rows, repaired].sum()
+        repaired_value = choice_value[rows, repaired].sum(axis=0)
+        if (violation(repaired_cost, repaired_value) <= 0).all():
+            repaired_objective = float(_objective(repaired_cost, repaired_value, value_weights))
+            if repaired_objective < best:
+                best_x, best = repaired, repaired_objective
+
+    if stats is not None:
+        stats.update(iterations=iteration,
+                     num_chains=num_chains,
+                     initial_temperature=initial_temperature,
+                     acceptance_rate=accepted / max(iteration * num_chains, 1),
+                     solve_time=time.time() - time_start)
+
+    if not np.isfinite(best):
+        return None
+    return best_x
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False,
+                          num_chains=SA_NUM_CHAINS, num_iterations=None, time_limit=None, initial_temperature=None,
+                          initial_solution=None, seed=None, stats=None):
+    """
+    담금질 기법을 사용하여 비용 제약 문제의 근사해를 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraint: 최대 비용 제약
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        num_chains: 동시에 진행하는 체인의 수
+        num_iterations: 체인별 이동 횟수. None인 경우 아이템 수에 비례하여 정합니다.
+        time_limit: 최대 실행 시간(초)
+        initial_temperature: 초기 온도. None인 경우 자동으로 정합니다.
+        initial_solution: 초기 해(전략 인덱스 리스트). None인 경우 탐욕 해에서 시작하며, 예산을 넘는 경우 예산 안으로 고친 뒤 시작합니다.
+        seed: 난수 시드
+        stats: 주어진 경우 풀이 정보("iterations", "acceptance_rate", "solve_time" 등)를 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
+
+    Raises:
+        ValueError: 실행 가능한 해가 없을 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    time_start = time.time()
+
+    value_weights = _normalize_value_weights(values, value_weights)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+    weights = np.asarray(value_weights)
+
+    choice_profit = choice_value @ weights
+    initial, marginal_ratio = _greedy_cost_constraint(choice_cost, choice_profit, cost_constraint)
+    if initial_solution is not None:
+        initial = _to_choice(initial_solution, *choice_cost.shape, problem.num_strategy)
+        initial = _repair_cost_constraint(initial, choice_cost, choice_profit, cost_constraint)
+
+    # 예산 1당 승수는 탐욕 해에서 예산에 들어가지 못한 변경의 증가율(라그랑주 승수의 추정값)에서 시작
+    initial_multiplier = marginal_ratio if marginal_ratio > 0 else 1.0
+    best = _anneal(choice_cost, choice_value, initial, initial_multiplier, cost_constraint=cost_constraint,
+                   value_weights=weights, num_chains=num_chains, num_iterations=num_iterations, time_limit=time_limit,
+                   initial_temperature=initial_temperature, seed=seed, stats=stats)
+
+    elapsed_time = time.time() - time_start
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights), elapsed_time
+
+
+def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False,
+                                 num_chains=SA_NUM_CHAINS, num_iterations=None, time_limit=None,
+                                 initial_temperature=None, initial_solution=None, seed=None, stats=None):
+    """
+    담금질 기법을 사용하여 신뢰도 제약 문제의 근사해를 구합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        reliability_constraint: 각 가치 차원별 최소 요구 신뢰도
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        num_chains: 동시에 진행하는 체인의 수
+        num_iterations: 체인별 이동 횟수. None인 경우 아이템 수에 비례하여 정합니다.
+        time_limit: 최대 실행 시간(초)
+        initial_temperature: 초기 온도. None인 경우 자동으로 정합니다.
+        initial_solution: 초기 해(전략 인덱스 리스트). None인 경우 탐욕 해에서 시작합니다.
+        seed: 난수 시드
+        stats: 주어진 경우 풀이 정보("iterations", "acceptance_rate", "solve_time" 등)를 기록할 딕셔너리
+
+    Returns:
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간
+
+    Raises:
+        ValueError: 신뢰도 제약 길이가 가치 차원과 일치하지 않거나, 실행 가능한 해를 찾지 못한 경우
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    _check_finite(costs)
+    _check_finite(values)
+
+    if len(reliability_constraint) != problem.value_dim:
+        raise ValueError(
+            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {problem.value_dim}")
+
+    time_start = time.time()
+
+    reliability_constraint = np.asarray(reliability_constraint, dtype=np.float64)
+    choice_cost, choice_value = _choice_arrays(costs, values, allow_zero_strategy)
+
+    if initial_solution is not None:
+        initial = _to_choice(initial_solution, *choice_cost.shape, problem.num_strategy)
+    else:
+        # 가장 싼 선택지에서 시작하는 탐욕 해
+        scale = np.where(reliability_constraint != 0, np.abs(reliability_constraint), 1.0)
+        initial = _repair_reliability_constraint(choice_cost.argmin(axis=1), choice_cost, choice_value / scale,
+                                                 reliability_constraint / scale)
+
+    # 정규화된 부족분 1에 대한 승수는 초기 해의 총 비용에서 시작
+    initial_multiplier = max(float(choice_cost[np.arange(problem.num_item), initial].sum()), 1.0)
+    best = _anneal(choice_cost, choice_value, initial, initial_multiplier,
+                   reliability_constraint=reliability_constraint, num_chains=num_chains,
+                   num_iterations=num_iterations, time_limit=time_limit,
+                   initial_temperature=initial_temperature, seed=seed, stats=stats)
+    if best is None:
+        print("최적 해를 찾지 못했습니다.")
+        raise ValueError("No optimal solution found.")
+
+    elapsed_time = time.time() - time_start
+
+    selected = _to_selected(best, problem.num_strategy)
+    return selected, get_cost(costs, selected), get_value(values, selected), elapsed_time
@@ -1,66 +1,198 @@
 import time
 
-from ortools.linear_solver import pywraplp
+import numpy as np
+from ortools.linear_solver.python import model_builder as mb
+from ortools.linear_solver.python import model_builder_helper as mbh
 
+from src.problem.problem import as_problem, _check_finite
 from src.problem.strategy import get_cost, get_total_value, get_value, _normalize_value_weights, make_random_problem
+from src.solver.presolve import presolve as presolve_strategies, aggregate_items, expand_counts, count_selection
 from src.utils.utils import process_solution
 
 
-def _init_scip_solver(num_item, action_dim, allow_zero_strategy=False):
+def _init_scip_solver(num_item, action_dim, allow_zero_strategy=False, keep=None, counts=None):
     """
-    SCIP 솔버를 초기화하고 변수를 설정합니다.
+    SCIP 모델을 초기화하고 변수를 설정합니다.
+    변수는 model_builder의 배열 인터페이스로 한 번에 생성하므로, 변수의 모델 내 인덱스는 x에서 남은 변수의 행 우선 순서와 같습니다.
 
     Args:
         num_item: 아이템 수
         action_dim: 각 아이템에 대한 전략(액션) 수
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        keep: 변수를 만들 전략의 bool 배열 (num_item, action_dim). None인 경우 모든 전략
+        counts: 아이템(묶음)별 아이템 수 (num_item,). 주어진 경우 x[i, j]는 묶음 i에서 전략 j를 선택한 아이템 수를 나타내는
+            0 이상 counts[i] 이하의 정수 변수입니다.
 
     Returns:
-        (solver, x): SCIP 솔버 객체와 변수 2차원 배열
+        (model, x): model_builder 모델 객체와 변수 2차원 배열 (num_item, action_dim). 제거된 전략은 None입니다.
 
     Note:
-        솔버 생성에 실패할 경우 None, None을 반환합니다.
+        SCIP을 사용할 수 없는 경우 None, None을 반환합니다.
     """
-    solver = pywraplp.Solver.CreateSolver('SCIP')
-    if not solver:
+    if not mbh.ModelSolverHelper("scip").solver_is_supported():
         print("SCIP cannot be created.")
         return None, None
 
+    model = mb.Model()
+    helper = model.helper
+
     # 변수 선언
-    x = [[solver.BoolVar(f'x[{i}][{j}]') for j in range(action_dim)] for i in range(num_item)]
+    if keep is None:
+        keep = np.ones((num_item, action_dim), dtype=bool)
+    size = int(np.count_nonzero(keep))
+    if counts is None:
+        counts = np.ones(num_item)
+    upper = np.broadcast_to(np.asarray(counts, dtype=np.float64)[:, np.newaxis], keep.shape)[keep]
+    indices = helper.add_var_array_with_bounds(np.zeros(size), upper, np.ones(size, dtype=bool), "x")
+    x = np.full((num_item, action_dim), None, dtype=object)
+    x[keep] = [mbh.Variable(helper, index) for index in indices.tolist()]
+
+    # allow_zero_strategy인 경우 전략 선택하지 않음으로 "현상유지" 전략을 구현
+    # 그렇지 않은 경우 하나의 item은 하나의 전략만 선택할 수 있음 (묶음은 묶음의 아이템 수만큼)
+    for row, count in zip(x.tolist(), np.asarray(counts, dtype=np.float64).tolist()):
+        row = [variable for variable in row if variable is not None]
+        if not row:
+            continue
+        constraint = helper.add_linear_constraint()
+        helper.set_constraint_lower_bound(constraint, 0.0 if allow_zero_strategy else count)
+        helper.set_constraint_upper_bound(constraint, count)
+        helper.add_terms_to_constraint(constraint, row, [1.0] * len(row))
+
+    return model, x
+
+
+def _add_linear_constraint(model, x, coefs, lower_bound=-np.inf, upper_bound=np.inf):
+    """
+    lower_bound <= sum(coefs[i, j] * x[i, j]) <= upper_bound 제약을 한 번에 추가합니다.
+
+    Args:
+        model: model_builder 모델 객체
+        x: 변수 2차원 배열
+        coefs: 계수 배열, x와 같은 크기
+        lower_bound: 하한
+        upper_bound: 상한
+
+    Returns:
+        int: 추가된 제약의 인덱스
+    """
+    helper = model.helper
+    nonzero = (coefs != 0) & _active(x)
+    constraint = helper.add_linear_constraint()
+    helper.set_constraint_lower_bound(constraint, float(lower_bound))
+    helper.set_constraint_upper_bound(constraint, float(upper_bound))
+    helper.add_terms_to_constraint(constraint, x[nonzero].tolist(), coefs[nonzero].tolist())
+    return constraint
+
+
+def _set_objective(model, x, coefs, maximize=True):
+    """
+    sum(coefs[i, j] * x[i, j])를 목적 함수로 설정합니다.
+
+    Args:
+        model: model_builder 모델 객체
+        x: 변수 2차원 배열
+        coefs: 계수 배열, x와 같은 크기
+        maximize: 최대화 여부. False인 경우 최소화합니다.
+    """
+    helper = model.helper
+    helper.clear_objective()
+    active = _active(x)
+    helper.set_objective_coefficients(np.arange(np.count_nonzero(active)).tolist(),
+                                      np.asarray(coefs, dtype=np.float64)[active].tolist())
+    helper.set_maximize(maximize)
+
+
+def _active(x):
+    """
+    변수 배열에서 사전 처리로 제거되지 않은 위치의 bool 배열을 반환합니다.
+    """
+    return np.frompyfunc(lambda variable: variable is not None, 1, 1)(x).astype(bool)
+
+
+def _set_hint(model, x, selected, group=None):
+    """
+    아이템별 선택된 전략을 SCIP의 시작 해(hint)로 설정합니다. 사전 처리로 제거된 전략의 hint는 생략합니다.
+
+    Args:
+        model: model_builder 모델 객체
+        x: 변수 2차원 배열
+        selected: 각 아이템에 대해 선택된 전략의 인덱스, 선택하지 않음은 -1
+        group: 아이템별 묶음 인덱스. 주어진 경우 x는 묶음별 정수 변수입니다.
+    """
+    helper = model.helper
+    helper.clear_hints()
+    for index, hint in enumerate(count_selection(selected, group, x.shape)[_active(x)].astype(np.float64).tolist()):
+        helper.add_hint(index, hint)
 
-    if allow_zero_strategy:
-        # 전략 선택하지 않음으로 "현상유지" 전략을 구현
-        for i in range(num_item):
-            solver.Add(sum(x[i][j] for j in range(action_dim)) <= 1)
-    else:
-        # 하나의 item은 하나의 전략만 선택할 수 있음
-        for i in range(num_item):
-            solver.Add(sum(x[i][j] for j in range(action_dim)) == 1)
 
-    return solver, x
+# pywraplp의 MPSolver::Solve가 기본으로 사용하던 상대 gap 허용치
+SCIP_RELATIVE_GAP = 1e-4
 
 
-def _run_scip_solver(solver):
+def _run_scip_solver(model, time_limit=None, relative_gap=SCIP_RELATIVE_GAP, absolute_gap=None, seed=None,
+                     presolve_rounds=None, conflict_analysis=None):
     """
     SCIP 솔버를 실행하고 결과를 반환합니다.
 
     Args:
-        solver: SCIP 솔버 객체
+        model: model_builder 모델 객체
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: SCIP의 상대 gap 허용치(limits/gap). None인 경우 SCIP_RELATIVE_GAP
+        absolute_gap: SCIP의 절대 gap 허용치(limits/absgap). None인 경우 SCIP의 기본값
+        seed: SCIP의 난수 시드 이동값(randomization/randomseedshift)
+        presolve_rounds: SCIP의 사전 처리 반복 횟수(presolving/maxrounds). None인 경우 SCIP의 기본값, 0인 경우 사전 처리를 하지 않습니다.
+        conflict_analysis: SCIP의 충돌 분석(conflict/enable) 사용 여부. None인 경우 SCIP의 기본값.
+            시작 해(hint)가 주어지면 충돌 분석이 루트 노드에서 수 초씩 걸릴 수 있으므로, hint를 설정한 풀이는 False로 풉니다.
 
     Returns:
-        (status, float): 솔버 실행 상태와 실행 시간
+        (status, solver, float): 솔버 실행 상태와 솔버 객체 및 실행 시간
     """
+    solver = mbh.ModelSolverHelper("scip")
+    parameters = [f"limits/gap = {SCIP_RELATIVE_GAP if relative_gap is None else float(relative_gap)}"]
+    if absolute_gap is not None:
+        parameters.append(f"limits/absgap = {float(absolute_gap)}")
+    if seed is not None:
+        parameters.append(f"randomization/randomseedshift = {int(seed)}")
+    if presolve_rounds is not None:
+        parameters.append(f"presolving/maxrounds = {int(presolve_rounds)}")
+    if conflict_analysis is not None:
+        parameters.append(f"conflict/enable = {'TRUE' if conflict_analysis else 'FALSE'}")
+    solver.set_solver_specific_parameters("\n".join(parameters))
+    if time_limit is not None:
+        solver.set_time_limit_in_seconds(float(time_limit))
     time_start = time.time()
-    status = solver.Solve()
+    solver.solve(model.helper)
     time_end = time.time()
-    return status, time_end - time_start
+
+    if solver.status() == mbh.SolveStatus.FEASIBLE:
+        print("Feasible solution found.")
+
+    return solver.status(), solver, time_end - time_start
+
+
+def _objective_bound(status, solver, stats=None):
+    """
+    해의 목적 함수 값과 솔버가 증명한 목적 함수의 한계(최대화는 상한, 최소화는 하한), 둘의 상대 차이(gap)를 출력합니다.
+    gap은 cpsat 모듈과 같이 |값 - 한계| / max(|값|, 1)입니다.
+
+    Args:
+        status: 솔버 실행 상태
+        solver: SCIP 솔버 객체
+        stats: 주어진 경우 목적 함수의 한계("objective_bound")와 gap("gap")을 기록할 딕셔너리
+    """
+    if status != mbh.SolveStatus.OPTIMAL and status != mbh.SolveStatus.FEASIBLE:
+        return
+    bound = float(solver.best_objective_bound())
+    gap = abs(solver.objective_value() - bound) / max(abs(solver.objective_value()), 1.0)
+    print(f"목적 함수 한계: {bound}, gap: {gap:.4%}")
+    if stats is not None:
+        stats.update(objective_bound=bound, gap=gap)
 
 
 def _process_scip_result(status, solver, x, num_item, action_dim, costs, values, value_weights=None,
-                         is_cost_constraint=True):
+                         is_cost_constraint=True, group=None):
     """
-    SCIP 솔버 결과를 처리합니다.
+    SCIP 솔버 결과를 처리합니다. 모든 변수의 값은 variable_values()로 한 번에 읽어옵니다.
 
     Args:
         status: 솔버 실행 상태
@@ -68,18 +200,20 @@ def _process_scip_result(status, solver, x, num_item, action_dim, costs, values,
         x: 변수 2차원 배열
         num_item: 아이템 수
         action_dim: 각 아이템에 대한 전략(액션) 수
-        costs: 비용을 담은 데이터프레임
-        values: 가치를 담은 데이터프레임 목록
+        costs: 비용 배열 (n_items, n_strategies)
+        values: 가치 배열 (n_items, value_dim, n_strategies)
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
         is_cost_constraint: 비용 제약 문제 여부 (True: 비용 제약, False: 신뢰도 제약)
+        group: 아이템별 묶음 인덱스. 주어진 경우 x는 묶음별 정수 변수이며, 아이템별 전략으로 되돌립니다.
 
     Returns:
         (selected, cost, value): 선택된 전략, 총 비용, 총 가치/가치 리스트
         최적 해를 찾지 못한 경우 None
     """
-    if status == pywraplp.Solver.OPTIMAL:
-        selected = [[int(x[i][j].solution_value()) for j in range(action_dim)] for i in range(num_item)]
-        selected = process_solution(selected)
+    if status == mbh.SolveStatus.OPTIMAL or status == mbh.SolveStatus.FEASIBLE:
+        selected = np.zeros(x.shape, dtype=np.int64)
+        selected[_active(x)] = np.rint(solver.variable_values()).astype(np.int64)
+        selected = process_solution(selected) if group is None else expand_counts(selected, group)
 
         if is_cost_constraint:
             return selected, get_cost(costs, selected), get_total_value(values, selected, value_weights)
@@ -90,108 +224,283 @@ def _process_scip_result(status, solver, x, num_item, action_dim, costs, values,
         raise ValueError("No optimal solution found.")
 
 
-def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False):
+def _build_cost_constraint_model(problem, cost_constraint, value_weights=None, allow_zero_strategy=False,
+                                 presolve=True, lp_dominance=False, aggregate=True, stats=None):
+    """
+    비용 제약 문제의 SCIP 모델을 만듭니다.
+
+    Returns:
+        (model, x, budget, value_weights, group): 모델, 변수 배열, 비용 제약의 인덱스, 표준화된 가중치,
+        아이템별 묶음 인덱스(같은 아이템을 묶지 않은 경우 None). SCIP을 사용할 수 없는 경우 model은 None
+    """
+    # 가중치 표준화
+    value_weights = _normalize_value_weights(problem.value, value_weights)
+
+    # 같은 아이템을 묶음으로 합침
+    group = counts = None
+    if aggregate:
+        problem, group, counts = aggregate_items(problem, stats)
+
+    values = problem.value
+    costs = problem.cost
+    num_item, action_dim = costs.shape
+
+    # 지배되는 전략 제거
+    keep = None
+    if presolve:
+        keep = presolve_strategies(problem, value_weights, allow_zero_strategy, lp_dominance=lp_dominance, stats=stats)
+
+    # 솔버 초기화 및 변수 설정
+    model, x = _init_scip_solver(num_item, action_dim, allow_zero_strategy, keep, counts)
+    if model is None:
+        return None, None, None, value_weights, group
+
+    # 비용 제약 조건
+    budget = _add_linear_constraint(model, x, costs, upper_bound=cost_constraint)
+
+    # 가치를 최대화하는 목적 함수
+    _set_objective(model, x, np.einsum("idj,d->ij", values, value_weights), maximize=True)
+
+    return model, x, budget, value_weights, group
+
+
+def _set_budget(model, budget, cost_constraint):
+    """
+    비용 제약의 상한(예산)만 바꿉니다.
+    """
+    model.helper.set_constraint_upper_bound(budget, float(cost_constraint))
+
+
+def _update_cost_constraint_model(model, x, budget, item, strategy, costs, profits, cost_constraint):
+    """
+    비용 제약 문제의 모델에서 한 아이템의 한 전략의 비용 계수와 목적 함수 계수만 바꿉니다.
+    인자는 cpsat._update_cost_constraint_model과 같으며, SCIP은 실수 계수를 그대로 쓰므로 cost_constraint는 사용하지 않습니다.
+
+    Args:
+        model: model_builder 모델 객체
+        x: 변수 2차원 배열. 사전 처리와 묶음 없이 만든 모델이어야 합니다.
+        budget: 비용 제약의 인덱스
+        item: 아이템 인덱스
+        strategy: 전략 인덱스
+        costs: 바뀐 비용 배열 (num_item, action_dim)
+        profits: 바뀐 가중 가치 배열 (num_item, action_dim)
+        cost_constraint: 최대 비용 제약
+
+    Returns:
+        (): SCIP 모델은 정수화 배율이 없습니다.
+    """
+    index = x[item, strategy].index
+    model.helper.set_constraint_coefficient(budget, index, float(costs[item, strategy]))
+    model.helper.set_var_objective_coefficient(index, float(profits[item, strategy]))
+    return ()
+
+
+def solve_cost_constraint(problem, cost_constraint, value_weights=None, allow_zero_strategy=False, presolve=True,
+                          lp_dominance=False, aggregate=True, time_limit=None, relative_gap=SCIP_RELATIVE_GAP,
+                          absolute_gap=None, seed=None, initial_solution=None, stats=None):
     """
     SCIP 솔버를 사용하여 비용 제약 문제를 해결합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
         cost_constraint: 최대 비용 제약
         value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        presolve: 모델을 만들기 전에 지배되는 전략을 제거할지 여부
+        lp_dominance: presolve에서 LP 지배 전략도 제거할지 여부. 정수해의 최적성이 보장되지 않습니다.
+        aggregate: 비용과 가치가 모두 같은 아이템들을 묶어 전략별 선택 수를 정수 변수로 둘지 여부
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: 목적 함수 값과 한계의 상대 차이가 이 값 이하가 되면 멈춥니다.
+        absolute_gap: 목적 함수 값과 한계의 차이가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        initial_solution: 탐색을 시작할 해(전략 인덱스 리스트, 선택하지 않음은 -1). SCIP의 시작 해(hint)로 전달합니다.
+        stats: 주어진 경우 모델 생성 시간("build_time"), 풀이 시간("solve_time"), 목적 함수의 한계("objective_bound")와
+            gap("gap")을 기록할 딕셔너리
 
     Returns:
-        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간
-        최적 해를 찾지 못한 경우 None
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간(풀이 시간)
+        최적 해를 찾지 못한 경우 None. 시간 또는 gap 제한으로 멈춘 경우 그때까지 찾은 가장 좋은 해
     """
-    values = problem["value"]
-    costs = problem["cost"]
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
     num_item, action_dim = costs.shape
+    _check_finite(costs)
+    _check_finite(values)
 
-    # 솔버 초기화 및 변수 설정
-    solver, x = _init_scip_solver(num_item, action_dim, allow_zero_strategy)
-    if solver is None:
-        return None
+    build_start = time.time()
 
-    # 비용 제약 조건
-    solver.Add(sum(costs.iloc[i, j] * x[i][j] for i in range(num_item) for j in range(action_dim)) <= cost_constraint)
+    model, x, _, value_weights, group = _build_cost_constraint_model(problem, cost_constraint, value_weights,
+                                                                     allow_zero_strategy, presolve, lp_dominance,
+                                                                     aggregate, stats)
+    if model is None:
+        return None
 
-    # 가중치 표준화
-    value_weights = _normalize_value_weights(values, value_weights)
+    build_time = time.time() - build_start
+    print(f"모델 생성 시간: {build_time:.4f}초")
 
-    # 가치를 최대화하는 목적 함수
-    try:
-        objective_expr = sum(
-            x[i][j] * sum(weight * values[i].iloc[k, j] for k, weight in enumerate(value_weights))
-            for i in range(num_item) for j in range(action_dim)
-        )
-    except IndexError as e:
-        raise IndexError(f"{e}"
-                         f"비용테이블과 가치테이블에 존재하는 장치의 수가 일치하지 않을 수 있습니다.\n"
-                         f"비용테이블의 장치: {len(costs.index.tolist())}\n"
-                         f"가치테이블의 장치: {len([values[i].index.tolist() for i in range(len(values))])}\n"
-                         f"위 두 값이 일정하지 않을 경우, 입력 테이블의 범위가 잘못 설정되었을 수 있습니다.\n")
-
-    solver.Maximize(objective_expr)
+    if initial_solution is not None:
+        _set_hint(model, x, initial_solution, group)
 
     # 솔버 실행
-    status, elapsed_time = _run_scip_solver(solver)
+    status, solver, elapsed_time = _run_scip_solver(model, time_limit, relative_gap, absolute_gap, seed,
+                                                    conflict_analysis=False if initial_solution is not None else None)
+    _objective_bound(status, solver, stats)
+
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=elapsed_time)
 
     # 결과 처리
     return *_process_scip_result(status, solver, x, num_item, action_dim, costs, values, value_weights,
-                                 True), elapsed_time
+                                 True, group), elapsed_time
+
 
+def solve_cost_constraint_sweep(problem, cost_constraints, value_weights=None, allow_zero_strategy=False, use_hint=True,
+                                presolve=True, lp_dominance=False, aggregate=True, time_limit=None,
+                                relative_gap=SCIP_RELATIVE_GAP, absolute_gap=None, seed=None, stats=None):
+    """
+    SCIP 모델을 한 번만 만들고 비용 제약의 우변만 바꾸어 가며 여러 예산에 대해 비용 제약 문제를 차례로 해결합니다.
+    이전 예산의 최적해는 다음 풀이의 hint로 전달합니다. 예산이 오름차순이면 이전 해가 항상 실행 가능한 hint가 됩니다.
 
-def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False):
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraints: 최대 비용 제약 목록
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        use_hint: 이전 예산의 해를 hint로 전달할지 여부
+        presolve: 모델을 만들기 전에 지배되는 전략을 제거할지 여부
+        lp_dominance: presolve에서 LP 지배 전략도 제거할지 여부. 정수해의 최적성이 보장되지 않습니다.
+        aggregate: 비용과 가치가 모두 같은 아이템들을 묶어 전략별 선택 수를 정수 변수로 둘지 여부
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: 목적 함수 값과 한계의 상대 차이가 이 값 이하가 되면 멈춥니다.
+        absolute_gap: 목적 함수 값과 한계의 차이가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        stats: 주어진 경우 모델 생성 시간("build_time")과 전체 풀이 시간("solve_time")을 기록할 딕셔너리
+
+    Yields:
+        (cost_constraint, selected, elapsed_time): 예산, 선택된 전략(해가 없는 경우 None), 풀이 시간
+    """
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
+    num_item, action_dim = costs.shape
+    _check_finite(costs)
+    _check_finite(values)
+    cost_constraints = list(cost_constraints)
+    if len(cost_constraints) == 0:
+        return
+
+    build_start = time.time()
+    model, x, budget, value_weights, group = _build_cost_constraint_model(problem, cost_constraints[0], value_weights,
+                                                                          allow_zero_strategy, presolve, lp_dominance,
+                                                                          aggregate, stats)
+    if model is None:
+        return
+    build_time = time.time() - build_start
+    print(f"모델 생성 시간: {build_time:.4f}초")
+
+    solve_time = 0.0
+    hinted = False
+    for cost_constraint in cost_constraints:
+        # 비용 제약의 상한만 바꿈
+        _set_budget(model, budget, cost_constraint)
+
+        status, solver, elapsed_time = _run_scip_solver(model, time_limit, relative_gap, absolute_gap, seed,
+                                                        conflict_analysis=False if hinted else None)
+        _objective_bound(status, solver)
+        solve_time += elapsed_time
+        try:
+            selected, _, _ = _process_scip_result(status, solver, x, num_item, action_dim, costs, values,
+                                                  value_weights, True, group)
+        except ValueError:
+            selected = None
+
+        if use_hint and selected is not None:
+            # 이번 해를 다음 풀이의 hint로 사용
+            _set_hint(model, x, selected, group)
+            hinted = True
+
+        yield cost_constraint, selected, elapsed_time
+
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=solve_time)
+
+
+def solve_reliability_constraint(problem, reliability_constraint, allow_zero_strategy=False, presolve=True, aggregate=True,
+                                 time_limit=None, relative_gap=SCIP_RELATIVE_GAP, absolute_gap=None, seed=None,
+                                 initial_solution=None, stats=None):
     """
     SCIP 솔버를 사용하여 신뢰도 제약 문제를 해결합니다.
 
     Args:
-        problem: 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
         reliability_constraint: 각 가치 차원별 최소 요구 신뢰도
         allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        presolve: 모델을 만들기 전에 지배되는 전략을 제거할지 여부
+        aggregate: 비용과 가치가 모두 같은 아이템들을 묶어 전략별 선택 수를 정수 변수로 둘지 여부
+        time_limit: 최대 풀이 시간(초). None인 경우 제한하지 않습니다.
+        relative_gap: 목적 함수 값과 한계의 상대 차이가 이 값 이하가 되면 멈춥니다.
+        absolute_gap: 목적 함수 값과 한계의 차이가 이 값 이하가 되면 멈춥니다.
+        seed: 난수 시드
+        initial_solution: 탐색을 시작할 해(전략 인덱스 리스트, 선택하지 않음은 -1). SCIP의 시작 해(hint)로 전달합니다.
+        stats: 주어진 경우 모델 생성 시간("build_time"), 풀이 시간("solve_time"), 목적 함수의 한계("objective_bound")와
+            gap("gap")을 기록할 딕셔너리
 
     Returns:
-        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간
-        최적 해를 찾지 못한 경우 None
+        (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 가치 리스트, 경과 시간(풀이 시간)
+        최적 해를 찾지 못한 경우 None. 시간 또는 gap 제한으로 멈춘 경우 그때까지 찾은 가장 좋은 해
 
     Raises:
         ValueError: 신뢰도 제약 길이가 가치 차원과 일치하지 않을 경우
     """
-    values = problem["value"]
-    costs = problem["cost"]
+    problem = as_problem(problem)
+    values = problem.value
+    costs = problem.cost
     num_item, action_dim = costs.shape
+    _check_finite(costs)
+    _check_finite(values)
+
+    # 신뢰도 제약 조건
+    if len(reliability_constraint) != problem.value_dim:
+        raise ValueError(
+            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {problem.value_dim}")
+
+    build_start = time.time()
+
+    # 같은 아이템을 묶음으로 합침
+    model_problem, group, counts = aggregate_items(problem, stats) if aggregate else (problem, None, None)
+
+    # 지배되는 전략 제거
+    keep = presolve_strategies(model_problem, allow_zero_strategy=allow_zero_strategy, stats=stats) if presolve else None
 
     # 솔버 초기화 및 변수 설정
-    solver, x = _init_scip_solver(num_item, action_dim, allow_zero_strategy)
-    if solver is None:
+    model, x = _init_scip_solver(model_problem.num_item, action_dim, allow_zero_strategy, keep, counts)
+    if model is None:
         return None
 
-    # 신뢰도 제약 조건
-    if len(reliability_constraint) != values[0].shape[0]:
-        raise ValueError(
-            f"len(reliability_constraint) must be equal to value_dim. \n{len(reliability_constraint)} != {values[0].shape[0]}")
-
-    try:
-        for k in range(len(reliability_constraint)):
-            solver.Add(sum(values[i].iloc[k, j] * x[i][j] for i in range(num_item) for j in range(action_dim)) >=
-                       reliability_constraint[k])
-    except IndexError as e:
-        raise IndexError(f"{e}"
-                         f"비용테이블과 가치테이블에 존재하는 장치의 수가 일치하지 않을 수 있습니다.\n"
-                         f"비용테이블의 장치: {len(costs.index.tolist())}\n"
-                         f"가치테이블의 장치: {len([values[i].index.tolist() for i in range(len(values))])}\n"
-                         f"위 두 값이 일정하지 않을 경우, 입력 테이블의 범위가 잘못 설정되었을 수 있습니다.\n")
+    for k in range(len(reliability_constraint)):
+        _add_linear_constraint(model, x, model_problem.value[:, k, :], lower_bound=reliability_constraint[k])
 
     # 비용을 최소화하는 목적 함수
-    objective_expr = sum(costs.iloc[i, j] * x[i][j] for i in range(num_item) for j in range(action_dim))
-    solver.Minimize(objective_expr)
+    _set_objective(model, x, model_problem.cost, maximize=False)
+
+    build_time = time.time() - build_start
+    print(f"모델 생성 시간: {build_time:.4f}초")
+
+    if initial_solution is not None:
+        _set_hint(model, x, initial_solution, group)
 
     # 솔버 실행
-    status, elapsed_time = _run_scip_solver(solver)
+    status, solver, elapsed_time = _run_scip_solver(model, time_limit, relative_gap, absolute_gap, seed,
+                                                    conflict_analysis=False if initial_solution is not None else None)
+    _objective_bound(status, solver, stats)
+
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=elapsed_time)
 
     # 결과 처리
-    return *_process_scip_result(status, solver, x, num_item, action_dim, costs, values, None, False), elapsed_time
+    return *_process_scip_result(status, solver, x, num_item, action_dim, costs, values, None, False,
+                                 group), elapsed_time
 
 
 def main():
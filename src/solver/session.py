@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+
+import src.solver.cpsat as cpsat
+import src.solver.scip as scip
+from src.problem.problem import Problem, as_problem, _check_finite
+
+"""
+이 모듈은 비용 제약 문제의 모델을 한 번만 만들어 두고, 비용이나 가치가 조금 바뀐 문제를 빠르게 다시 푸는 세션을 제공합니다.
+
+엑셀에서 몇 개의 셀만 바꾸어 결과를 확인하는 경우(what-if), 매번 파일을 다시 읽고 모델을 새로 만들 필요가 없습니다.
+
+1. 세션을 만들 때 문제를 복사하고 SCIP 또는 CP-SAT 모델을 만듭니다.
+   계수가 바뀌면 지배되는 전략이나 같은 아이템의 묶음이 달라질 수 있으므로 사전 처리(presolve)와 묶음(aggregate) 없이 만듭니다.
+2. update로 (아이템, 전략)의 비용이나 가치를 바꾸면 모델에서 그 변수의 비용 계수와 목적 함수 계수만 고칩니다.
+   CP-SAT은 바뀐 값 때문에 정수화 배율이 달라지면 비용 제약이나 목적 함수 전체를 새 배율로 다시 씁니다.
+3. solve는 고친 모델을 풀며, 지난 풀이의 최적해를 hint로 전달합니다.
+   비용이 조금 바뀐 경우 지난 최적해가 새 최적해와 거의 같으므로 처음부터 푸는 것보다 빠르게 좋은 해를 찾습니다.
+신뢰도 제약 문제는 지원하지 않습니다.
+"""
+
+# 세션을 지원하는 solver와 (모듈, 실행 함수, 결과 처리 함수, 실행 인자의 기본값, hint를 설정한 풀이의 실행 인자)
+# SCIP의 사전 처리는 hint가 최적해에 가까운 다시 풀기에서 풀이 시간의 절반 가까이를 차지하므로 끔
+SESSION_SOLVERS = {
+    'SCIP': (scip, scip._run_scip_solver, scip._process_scip_result, {"presolve_rounds": 0},
+             {"conflict_analysis": False}),
+    'CP-SAT': (cpsat, cpsat._run_cpsat_solver, cpsat._process_cpsat_result, {}, {}),
+}
+
+
+class OptimizerSession:
+    """
+    모델을 유지하면서 비용 제약 문제를 반복해서 푸는 세션입니다.
+
+    Attributes:
+        problem: 세션이 가진 문제. update로 바꾼 값이 반영됩니다.
+        cost_constraint: 최대 비용 제약
+        selected: 마지막 풀이에서 선택된 전략. 아직 풀지 않은 경우 None
+    """
+
+    def __init__(self, problem, cost_constraint, solver="SCIP", value_weights=None, allow_zero_strategy=False,
+                 use_hint=True, **options):
+        """
+        Args:
+            problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+            cost_constraint: 최대 비용 제약
+            solver: solver의 종류 (SCIP 또는 CP-SAT)
+            value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+            allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+            use_hint: 지난 풀이의 해를 다음 풀이의 hint로 전달할지 여부
+            **options: solver 실행 인자 (time_limit, relative_gap 등). SESSION_SOLVERS의 기본값보다 우선합니다.
+
+        Raises:
+            ValueError: solver가 지원되지 않거나 SCIP을 사용할 수 없는 경우, 비용/가치에 숫자가 아닌 값이 있는 경우
+        """
+        if solver not in SESSION_SOLVERS:
+            raise ValueError(f"세션을 지원하지 않는 solver입니다: {solver}. {', '.join(SESSION_SOLVERS)} 중 하나를 선택하세요.")
+        self._module, self._run, self._process, default_options, self._hint_options = SESSION_SOLVERS[solver]
+
+        # 세션이 계수를 바꾸므로 호출한 쪽의 배열과 분리
+        problem = as_problem(problem)
+        _check_finite(problem.cost)
+        _check_finite(problem.value)
+        self.problem = Problem(problem.cost.copy(), problem.value.copy(), item_label=problem.item_label,
+                               strategy_label=problem.strategy_label, value_label=problem.value_label)
+        self.cost_constraint = cost_constraint
+        self.allow_zero_strategy = allow_zero_strategy
+        self.use_hint = use_hint
+        self.options = {**default_options, **options}
+        self.selected = None
+
+        self._item_index = {str(label): index for index, label in enumerate(self.problem.item_label.tolist())}
+        self._strategy_index = {str(label): index for index, label in enumerate(self.problem.strategy_label.tolist())}
+
+        build_start = time.time()
+        # CP-SAT은 비용 제약의 정수화 배율을 함께 반환
+        self._model, self._x, self._budget, self.value_weights, _, *self._scaling = \
+            self._module._build_cost_constraint_model(self.problem, cost_constraint, value_weights, allow_zero_strategy,
+                                                      presolve=False, aggregate=False)
+        if self._model is None:
+            raise ValueError("SCIP을 사용할 수 없습니다.")
+        self.build_time = time.time() - build_start
+        print(f"모델 생성 시간: {self.build_time:.4f}초")
+
+    def _index(self, key, index, kind):
+        """
+        라벨(문자열) 또는 인덱스(정수)를 인덱스로 바꿉니다.
+        """
+        if isinstance(key, (int, np.integer)):
+            return int(key)
+        if str(key) not in index:
+            raise ValueError(f"존재하지 않는 {kind}입니다: {key}")
+        return index[str(key)]
+
+    def update(self, item, strategy, cost=None, value=None):
+        """
+        한 아이템의 한 전략의 비용이나 가치를 바꾸고, 모델에서 해당 계수만 고칩니다.
+
+        Args:
+            item: 아이템 라벨(문자열) 또는 인덱스(정수)
+            strategy: 전략 라벨(문자열) 또는 인덱스(정수)
+            cost: 새 비용. None인 경우 바꾸지 않습니다.
+            value: 가치 차원별 새 가치 (value_dim,). None인 경우 바꾸지 않습니다.
+
+        Raises:
+            ValueError: 존재하지 않는 아이템/전략이거나 숫자가 아닌 값이 주어진 경우
+        """
+        i = self._index(item, self._item_index, "아이템")
+        j = self._index(strategy, self._strategy_index, "전략")
+        if cost is not None:
+            cost = np.asarray(cost, dtype=np.float64)
+            _check_finite(cost)
+            self.problem.cost[i, j] = cost
+        if value is not None:
+            value = np.asarray(value, dtype=np.float64).reshape(self.problem.value_dim)
+            _check_finite(value)
+            self.problem.value[i, :, j] = value
+
+        # 모델을 만들 때와 같은 가중 가치 배열. CP-SAT은 배열 전체로 정수화 배율을 다시 확인
+        profits = np.einsum("idj,d->ij", self.problem.value, self.value_weights)
+        self._scaling = self._module._update_cost_constraint_model(self._model, self._x, self._budget, i, j,
+                                                                   self.problem.cost, profits, self.cost_constraint,
+                                                                   *self._scaling)
+
+    def apply(self, changes):
+        """
+        여러 변경을 차례로 적용합니다.
+
+        Args:
+            changes: {"item", "strategy", "cost"(선택), "value"(선택)} 딕셔너리의 목록
+        """
+        for change in changes:
+            self.update(change["item"], change["strategy"], change.get("cost"), change.get("value"))
+
+    def set_cost_constraint(self, cost_constraint):
+        """
+        예산(최대 비용 제약)을 바꿉니다.
+        """
+        self.cost_constraint = cost_constraint
+        self._module._set_budget(self._model, self._budget, cost_constraint, *self._scaling)
+
+    def solve(self, stats=None):
+        """
+        현재 모델을 풉니다. use_hint인 경우 지난 풀이의 해를 hint로 전달합니다.
+
+        Args:
+            stats: 주어진 경우 풀이 시간("solve_time"), 목적 함수의 한계("objective_bound")와 gap("gap")을 기록할 딕셔너리
+
+        Returns:
+            (selected, cost, value, elapsed_time): 선택된 전략, 총 비용, 총 가치, 경과 시간(풀이 시간)
+
+        Raises:
+            ValueError: 실행 가능한 해가 없을 경우
+        """
+        options = self.options
+        if self.use_hint and self.selected is not None:
+            self._module._set_hint(self._model, self._x, self.selected)
+            options = {**self._hint_options, **self.options}
+
+        status, solver, elapsed_time = self._run(self._model, **options)
+        self._module._objective_bound(status, solver, stats)
+        if stats is not None:
+            stats.update(solve_time=elapsed_time)
+
+        selected, cost, value = self._process(status, solver, self._x, self.problem.num_item,
+                                              self.problem.num_strategy, self.problem.cost, self.problem.value,
+                                              self.value_weights, True)
+        self.selected = selected
+        return selected, cost, value, elapsed_time
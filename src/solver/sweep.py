@@ -0,0 +1,254 @@
+import importlib
+import inspect
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.problem.problem import Problem, as_problem
+from src.problem.strategy import evaluate_solutions, _normalize_value_weights
+
+"""
+이 모듈은 여러 예산(비용 제약)에 대해 비용 제약 문제를 풀어 예산별 비용-가치 곡선(frontier)을 만듭니다.
+
+solver 모듈에 solve_cost_constraint_sweep이 있으면(SCIP, CP-SAT) 모델을 한 번만 만들고 비용 제약의 우변만 바꾸어 가며 풉니다.
+그렇지 않은 solver는 예산마다 solve_cost_constraint를 호출하며, initial_solution 인자를 받는 경우 이전 예산의 해를 초기 해로 전달합니다.
+예산은 오름차순으로 풀기 때문에 이전 예산의 해는 다음 예산에서도 항상 실행 가능합니다.
+
+num_workers가 2 이상이면 예산을 연속된 구간(chunk)으로 나누어 프로세스 풀에서 동시에 풉니다.
+문제의 비용/가치 배열은 multiprocessing.shared_memory에 한 번만 복사하고, 작업 프로세스는 이를 복사 없이 참조합니다.
+각 작업 프로세스는 자신의 구간 안에서 위와 같이 모델을 재사용하며, 결과는 구간이 끝나는 순서대로 전달됩니다.
+"""
+
+# 병렬 sweep에서 작업 프로세스 하나당 나누어 줄 예산 구간의 수. 구간이 작을수록 부하가 고르게 분산되지만 모델 재사용이 줄어듭니다.
+SWEEP_CHUNKS_PER_WORKER = 2
+
+# 병렬 sweep 작업 프로세스가 공유 메모리로부터 만든 문제. _init_worker에서 한 번만 설정됩니다.
+_worker_problem = None
+_worker_memory = None
+
+
+def budget_range(start: float, stop: float, num: int) -> list[float]:
+    """
+    start부터 stop까지 num개의 예산을 같은 간격으로 만듭니다.
+
+    Args:
+        start: 최소 예산
+        stop: 최대 예산
+        num: 예산의 수
+
+    Returns:
+        list[float]: 예산 목록
+    """
+    return np.linspace(start, stop, int(num)).tolist()
+
+
+def sweep_cost_constraint(problem, cost_constraints, solver, value_weights=None, allow_zero_strategy=False,
+                          use_hint=True, num_workers=1, stats=None, **options):
+    """
+    여러 예산에 대해 비용 제약 문제를 풀고 예산별 비용과 가치를 표로 반환합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraints: 최대 비용 제약 목록
+        solver: solver 모듈 (예: src.solver.cpsat)
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        use_hint: 이전 예산의 해를 다음 풀이의 hint(또는 initial_solution)로 전달할지 여부
+        num_workers: 사용할 프로세스 수. 1이면 현재 프로세스에서 풀고, None이면 CPU 수만큼 사용합니다.
+        stats: 주어진 경우 모델 생성 시간("build_time")과 전체 풀이 시간("solve_time")을 기록할 딕셔너리
+        **options: solver의 solve_cost_constraint에 전달할 추가 인자.
+            모델을 재사용하는 solver에서는 solve_cost_constraint_sweep이 받는 인자(presolve 등)만 사용됩니다.
+
+    Returns:
+        (frontier, solutions): 예산 오름차순의 결과 표와 예산별 선택된 전략 목록(해가 없는 경우 None)
+        frontier의 열은 cost_constraint, cost, weighted_value, 가치 레이블별 총 가치, solve_time이며,
+        해가 없는 예산의 비용과 가치는 NaN입니다.
+    """
+    problem = as_problem(problem)
+    cost_constraints = sorted(float(cost_constraint) for cost_constraint in cost_constraints)
+    value_weights = _normalize_value_weights(problem.value, value_weights)
+
+    sweep_start = time.time()
+    if num_workers == 1:
+        results = list(_solve(problem, cost_constraints, solver, value_weights, allow_zero_strategy, use_hint, options,
+                              stats))
+    else:
+        results = sorted(solve_cost_constraint_parallel(problem, cost_constraints, solver, value_weights=value_weights,
+                                                        allow_zero_strategy=allow_zero_strategy, use_hint=use_hint,
+                                                        num_workers=num_workers, **options),
+                         key=lambda result: result[0])
+        if stats is not None:
+            stats.update(build_time=0.0, solve_time=sum(elapsed_time for _, _, elapsed_time in results))
+    print(f"{len(cost_constraints)}개 예산 풀이 시간: {time.time() - sweep_start:.4f}초")
+
+    return _frontier(problem, results, value_weights), [selected for _, selected, _ in results]
+
+
+def solve_cost_constraint_parallel(problem, cost_constraints, solver, value_weights=None, allow_zero_strategy=False,
+                                   use_hint=True, num_workers=None, chunk_size=None, **options):
+    """
+    여러 예산에 대한 비용 제약 문제를 프로세스 풀에서 풀고, 예산 구간이 끝나는 순서대로 결과를 반환합니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        cost_constraints: 최대 비용 제약 목록
+        solver: solver 모듈 (예: src.solver.scip)
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        use_hint: 구간 안에서 이전 예산의 해를 다음 풀이의 hint(또는 initial_solution)로 전달할지 여부
+        num_workers: 사용할 프로세스 수. None인 경우 CPU 수
+        chunk_size: 작업 하나가 푸는 연속된 예산의 수. None인 경우 프로세스마다 SWEEP_CHUNKS_PER_WORKER개의 구간이 되도록 정합니다.
+        **options: solver의 solve_cost_constraint에 전달할 추가 인자
+
+    Yields:
+        (cost_constraint, selected, elapsed_time): 예산, 선택된 전략(해가 없는 경우 None), 풀이 시간
+    """
+    problem = as_problem(problem)
+    cost_constraints = sorted(float(cost_constraint) for cost_constraint in cost_constraints)
+    value_weights = _normalize_value_weights(problem.value, value_weights)
+    if not cost_constraints:
+        return
+
+    num_workers = (os.cpu_count() or 1) if num_workers is None else num_workers
+    num_workers = max(1, min(num_workers, len(cost_constraints)))
+    if chunk_size is None:
+        chunk_size = math.ceil(len(cost_constraints) / (num_workers * SWEEP_CHUNKS_PER_WORKER))
+    chunks = [cost_constraints[i:i + chunk_size] for i in range(0, len(cost_constraints), chunk_size)]
+
+    memories, arrays = _share_arrays(problem.cost, problem.value)
+    labels = (problem.item_label, problem.strategy_label, problem.value_label)
+    try:
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker,
+                                 initargs=(arrays, labels)) as executor:
+            futures = [executor.submit(_sweep_worker, solver.__name__, chunk, value_weights, allow_zero_strategy,
+                                       use_hint, options)
+                       for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+
+def _share_arrays(*arrays):
+    """
+    배열을 공유 메모리에 복사합니다.
+
+    Returns:
+        (memories, specs): 공유 메모리 목록과 작업 프로세스에서 배열을 다시 만들기 위한 (이름, shape, dtype) 목록
+    """
+    memories = []
+    specs = []
+    try:
+        for array in arrays:
+            memory = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            memories.append(memory)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[...] = array
+            specs.append((memory.name, array.shape, array.dtype.str))
+    except BaseException:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+        raise
+    return memories, specs
+
+
+def _init_worker(specs, labels):
+    """
+    병렬 sweep 작업 프로세스의 초기화 함수입니다. 공유 메모리의 배열로 문제를 만들어 프로세스 전역 변수에 저장합니다.
+    """
+    global _worker_problem, _worker_memory
+    _worker_memory = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    cost, value = [np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
+                   for memory, (_, shape, dtype) in zip(_worker_memory, specs)]
+    # 작업 프로세스끼리 같은 메모리를 보므로 읽기 전용으로 설정
+    cost.flags.writeable = False
+    value.flags.writeable = False
+    item_label, strategy_label, value_label = labels
+    _worker_problem = Problem(cost, value, item_label=item_label, strategy_label=strategy_label,
+                              value_label=value_label)
+
+
+def _sweep_worker(solver_name, cost_constraints, value_weights, allow_zero_strategy, use_hint, options):
+    """
+    작업 프로세스에서 예산 구간 하나를 풉니다.
+    """
+    solver = importlib.import_module(solver_name)
+    return list(_solve(_worker_problem, cost_constraints, solver, value_weights, allow_zero_strategy, use_hint,
+                       options))
+
+
+def _solve(problem, cost_constraints, solver, value_weights, allow_zero_strategy, use_hint, options, stats=None):
+    """
+    오름차순의 예산 목록을 차례로 풉니다. solver에 solve_cost_constraint_sweep이 있으면 모델을 재사용합니다.
+
+    Yields:
+        (cost_constraint, selected, elapsed_time): 예산, 선택된 전략(해가 없는 경우 None), 풀이 시간
+    """
+    if hasattr(solver, "solve_cost_constraint_sweep"):
+        # presolve 등 solve_cost_constraint_sweep이 받는 인자만 전달
+        parameters = inspect.signature(solver.solve_cost_constraint_sweep).parameters
+        yield from solver.solve_cost_constraint_sweep(problem, cost_constraints, value_weights=value_weights,
+                                                      allow_zero_strategy=allow_zero_strategy, use_hint=use_hint,
+                                                      stats=stats,
+                                                      **{key: value for key, value in options.items()
+                                                         if key in parameters})
+        return
+
+    solve_time = 0.0
+    for result in _solve_each(problem, cost_constraints, solver, value_weights, allow_zero_strategy, use_hint,
+                              options):
+        solve_time += result[2]
+        yield result
+    if stats is not None:
+        stats.update(build_time=0.0, solve_time=solve_time)
+
+
+def _solve_each(problem, cost_constraints, solver, value_weights, allow_zero_strategy, use_hint, options):
+    """
+    예산마다 solver.solve_cost_constraint를 호출합니다. use_hint이고 solver가 initial_solution을 받는 경우 이전 해를 전달합니다.
+
+    Yields:
+        (cost_constraint, selected, elapsed_time): 예산, 선택된 전략(해가 없는 경우 None), 풀이 시간
+    """
+    warm_start = use_hint and "initial_solution" in inspect.signature(solver.solve_cost_constraint).parameters
+    previous = None
+    for cost_constraint in cost_constraints:
+        if warm_start and previous is not None:
+            options["initial_solution"] = previous
+
+        time_start = time.time()
+        try:
+            selected = solver.solve_cost_constraint(problem, cost_constraint, value_weights=value_weights,
+                                                    allow_zero_strategy=allow_zero_strategy, **options)[0]
+        except ValueError:
+            selected = None
+
+        if selected is not None:
+            previous = selected
+        yield cost_constraint, selected, time.time() - time_start
+
+
+def _frontier(problem, results, value_weights) -> pd.DataFrame:
+    """
+    예산별 풀이 결과를 표로 정리합니다.
+    """
+    value_label = [str(label) for label in problem.value_label]
+    frontier = pd.DataFrame(np.nan, index=range(len(results)),
+                            columns=["cost_constraint", "cost", "weighted_value", *value_label, "solve_time"])
+    frontier["cost_constraint"] = [cost_constraint for cost_constraint, _, _ in results]
+    frontier["solve_time"] = [elapsed_time for _, _, elapsed_time in results]
+
+    solved = [i for i, (_, selected, _) in enumerate(results) if selected is not None]
+    if solved:
+        evaluation = evaluate_solutions(problem, np.array([results[i][1] for i in solved]), value_weights=value_weights)
+        frontier.loc[solved, "cost"] = evaluation["cost"]
+        frontier.loc[solved, "weighted_value"] = evaluation["weighted_value"]
+        frontier.loc[solved, value_label] = evaluation["value"]
+    return frontier
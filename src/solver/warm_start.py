@@ -0,0 +1,156 @@
+import json
+import os
+
+import numpy as np
+
+from src.problem.io import read_solution
+from src.problem.problem import as_problem
+from src.problem.strategy import (_normalize_value_weights, _choice_arrays, _repair_cost_constraint, _to_choice,
+                                  _to_selected)
+from src.solver.lagrangian import polish
+from src.solver.lp_greedy import lp_greedy_solution
+
+"""
+이 모듈은 같은 계통을 비용만 조금 바꾸어 다시 풀 때, 지난 풀이의 해로 solver를 시작(warm start)하기 위한 해를 만듭니다.
+
+지난 해는 아이템 라벨별 전략 라벨로 저장하므로 아이템의 순서가 바뀌거나 아이템이 추가/삭제되어도 라벨로 대응시킬 수 있습니다.
+
+1. 지난 해는 JSON 캐시(save_solution_cache로 저장) 또는 지난 풀이의 출력 엑셀 시트(read_solution)에서 읽습니다.
+2. warm_start_solution은 라벨이 같은 아이템에 지난 해의 전략을 주고, 새 아이템이나 지난 전략이 없어진 아이템은 탐욕 해의 전략으로 채웁니다.
+   비용 제약 문제는 LP 완화 탐욕 알고리즘(lp_greedy)의 해를, 신뢰도 제약 문제는 가중 가치가 가장 큰 전략을 사용합니다.
+   비용이 바뀌어 지난 해가 예산을 넘으면 src.problem.strategy의 _repair_cost_constraint로 예산 안으로 고치고, 남는 예산은 효율이 높은 변경으로 채웁니다.
+   CP-SAT은 실행 가능한 완전한 hint만 첫 해로 사용하므로 이 과정이 필요합니다.
+3. 만든 해는 solver의 initial_solution으로 전달합니다. CP-SAT은 solution hint로, SCIP은 시작 해(hint)로, SA와 GA는 초기 해로 사용합니다.
+"""
+
+# add_nothing_strategy와 write_solution_to_excel이 사용하는 '현상유지' 전략의 라벨. 선택하지 않음(-1)과 같은 것으로 봅니다.
+NOTHING_LABEL = "현상유지"
+
+
+def solution_to_labels(problem, selected):
+    """
+    선택된 전략을 아이템 라벨별 전략 라벨의 딕셔너리로 바꿉니다. 선택하지 않음(-1)은 None입니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        selected: 각 아이템에 대해 선택된 전략의 인덱스, 선택하지 않음은 -1
+
+    Returns:
+        dict: {아이템 라벨: 전략 라벨 또는 None}
+    """
+    problem = as_problem(problem)
+    strategy_label = problem.strategy_label.tolist()
+    return {str(item): strategy_label[strategy] if strategy >= 0 else None
+            for item, strategy in zip(problem.item_label.tolist(), np.asarray(selected, dtype=np.int64).tolist())}
+
+
+def save_solution_cache(file_path, problem, selected):
+    """
+    선택된 전략을 아이템 라벨별 전략 라벨로 JSON 파일에 저장합니다.
+
+    Args:
+        file_path: JSON 파일 경로
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        selected: 각 아이템에 대해 선택된 전략의 인덱스, 선택하지 않음은 -1
+    """
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(solution_to_labels(problem, selected), f, ensure_ascii=False, indent=1)
+
+
+def load_solution_cache(file_path):
+    """
+    save_solution_cache로 저장한 해를 읽습니다.
+
+    Args:
+        file_path: JSON 파일 경로
+
+    Returns:
+        dict: {아이템 라벨: 전략 라벨 또는 None}. 파일이 없는 경우 None
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_previous_solution(file_path, sheet_name, start_cell="A2"):
+    """
+    write_solution_to_excel로 저장한 출력 시트에서 지난 해를 읽습니다. 값이 1인 열의 전략을 선택한 것으로 봅니다.
+
+    Args:
+        file_path: 지난 풀이의 출력 엑셀 파일 경로
+        sheet_name: 출력 시트 이름
+        start_cell: 출력 시작 셀
+
+    Returns:
+        dict: {아이템 라벨: 전략 라벨 또는 None}. 파일이나 시트가 없는 경우 None
+    """
+    if not os.path.exists(file_path):
+        return None
+    try:
+        solution = read_solution(file_path, sheet_name=sheet_name, start_cell=start_cell)
+    except KeyError:
+        return None
+
+    previous = {}
+    for item, row in solution.iterrows():
+        if item is None:
+            continue
+        chosen = [strategy for strategy, value in row.items() if value == 1]
+        previous[str(item)] = str(chosen[0]) if chosen else None
+    return previous
+
+
+def warm_start_solution(problem, previous, value_weights=None, allow_zero_strategy=False, cost_constraint=None):
+    """
+    지난 해를 현재 문제의 아이템 순서에 맞춘 초기 해로 만듭니다.
+    지난 해에 없는 아이템, 지난 전략이 현재 문제에 없는 아이템은 탐욕 해의 전략으로 채웁니다.
+
+    Args:
+        problem: Problem 또는 문제 딕셔너리 {"cost": DataFrame, "value": [DataFrame...]}
+        previous: {아이템 라벨: 전략 라벨 또는 None} 딕셔너리
+        value_weights: 가치 차원에 대한 가중치. None인 경우 균등 분배
+        allow_zero_strategy: 아무것도 하지 않음 전략을 허용할지 여부. 현상유지 작전이 없을 경우 True로 설정해야 함.
+        cost_constraint: 비용 제약 문제의 예산. 주어진 경우 LP 완화 탐욕 해로 채우고 예산에 맞게 고치며,
+            None인 경우 가중 가치가 가장 큰 전략으로 채웁니다.
+
+    Returns:
+        list[int]: 각 아이템에 대해 선택된 전략의 인덱스, 선택하지 않음은 -1
+    """
+    problem = as_problem(problem)
+    value_weights = _normalize_value_weights(problem.value, value_weights)
+    choice_cost, choice_value = _choice_arrays(problem.cost, problem.value, allow_zero_strategy)
+    choice_profit = choice_value @ np.asarray(value_weights)
+    if cost_constraint is not None:
+        greedy, _ = lp_greedy_solution(choice_cost, choice_profit, cost_constraint)
+    else:
+        greedy = np.argmax(choice_profit, axis=1)
+    selected = np.asarray(_to_selected(greedy, problem.num_strategy), dtype=np.int64)
+
+    strategy_index = {str(label): index for index, label in enumerate(problem.strategy_label.tolist())}
+    # 선택하지 않음과 '현상유지' 전략은 지난 풀이와 현재 문제의 add_nothing_strategy 설정에 맞게 서로 바꿈
+    nothing = -1 if allow_zero_strategy else strategy_index.get(NOTHING_LABEL)
+    matched = 0
+    for i, item in enumerate(problem.item_label.tolist()):
+        if str(item) not in previous:
+            continue
+        strategy = previous[str(item)]
+        index = nothing if strategy is None else strategy_index.get(str(strategy))
+        if index is None and strategy == NOTHING_LABEL:
+            index = nothing
+        if index is None:
+            continue
+        selected[i] = index
+        matched += 1
+
+    print(f"지난 해로 시작: 전체 {problem.num_item}개 아이템 중 {matched}개는 지난 해, "
+          f"{problem.num_item - matched}개는 탐욕 해의 전략을 사용합니다.")
+
+    if cost_constraint is not None:
+        # 예산을 넘으면 고치고, 남으면 채움
+        choice = _to_choice(selected.tolist(), *choice_cost.shape, problem.num_strategy)
+        if choice_cost[np.arange(len(choice)), choice].sum() > cost_constraint:
+            choice = _repair_cost_constraint(choice, choice_cost, choice_profit, cost_constraint)
+        choice = polish(choice, choice_cost, choice_profit, cost_constraint)
+        selected = np.asarray(_to_selected(choice, problem.num_strategy), dtype=np.int64)
+    return selected.tolist()
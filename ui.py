@@ -200,7 +200,7 @@ class OptimizationUI(QMainWindow):
         settings_layout.addWidget(QLabel("제약 조건"), 0, 2, 1, 3)
 
         self.solver_combo = QComboBox()
-        self.solver_combo.addItems(["SCIP", "CP-SAT"])
+        self.solver_combo.addItems(["SCIP", "CP-SAT", "DP", "SA", "GA", "LP_GREEDY", "LAGRANGIAN", "FPTAS", "CORE"])
         settings_layout.addWidget(self.solver_combo, 1, 0)
 
         self.problem_type_combo = QComboBox()
@@ -682,7 +682,8 @@ class OptimizationUI(QMainWindow):
         self.save_current_config()
 
         try:
-            solution, total_cost, total_value, solve_time = main.run_optimization(self.config_path)
+            stats = {}
+            solution, total_cost, total_value, solve_time = main.run_optimization(self.config_path, stats)
             # 결과 표시
             self.total_cost.setText(f"{total_cost:.2f}")
             self.failure_value.setText(f"{total_value[0]:.10f}")
@@ -697,7 +698,8 @@ class OptimizationUI(QMainWindow):
                                     f"최적화 계산이 완료되었습니다.\n"
                                     f"총 비용: {total_cost}\n"
                                     f"계산 시간: {solve_time:.2f}초\n"
-                                    f"결과가 {self.config['output']['file_path']} 파일에 저장되었습니다.")
+                                    + (f"gap: {stats['gap']:.4%}\n" if stats.get('gap') is not None else "")
+                                    + f"결과가 {self.config['output']['file_path']} 파일에 저장되었습니다.")
 
         except Exception as e:
             QMessageBox.critical(self, "오류", f"최적화 문제 해결 오류: {e}")